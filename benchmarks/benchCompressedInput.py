@@ -0,0 +1,121 @@
+"""
+Compares loading a raw demo archive against the same archive stored as .json.gz, .json.xz and a zip bundle.
+
+Files are read from the page cache, so the measured time is parsing plus decompression. The time a slow
+disk adds is modelled as bytes on disk / disk bandwidth for each --disk-mbps value; the modelled total
+is what a cold run on that disk would roughly take.
+
+Usage (from the repository root):
+    python -m benchmarks.benchCompressedInput --matches 500 --padding 20 --disk-mbps 20,100,500
+"""
+import argparse
+import gzip
+import json
+import lzma
+import os
+import tempfile
+import time
+import zipfile
+from typing import Dict, List
+from benchmarks.demoGenerator import generate_demos
+from modules.demoExtractor import extract_demoData
+from modules.demoSource import find_demoFiles
+
+
+def write_variants(raw_dir: str, base_dir: str, files: List[str]) -> Dict[str, str]:
+    """
+    Writes the gzip, xz and zip copies of the raw archive and returns the directory of each variant
+    """
+    variants = {"raw": raw_dir}
+    for name in ("gzip", "xz", "zip"):
+        variants[name] = os.path.join(base_dir, name)
+        os.makedirs(variants[name])
+
+    with zipfile.ZipFile(os.path.join(variants["zip"], "demos.zip"), "w", zipfile.ZIP_DEFLATED) as bundle:
+        for file_path in files:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            file_name = os.path.basename(file_path)
+            with open(os.path.join(variants["gzip"], file_name + ".gz"), "wb") as f:
+                f.write(gzip.compress(data))
+            with open(os.path.join(variants["xz"], file_name + ".xz"), "wb") as f:
+                f.write(lzma.compress(data))
+            bundle.writestr(file_name, data)
+
+    return variants
+
+
+def directory_bytes(directory: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+
+def run_variant(directory: str, args) -> Dict:
+    sources = find_demoFiles(directory)
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        matches = extract_demoData(sources, jobs=args.jobs, streaming=args.parser == "stream")
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+
+    disk_bytes = directory_bytes(directory)
+    return {
+        "sources": len(sources),
+        "matches": len(matches),
+        "disk_bytes": disk_bytes,
+        "load_seconds": best,
+        "modelled_seconds": {
+            str(mbps): best + disk_bytes / (mbps * 1024 * 1024) for mbps in args.disk_mbps
+        }
+    }
+
+
+def parse_bandwidths(value: str) -> List[float]:
+    return [float(part) for part in value.split(",") if part.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark raw versus compressed demo input")
+    parser.add_argument("--matches", type=int, default=500, help="Number of demos")
+    parser.add_argument("--rounds", type=int, default=24, help="Rounds per match")
+    parser.add_argument("--padding", type=int, default=20, help="Unused event entries per round")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--player-mapping", "-m", default="player_mapping.json", help="Player mapping JSON file")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes for extract_demoData")
+    parser.add_argument("--parser", choices=["json", "stream"], default="json", help="Demo parser")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant; the fastest is reported")
+    parser.add_argument("--disk-mbps", type=parse_bandwidths, default=[20, 100, 500],
+                        help="Comma-separated disk bandwidths in MiB/s used for the modelled totals")
+    parser.add_argument("--results", help="Optional JSON file the results are written to")
+    args = parser.parse_args()
+
+    with open(args.player_mapping, "r", encoding="utf-8") as f:
+        player_mapping = json.load(f)
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        raw_dir = os.path.join(base_dir, "raw")
+        files = generate_demos(raw_dir, args.matches, args.rounds, padding=args.padding,
+                               player_mapping=player_mapping, seed=args.seed)
+        variants = write_variants(raw_dir, base_dir, files)
+        results = {name: run_variant(directory, args) for name, directory in variants.items()}
+
+    header = f"{'Input':<6} {'MiB':>8} {'Ratio':>6} {'Load (s)':>9}"
+    header += "".join(f" {f'@{mbps:g} MiB/s':>14}" for mbps in args.disk_mbps)
+    print(f"\n{args.matches} demos, jobs={args.jobs}, parser={args.parser} (modelled totals in seconds)")
+    print(header)
+    raw_bytes = results["raw"]["disk_bytes"]
+    for name, result in results.items():
+        line = (f"{name:<6} {result['disk_bytes'] / 1024 / 1024:>8.1f} {raw_bytes / result['disk_bytes']:>6.1f} "
+                f"{result['load_seconds']:>9.3f}")
+        line += "".join(f" {seconds:>14.3f}" for seconds in result["modelled_seconds"].values())
+        print(line)
+
+    if args.results:
+        with open(args.results, "w", encoding="utf-8") as f:
+            json.dump({"config": {key: value for key, value in vars(args).items() if key != "results"},
+                       "variants": results}, f, indent=2)
+        print(f"\nResults saved to: {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Measures the per-round cost of the analyze_stats round loop with the legacy per-round
+player scan (determine_playerTeamSide) against the precompiled MatchContext.
+
+Usage (from the repository root):
+    python -m benchmarks.benchMatchContext --matches 2000 --rounds 30 --players 10
+"""
+import argparse
+import random
+import time
+from typing import Dict, List
+from modules.determinePlayside import determine_playerTeamSide
+from modules.matchContext import SIDE_NAMES, build_matchContext
+
+
+def build_syntheticMatches(count: int, rounds: int, players: int) -> List[Dict]:
+    """
+    Builds filtered matches (players keyed by normalised name) with the focus player listed last
+    """
+    rng = random.Random(42)
+    matches = []
+    for _ in range(count):
+        match_players = {}
+        for slot in range(players):
+            team = "Team A" if slot % 2 == 0 else "Team B"
+            match_players[f"player{slot}"] = {"name": f"player{slot}", "teamName": team}
+        match_players["Focus"] = {"name": "Focus", "teamName": rng.choice(["Team A", "Team B"])}
+
+        round_list = []
+        for number in range(rounds):
+            first_half = number < rounds // 2
+            round_list.append({
+                "teamASide": 3 if first_half else 2,
+                "teamBSide": 2 if first_half else 3,
+                "winnerTeamName": rng.choice(["Team A", "Team B"]),
+            })
+
+        matches.append({
+            "teamA": {"name": "Team A", "score": 13},
+            "teamB": {"name": "Team B", "score": 11},
+            "players": match_players,
+            "rounds": round_list,
+        })
+    return matches
+
+
+def legacy_roundLoop(matches: List[Dict], focusPlayer: str) -> int:
+    won = 0
+    for match in matches:
+        for round_data in match["rounds"]:
+            player_team_letter, side = determine_playerTeamSide(match, round_data, focusPlayer)
+            if not player_team_letter or not side:
+                continue
+            winner_team_name = round_data.get("winnerTeamName", "")
+            if player_team_letter == "A" and winner_team_name == match["teamA"]["name"]:
+                won += 1
+            elif player_team_letter == "B" and winner_team_name == match["teamB"]["name"]:
+                won += 1
+    return won
+
+
+def context_roundLoop(matches: List[Dict], focusPlayer: str) -> int:
+    won = 0
+    for match in matches:
+        context = build_matchContext(match, focusPlayer)
+        if context.side_key is None:
+            continue
+        side_key = context.side_key
+        team_name = context.team_name
+        for round_data in match["rounds"]:
+            if not SIDE_NAMES.get(round_data.get(side_key)):
+                continue
+            if round_data.get("winnerTeamName", "") == team_name:
+                won += 1
+    return won
+
+
+def time_loop(loop, matches: List[Dict], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        loop(matches, "Focus")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the per-round focus player lookup")
+    parser.add_argument("--matches", type=int, default=2000, help="Number of synthetic matches")
+    parser.add_argument("--rounds", type=int, default=30, help="Rounds per match")
+    parser.add_argument("--players", type=int, default=10, help="Players per match besides the focus player")
+    parser.add_argument("--repeats", type=int, default=5, help="Timing repeats (best is reported)")
+    args = parser.parse_args()
+
+    matches = build_syntheticMatches(args.matches, args.rounds, args.players)
+    assert legacy_roundLoop(matches, "Focus") == context_roundLoop(matches, "Focus")
+
+    total_rounds = args.matches * args.rounds
+    print(f"{args.matches} matches x {args.rounds} rounds, {args.players + 1} players per match")
+    for label, loop in (("per-round scan", legacy_roundLoop), ("match context", context_roundLoop)):
+        seconds = time_loop(loop, matches, args.repeats)
+        print(f"{label:<15} {seconds:>8.3f}s {seconds / total_rounds * 1e9:>8.0f} ns/round")
+
+
+if __name__ == "__main__":
+    main()
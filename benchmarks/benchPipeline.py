@@ -0,0 +1,126 @@
+"""
+End-to-end benchmark of the report pipeline on synthetic demos.
+
+Times extract_demoData, filter_players, analyze_stats and generate_report separately at several
+archive sizes and saves the results as JSON so runs can be compared.
+
+Usage (from the repository root):
+    python -m benchmarks.benchPipeline --scales 10,1000,50000 --results bench_results.json
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from benchmarks.demoGenerator import generate_demos
+from modules.demoExtractor import extract_demoData
+from modules.playerFilter import filter_players
+from modules.reportGenerator import generate_report
+from modules.statsAnalyzer import analyze_stats
+
+
+def time_stage(func: Callable, *args, **kwargs):
+    """
+    Runs one stage and returns its result, wall seconds and peak traced memory in bytes
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def run_scale(demo_dir: str, matches: int, args, player_mapping: Dict[str, str]) -> Dict:
+    files = generate_demos(demo_dir, matches, args.rounds, args.players_per_team,
+                           args.alias_density, args.padding, player_mapping, args.seed)
+    total_bytes = sum(os.path.getsize(path) for path in files)
+
+    stages = {}
+    extracted, seconds, peak = time_stage(extract_demoData, files, jobs=args.jobs, streaming=args.parser == "stream")
+    stages["extract_demoData"] = (seconds, peak)
+    filtered, seconds, peak = time_stage(filter_players, extracted, player_mapping)
+    stages["filter_players"] = (seconds, peak)
+    stats, seconds, peak = time_stage(analyze_stats, filtered, args.focus_player)
+    stages["analyze_stats"] = (seconds, peak)
+    _, seconds, peak = time_stage(generate_report, stats)
+    stages["generate_report"] = (seconds, peak)
+
+    match_count = len(extracted)
+    round_count = sum(len(match["rounds"]) for match in extracted.values())
+    result = {
+        "matches": match_count,
+        "rounds": round_count,
+        "input_bytes": total_bytes,
+        "stages": {}
+    }
+    for stage, (seconds, peak) in stages.items():
+        result["stages"][stage] = {
+            "seconds": seconds,
+            "matches_per_second": match_count / seconds if seconds > 0 else None,
+            "rounds_per_second": round_count / seconds if seconds > 0 else None,
+            "peak_traced_bytes": peak,
+        }
+    result["total_seconds"] = sum(seconds for seconds, _ in stages.values())
+    return result
+
+
+def print_scale(result: Dict) -> None:
+    print(f"\n{result['matches']} matches, {result['rounds']} rounds, {result['input_bytes'] / 1024 / 1024:.1f} MiB")
+    print(f"{'Stage':<18} {'Seconds':>9} {'Matches/s':>11} {'Rounds/s':>12} {'Peak MiB':>9}")
+    for stage, data in result["stages"].items():
+        matches_rate = data["matches_per_second"] or 0
+        rounds_rate = data["rounds_per_second"] or 0
+        print(f"{stage:<18} {data['seconds']:>9.3f} {matches_rate:>11.0f} {rounds_rate:>12.0f} "
+              f"{data['peak_traced_bytes'] / 1024 / 1024:>9.1f}")
+
+
+def parse_scales(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the report pipeline")
+    parser.add_argument("--scales", type=parse_scales, default=[10, 1000, 50000],
+                        help="Comma-separated archive sizes (number of demos)")
+    parser.add_argument("--rounds", type=int, default=24, help="Rounds per match")
+    parser.add_argument("--players-per-team", type=int, default=5, help="Players on each team")
+    parser.add_argument("--alias-density", type=float, default=0.4,
+                        help="Share of player slots using names from the player mapping")
+    parser.add_argument("--padding", type=int, default=0, help="Unused event entries per round")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--player-mapping", "-m", default="player_mapping.json", help="Player mapping JSON file")
+    parser.add_argument("--focus-player", "-p", default="SnakeFist", help="Focus player for analyze_stats")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes for extract_demoData")
+    parser.add_argument("--parser", choices=["json", "stream"], default="json", help="Demo parser")
+    parser.add_argument("--results", default="bench_results.json", help="JSON file the results are written to")
+    args = parser.parse_args()
+
+    with open(args.player_mapping, "r", encoding="utf-8") as f:
+        player_mapping = json.load(f)
+
+    runs = []
+    for matches in args.scales:
+        with tempfile.TemporaryDirectory() as demo_dir:
+            result = run_scale(demo_dir, matches, args, player_mapping)
+        print_scale(result)
+        runs.append(result)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {key: value for key, value in vars(args).items() if key != "results"},
+        "runs": runs,
+    }
+    with open(args.results, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to: {args.results}")
+
+
+if __name__ == "__main__":
+    main()
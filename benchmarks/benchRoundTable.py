@@ -0,0 +1,72 @@
+"""
+Measures the CT/T round aggregation of the Python round loop against one NumPy round table
+shared by every focus player (analyze_allPlayers with engine="numpy").
+
+Usage (from the repository root):
+    python -m benchmarks.benchRoundTable --matches 3000 --rounds 30 --focus 10
+"""
+import argparse
+import time
+from typing import Dict, List
+from benchmarks.benchMatchContext import build_syntheticMatches
+from modules.matchContext import build_matchContext
+from modules.roundTable import aggregate_roundStats, build_roundTable, numpy_available
+from modules.statAccumulators import RoundAccumulator
+from modules.statsAnalyzer import count_focusRounds
+
+
+def python_rounds(matches: Dict, focusPlayers: List[str]) -> List:
+    results = []
+    for player in focusPlayers:
+        rounds, total = {}, RoundAccumulator()
+        for match in matches.values():
+            count_focusRounds(match, build_matchContext(match, player), rounds, total)
+        results.append(({map_name: counters.to_dict() for map_name, counters in rounds.items()}, total.to_dict()))
+    return results
+
+
+def shared_tableRounds(matches: Dict, focusPlayers: List[str]) -> List:
+    table = build_roundTable(matches)
+    return [aggregate_roundStats(matches, player, table) for player in focusPlayers]
+
+
+def time_loop(loop, matches: Dict, focusPlayers: List[str], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        loop(matches, focusPlayers)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy round table against the Python round loop")
+    parser.add_argument("--matches", type=int, default=3000, help="Number of synthetic matches")
+    parser.add_argument("--rounds", type=int, default=30, help="Rounds per match")
+    parser.add_argument("--focus", type=int, default=10, help="Number of focus players to aggregate")
+    parser.add_argument("--maps", type=int, default=7, help="Number of distinct maps")
+    parser.add_argument("--repeats", type=int, default=5, help="Timing repeats (best is reported)")
+    args = parser.parse_args()
+
+    if not numpy_available():
+        print("NumPy is not installed, nothing to compare.")
+        return
+
+    matches = {}
+    for index, match in enumerate(build_syntheticMatches(args.matches, args.rounds, max(args.focus - 1, 0))):
+        match["map"] = f"de_map{index % args.maps}"
+        matches[f"match{index}"] = match
+    focus_players = ["Focus"] + [f"player{slot}" for slot in range(args.focus - 1)]
+
+    expected = python_rounds(matches, focus_players)
+    assert shared_tableRounds(matches, focus_players) == expected
+
+    total_rounds = args.matches * args.rounds * len(focus_players)
+    print(f"{args.matches} matches x {args.rounds} rounds, {len(focus_players)} focus players")
+    for label, loop in (("python loop", python_rounds), ("numpy shared", shared_tableRounds)):
+        seconds = time_loop(loop, matches, focus_players, args.repeats)
+        print(f"{label:<13} {seconds:>8.3f}s {seconds / total_rounds * 1e9:>8.0f} ns/round")
+
+
+if __name__ == "__main__":
+    main()
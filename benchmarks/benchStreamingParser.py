@@ -0,0 +1,93 @@
+"""
+Compares peak RSS and throughput of the json.load demo loader against the streaming parser.
+
+Usage (from the repository root):
+    python -m benchmarks.benchStreamingParser --files 20 --rounds 30 --round-payload 200
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+from benchmarks.demoGenerator import generate_demos
+from modules.demoExtractor import load_demoFile
+from modules.demoStream import stream_demoFile
+
+
+LOADERS = {
+    "json": load_demoFile,
+    "stream": stream_demoFile,
+}
+
+
+def peak_rssKb() -> int:
+    """
+    Peak RSS of this process in kilobytes
+    """
+    # ru_maxrss survives execve, so the worker would report the peak of the parent that generated the demos;
+    # VmHWM belongs to the current address space and starts fresh in the worker
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        max_rss //= 1024
+    return max_rss
+
+
+def run_worker(mode: str, files: List[str]) -> Dict:
+    """
+    Loads every file with the given loader and reports timing and peak RSS of this process
+    """
+    loader = LOADERS[mode]
+    start = time.perf_counter()
+    for file_path in files:
+        loader(file_path)
+    elapsed = time.perf_counter() - start
+
+    return {"mode": mode, "seconds": elapsed, "peak_rss_kb": peak_rssKb()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark json.load against the streaming demo parser")
+    parser.add_argument("--files", type=int, default=20, help="Number of synthetic demo files")
+    parser.add_argument("--rounds", type=int, default=30, help="Rounds per demo")
+    parser.add_argument("--round-payload", type=int, default=200, help="Unused entries per round")
+    parser.add_argument("--worker", choices=list(LOADERS), help=argparse.SUPPRESS)
+    parser.add_argument("paths", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.paths)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = generate_demos(tmp_dir, args.files, rounds=args.rounds, padding=args.round_payload)
+        total_bytes = sum(os.path.getsize(path) for path in files)
+
+        print(f"{args.files} files, {total_bytes / 1024 / 1024:.1f} MiB total")
+        print(f"{'Parser':<8} {'Seconds':>8} {'Files/s':>8} {'MiB/s':>8} {'Peak RSS':>10}")
+        for mode in LOADERS:
+            # Each loader runs in a fresh interpreter so peak RSS is not shared
+            result = subprocess.run(
+                [sys.executable, "-m", "benchmarks.benchStreamingParser", "--worker", mode] + files,
+                check=True, capture_output=True, text=True
+            )
+            stats = json.loads(result.stdout)
+            seconds = stats["seconds"]
+            print(f"{mode:<8} {seconds:>8.2f} {args.files / seconds:>8.1f} "
+                  f"{total_bytes / 1024 / 1024 / seconds:>8.1f} {stats['peak_rss_kb'] / 1024:>8.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Writes synthetic demo JSON files in the shape extract_demoData expects.
+
+Usage (from the repository root):
+    python -m benchmarks.demoGenerator --output synthetic --matches 1000 --rounds 24 --alias-density 0.4
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import zlib
+from typing import Dict, List, Optional
+
+
+MAPS = ["de_ancient", "de_anubis", "de_dust2", "de_inferno", "de_mirage", "de_nuke", "de_train"]
+CLUTCHES = ["One", "Two", "Three", "Four", "Five"]
+
+
+def _player_line(rng: random.Random, name: str, team_name: str, rounds: int) -> Dict:
+    kills = rng.randint(0, rounds + 5)
+    line = {
+        "name": name,
+        "steamId": str(76561190000000000 + zlib.crc32(name.encode("utf-8"))),
+        "teamName": team_name,
+        "killCount": kills,
+        "assistCount": rng.randint(0, rounds // 2),
+        "deathCount": rng.randint(0, rounds),
+        "mvpCount": rng.randint(0, rounds // 4),
+        "headshotCount": rng.randint(0, kills),
+        "averageDamagePerRound": round(rng.uniform(40, 130), 2),
+        "kast": round(rng.uniform(40, 95), 2),
+        "firstKillCount": rng.randint(0, 6),
+        "firstDeathCount": rng.randint(0, 6),
+        "utilityDamage": rng.randint(0, 400),
+        "hltvRating": round(rng.uniform(0.4, 1.8), 2),
+        "hltvRating2": round(rng.uniform(0.4, 1.8), 2),
+    }
+    for clutch in CLUTCHES:
+        attempts = rng.randint(0, 2)
+        line[f"vs{clutch}Count"] = attempts
+        line[f"vs{clutch}WonCount"] = rng.randint(0, attempts)
+    return line
+
+
+def generate_demo(index: int, rounds: int = 24, players_per_team: int = 5, alias_density: float = 0.4,
+                  padding: int = 0, player_mapping: Optional[Dict[str, str]] = None, seed: int = 0) -> Dict:
+    """
+    Builds one demo document. alias_density is the share of player slots filled with names from
+    player_mapping; padding adds that many unused event entries to every round.
+    """
+    rng = random.Random(seed * 1_000_003 + index)
+    aliases = list(player_mapping) if player_mapping else []
+    teamA_name, teamB_name = "Team A", "Team B"
+
+    players = []
+    used = set()
+    for team_name in (teamA_name, teamB_name):
+        for slot in range(players_per_team):
+            name = None
+            if aliases and rng.random() < alias_density:
+                name = rng.choice(aliases)
+            if name is None or name in used:
+                name = f"pug_{rng.randint(0, 99999)}_{team_name[-1]}{slot}"
+            used.add(name)
+            players.append(_player_line(rng, name, team_name, rounds))
+
+    round_list = []
+    score_a = score_b = 0
+    half = rounds // 2
+    for number in range(rounds):
+        first_half = number < half
+        winner = teamA_name if rng.random() < 0.5 else teamB_name
+        if winner == teamA_name:
+            score_a += 1
+        else:
+            score_b += 1
+        round_list.append({
+            "number": number + 1,
+            "teamASide": 3 if first_half else 2,
+            "teamBSide": 2 if first_half else 3,
+            "winnerTeamName": winner,
+            "endReason": rng.choice(["ct_win", "t_win", "bomb_defused", "target_bombed"]),
+            "events": [
+                {"tick": rng.randint(0, 200000), "type": "footstep", "x": rng.random(), "y": rng.random()}
+                for _ in range(padding)
+            ],
+        })
+
+    date = datetime.datetime(2024, 1, 1) + datetime.timedelta(hours=7 * index + rng.randint(0, 6))
+    return {
+        "checksum": f"{seed:04x}{index:08x}",
+        "name": f"synthetic_{seed}_{index:06d}",
+        "date": date.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        "mapName": rng.choice(MAPS),
+        "teamA": {"name": teamA_name, "score": score_a},
+        "teamB": {"name": teamB_name, "score": score_b},
+        "players": players,
+        "rounds": round_list,
+    }
+
+
+def generate_demos(output_dir: str, matches: int, rounds: int = 24, players_per_team: int = 5,
+                   alias_density: float = 0.4, padding: int = 0,
+                   player_mapping: Optional[Dict[str, str]] = None, seed: int = 0) -> List[str]:
+    """
+    Writes `matches` demo files into output_dir and returns their paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for index in range(matches):
+        document = generate_demo(index, rounds, players_per_team, alias_density, padding, player_mapping, seed)
+        file_path = os.path.join(output_dir, f"{document['name']}.json")
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(document, f)
+        paths.append(file_path)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic CS2 demo JSON files")
+    parser.add_argument("--output", "-o", required=True, help="Directory to write the demo files to")
+    parser.add_argument("--matches", type=int, default=100, help="Number of demo files")
+    parser.add_argument("--rounds", type=int, default=24, help="Rounds per match")
+    parser.add_argument("--players-per-team", type=int, default=5, help="Players on each team")
+    parser.add_argument("--alias-density", type=float, default=0.4,
+                        help="Share of player slots using names from the player mapping")
+    parser.add_argument("--padding", type=int, default=0, help="Unused event entries per round")
+    parser.add_argument("--player-mapping", "-m", default="player_mapping.json", help="Player mapping JSON file")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    with open(args.player_mapping, "r", encoding="utf-8") as f:
+        player_mapping = json.load(f)
+
+    paths = generate_demos(args.output, args.matches, args.rounds, args.players_per_team,
+                           args.alias_density, args.padding, player_mapping, args.seed)
+    print(f"Wrote {len(paths)} demo files to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
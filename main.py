@@ -1,13 +1,35 @@
-import glob
 import json
 import argparse
+import os
 import sys
 from pathlib import Path
 from typing import Dict
+from modules.bootstrapStats import bootstrap_stats
+from modules.demoArchive import DemoArchive, write_archive
+from modules.demoCache import open_demoCache
 from modules.demoExtractor import extract_demoData
+from modules.demoFingerprint import dedupe_demoFiles
+from modules.demoIndex import build_demoIndex, parse_dateArg, select_demoFiles
+from modules.demoSource import find_demoFiles
+from modules.matchStore import ingest_matches, open_matchStore, query_stats, sync_playerMapping
+from modules.lineupStats import build_lineupTable, lineup_players, rank_stacks
+from modules.formTracker import track_form, write_formSeries
+from modules.incrementalStats import load_statsState, mapping_fingerprint, new_statsState, save_statsState, update_statsState, verify_statsState
+from modules.opponentIndex import head_to_head, rank_opponents
+from modules.partialStats import build_partial, load_partial, merge_partials, save_partial
+from modules.pipelineMetrics import PipelineMetrics
 from modules.playerFilter import filter_players
-from modules.reportGenerator import generate_report
-from modules.statsAnalyzer import analyze_stats
+from modules.renderers import RENDERERS, build_reportModel, format_paths, parse_formats
+from modules.reportGenerator import (generate_confidenceReport, generate_formReport, generate_headToHeadReport, generate_impactReport,
+                                     generate_stackReport)
+from modules.roundTable import numpy_available
+from modules.statsAnalyzer import analyze_allPlayers, analyze_stats
+from modules.streamPipeline import stream_stats
+from modules.watchMode import DemoWatcher, watch_directory
+
+
+# --focus-player value that reports on every player in the mapping
+ALL_PLAYERS = "all"
 
 
 def load_playerMapping(mapping_file: str) -> Dict[str, str]:
@@ -52,7 +74,7 @@ def parse_arguments():
         "--focus-player", "-p",
         type=str,
         required=True,
-        help="Name of the focus player for analysis (required)"
+        help=f"Name of the focus player for analysis (required), or '{ALL_PLAYERS}' for every mapped player"
     )
     
     parser.add_argument(
@@ -61,11 +83,289 @@ def parse_arguments():
         help="Output file path (optional, prints to console if not specified)"
     )
     
+    parser.add_argument(
+        "--format",
+        type=str,
+        default="md",
+        help="Comma-separated report formats: md, json, csv, html (default: md). "
+             "With several formats each is written next to --output with its own extension"
+    )
+    
     parser.add_argument(
         "--file-pattern",
         type=str,
         default="*.json",
-        help="File pattern to match JSON files"
+        help="File pattern to match JSON files; .gz/.xz variants and matching members of .zip bundles are read too"
+    )
+    
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="Stream matches one at a time through filtering and aggregation instead of holding the whole archive"
+    )
+    
+    parser.add_argument(
+        "--since",
+        type=parse_dateArg,
+        help="Only include matches played on or after this date (YYYY-MM-DD)"
+    )
+    
+    parser.add_argument(
+        "--until",
+        type=parse_dateArg,
+        help="Only include matches played on or before this date (YYYY-MM-DD)"
+    )
+    
+    parser.add_argument(
+        "--map",
+        action="append",
+        help="Only include matches on this map, e.g. de_mirage (repeat for several maps)"
+    )
+    
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Fingerprint demos by date, map, score and players; skip re-exported duplicates and keep same-named matches apart"
+    )
+    
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes used to load demo files (1 loads them serially)"
+    )
+    
+    parser.add_argument(
+        "--parser",
+        choices=["json", "stream"],
+        default="json",
+        help="Demo parser: 'json' loads whole documents, 'stream' keeps only the fields the report uses (lower memory)"
+    )
+    
+    parser.add_argument(
+        "--cache-file",
+        type=str,
+        default=".cs2-stats-cache.sqlite",
+        help="SQLite file caching parsed demo records between runs"
+    )
+    
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=512,
+        help="Size cap of the demo cache; least recently used entries are evicted beyond it"
+    )
+    
+    parser.add_argument(
+        "--cache-hash",
+        action="store_true",
+        help="Also key cache entries on a content hash instead of trusting size and mtime alone"
+    )
+    
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every demo file without reading or writing the cache"
+    )
+    cache_group.add_argument(
+        "--rebuild-cache",
+        action="store_true",
+        help="Discard the cache contents and re-parse every demo file"
+    )
+    
+    parser.add_argument(
+        "--state-file",
+        type=str,
+        help="Persist aggregated stats here and only fold in new or removed demos on later runs"
+    )
+    
+    parser.add_argument(
+        "--verify-incremental",
+        action="store_true",
+        help="Compare the incremental stats against a full recompute (requires --state-file)"
+    )
+    
+    parser.add_argument(
+        "--engine",
+        choices=["python", "numpy"],
+        default="python",
+        help=f"Round aggregation engine for --focus-player {ALL_PLAYERS}; 'numpy' shares one vectorised round table "
+             "between all players and needs NumPy installed"
+    )
+    
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Stay resident, fold new or changed demos into the stats and rewrite --output as they land"
+    )
+    
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=2.0,
+        help="Seconds between directory scans in watch mode"
+    )
+    
+    parser.add_argument(
+        "--watch-debounce",
+        type=float,
+        default=1.0,
+        help="Seconds the directory must stay unchanged before new demos are parsed in watch mode"
+    )
+    
+    parser.add_argument(
+        "--stacks",
+        action="store_true",
+        help="Add a 'Best Stacks' section ranking 2- to 5-player lineups of mapped players"
+    )
+    
+    parser.add_argument(
+        "--stack-min-matches",
+        type=int,
+        default=5,
+        help="Matches a stack must have played together to be ranked"
+    )
+    
+    parser.add_argument(
+        "--stack-top",
+        type=int,
+        default=5,
+        help="Stacks listed per stack size"
+    )
+    
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        metavar="RESAMPLES",
+        help="Add bootstrap confidence intervals for win rates, side rates, K/D, headshot and clutch rates"
+    )
+    
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level of the --bootstrap intervals"
+    )
+    
+    parser.add_argument(
+        "--bootstrap-seed",
+        type=int,
+        default=0,
+        help="Random seed of the --bootstrap resampling"
+    )
+    
+    parser.add_argument(
+        "--form-matches",
+        type=int,
+        help="Add a 'Recent Form' section with rolling rates over each player's and map's last N matches"
+    )
+    
+    parser.add_argument(
+        "--form-days",
+        type=int,
+        help="Add a 'Recent Form' section with rolling rates over the last D days (combines with --form-matches)"
+    )
+    
+    parser.add_argument(
+        "--form-export",
+        type=str,
+        help="Write the rolling-window time series to this file (.csv, or .json for JSON)"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print wall time, CPU time and peak traced memory of each pipeline stage"
+    )
+    
+    parser.add_argument(
+        "--metrics-json",
+        type=str,
+        help="Write per-stage metrics and run counters to this JSON file"
+    )
+    
+    parser.add_argument(
+        "--cprofile",
+        type=str,
+        help="Dump cProfile statistics of --cprofile-stage to this file (view with pstats or snakeviz)"
+    )
+    
+    parser.add_argument(
+        "--cprofile-stage",
+        choices=["extract", "stream", "filter", "analyze", "bootstrap", "form", "headtohead", "impact", "lineups", "partial", "report", "write"],
+        default="analyze",
+        help="Pipeline stage profiled by --cprofile"
+    )
+    
+    parser.add_argument(
+        "--db",
+        type=str,
+        help="SQLite match database used by --ingest, --from-db and --head-to-head"
+    )
+    
+    db_group = parser.add_mutually_exclusive_group()
+    db_group.add_argument(
+        "--ingest",
+        action="store_true",
+        help="Write the demos from --input-dir into --db and build the report from the database"
+    )
+    db_group.add_argument(
+        "--from-db",
+        action="store_true",
+        help="Build the report from --db with SQL aggregates instead of reading demo files"
+    )
+    
+    partial_group = parser.add_mutually_exclusive_group()
+    partial_group.add_argument(
+        "--emit-partial",
+        type=str,
+        help="Also write the raw stat counters and match list to this shard file for a later --merge-partials"
+    )
+    partial_group.add_argument(
+        "--merge-partials",
+        nargs="+",
+        metavar="SHARD",
+        help="Build the report by merging shard files written with --emit-partial instead of reading demo files"
+    )
+    
+    archive_group = parser.add_mutually_exclusive_group()
+    archive_group.add_argument(
+        "--archive-write",
+        type=str,
+        help="Also convert the loaded demos into a compact binary archive at this path"
+    )
+    archive_group.add_argument(
+        "--archive",
+        type=str,
+        help="Read matches from a binary archive written with --archive-write instead of demo files"
+    )
+    
+    parser.add_argument(
+        "--impact",
+        action="store_true",
+        help="Add a 'Player Impact' section (ADR, KAST, first kills, utility damage) read from --archive"
+    )
+    
+    parser.add_argument(
+        "--head-to-head",
+        action="store_true",
+        help="Store the loaded demos with their full rosters in --db and add a 'Head-to-Head' section with the "
+             "focus player's record against each opponent"
+    )
+    
+    parser.add_argument(
+        "--h2h-min-matches",
+        type=int,
+        default=2,
+        help="Minimum matches against an opponent for it to be listed (default: 2)"
+    )
+    
+    parser.add_argument(
+        "--h2h-top",
+        type=int,
+        default=10,
+        help="Number of opponent teams and players listed (default: 10)"
     )
     
     return parser.parse_args()
@@ -75,6 +375,148 @@ def validate_inputs(args):
     """
     Validate the provided input arguments.
     """
+    if (args.ingest or args.from_db) and not args.db:
+        print("Error: --ingest and --from-db require --db.")
+        sys.exit(1)
+    
+    if args.from_db and args.state_file:
+        print("Error: --state-file cannot be combined with --from-db.")
+        sys.exit(1)
+    
+    if args.low_memory and (args.focus_player == ALL_PLAYERS or args.state_file or args.ingest or args.from_db):
+        print(f"Error: --low-memory cannot be combined with --focus-player {ALL_PLAYERS}, --state-file, --ingest or --from-db.")
+        sys.exit(1)
+    
+    if args.watch:
+        if not args.output:
+            print("Error: --watch requires --output.")
+            sys.exit(1)
+        if args.focus_player == ALL_PLAYERS or args.state_file or args.ingest or args.from_db or args.dedupe:
+            print(f"Error: --watch cannot be combined with --focus-player {ALL_PLAYERS}, --state-file, --ingest, --from-db or --dedupe.")
+            sys.exit(1)
+        if args.low_memory or args.engine == "numpy" or args.profile or args.metrics_json or args.cprofile:
+            print("Error: --watch cannot be combined with --low-memory, --engine numpy, --profile, --metrics-json or --cprofile.")
+            sys.exit(1)
+    
+    partial_flag = "--emit-partial" if args.emit_partial else "--merge-partials"
+    if (args.emit_partial or args.merge_partials) and (args.focus_player == ALL_PLAYERS or args.low_memory or args.state_file
+                                                       or args.ingest or args.from_db or args.watch):
+        print(f"Error: {partial_flag} cannot be combined with --focus-player {ALL_PLAYERS}, --low-memory, --state-file, "
+              "--ingest, --from-db or --watch.")
+        sys.exit(1)
+    
+    if args.stacks and (args.low_memory or args.state_file or args.ingest or args.from_db or args.merge_partials or args.watch):
+        print("Error: --stacks cannot be combined with --low-memory, --state-file, --ingest, --from-db, --merge-partials or --watch.")
+        sys.exit(1)
+    
+    if args.bootstrap is not None:
+        if args.focus_player == ALL_PLAYERS or args.low_memory or args.state_file or args.ingest or args.from_db \
+                or args.merge_partials or args.watch:
+            print(f"Error: --bootstrap cannot be combined with --focus-player {ALL_PLAYERS}, --low-memory, --state-file, "
+                  "--ingest, --from-db, --merge-partials or --watch.")
+            sys.exit(1)
+        if args.bootstrap < 1 or not 0 < args.confidence < 1:
+            print("Error: --bootstrap needs at least 1 resample and --confidence must be between 0 and 1.")
+            sys.exit(1)
+    
+    try:
+        args.format = parse_formats(args.format)
+    except ValueError as e:
+        print(f"Error: --format: {e}")
+        sys.exit(1)
+    if len(args.format) > 1 and not args.output:
+        print("Error: several --format values require --output.")
+        sys.exit(1)
+    if args.watch and args.format != ["md"]:
+        print("Error: --watch only writes markdown reports.")
+        sys.exit(1)
+    # The optional sections only exist in the markdown and JSON renderers
+    extra_sections = args.stacks or args.bootstrap or args.form_matches is not None or args.form_days is not None \
+        or args.head_to_head or args.impact
+    if extra_sections and not set(args.format) <= {"md", "json"}:
+        print("Error: --stacks, --bootstrap, --form-matches/--form-days, --head-to-head and --impact are only "
+              "rendered in the md and json formats; drop csv and html from --format.")
+        sys.exit(1)
+    
+    form_enabled = args.form_matches is not None or args.form_days is not None
+    if form_enabled or args.form_export:
+        if not form_enabled:
+            print("Error: --form-export requires --form-matches or --form-days.")
+            sys.exit(1)
+        if args.focus_player == ALL_PLAYERS or args.low_memory or args.state_file or args.ingest or args.from_db \
+                or args.merge_partials or args.watch:
+            print(f"Error: --form-matches/--form-days cannot be combined with --focus-player {ALL_PLAYERS}, --low-memory, "
+                  "--state-file, --ingest, --from-db, --merge-partials or --watch.")
+            sys.exit(1)
+        if (args.form_matches is not None and args.form_matches < 1) or (args.form_days is not None and args.form_days < 1):
+            print("Error: --form-matches and --form-days must be at least 1.")
+            sys.exit(1)
+    
+    if args.stack_min_matches < 1 or args.stack_top < 1:
+        print("Error: --stack-min-matches and --stack-top must be at least 1.")
+        sys.exit(1)
+    
+    if args.archive_write and (args.low_memory or args.from_db or args.merge_partials or args.watch):
+        print("Error: --archive-write cannot be combined with --low-memory, --from-db, --merge-partials or --watch.")
+        sys.exit(1)
+    if args.archive_write and args.parser == "stream":
+        # The streaming parser drops the round numbers and end reasons the impact figures need
+        print("Error: --archive-write needs the full demo records; use --parser json.")
+        sys.exit(1)
+    
+    if args.head_to_head:
+        if not args.db:
+            print("Error: --head-to-head requires --db.")
+            sys.exit(1)
+        if args.focus_player == ALL_PLAYERS or args.low_memory or args.merge_partials or args.watch:
+            print(f"Error: --head-to-head cannot be combined with --focus-player {ALL_PLAYERS}, --low-memory, "
+                  "--merge-partials or --watch.")
+            sys.exit(1)
+        if args.h2h_min_matches < 1 or args.h2h_top < 1:
+            print("Error: --h2h-min-matches and --h2h-top must be at least 1.")
+            sys.exit(1)
+    
+    if args.impact and not args.archive:
+        print("Error: --impact requires --archive.")
+        sys.exit(1)
+    
+    if args.archive:
+        if args.low_memory or args.from_db or args.merge_partials or args.watch or args.dedupe:
+            print("Error: --archive cannot be combined with --low-memory, --from-db, --merge-partials, --watch or --dedupe.")
+            sys.exit(1)
+        if not Path(args.archive).exists():
+            print(f"Error: Archive file '{args.archive}' does not exist.")
+            sys.exit(1)
+        if not Path(args.player_mapping).exists():
+            print(f"Error: Player mapping file '{args.player_mapping}' does not exist.")
+            sys.exit(1)
+        if args.since and args.until and args.since > args.until:
+            print(f"Error: --since {args.since} is after --until {args.until}.")
+            sys.exit(1)
+        return []
+    
+    if args.merge_partials:
+        if args.since or args.until or args.map:
+            print("Error: --since, --until and --map apply when the shards are emitted, not when they are merged.")
+            sys.exit(1)
+        for partial_file in args.merge_partials:
+            if not Path(partial_file).exists():
+                print(f"Error: Shard file '{partial_file}' does not exist.")
+                sys.exit(1)
+        if not Path(args.player_mapping).exists():
+            print(f"Error: Player mapping file '{args.player_mapping}' does not exist.")
+            sys.exit(1)
+        return []
+    
+    if args.from_db:
+        if not Path(args.db).exists():
+            print(f"Error: Match database '{args.db}' does not exist.")
+            sys.exit(1)
+        if not Path(args.player_mapping).exists():
+            print(f"Error: Player mapping file '{args.player_mapping}' does not exist.")
+            sys.exit(1)
+        return []
+    
     # Check if input directory exists
     input_path = Path(args.input_dir)
     if not input_path.exists():
@@ -91,10 +533,34 @@ def validate_inputs(args):
         print(f"Error: Player mapping file '{args.player_mapping}' does not exist.")
         sys.exit(1)
     
+    if args.since and args.until and args.since > args.until:
+        print(f"Error: --since {args.since} is after --until {args.until}.")
+        sys.exit(1)
+    
+    if args.state_file and args.focus_player == ALL_PLAYERS:
+        print(f"Error: --state-file cannot be combined with --focus-player {ALL_PLAYERS}.")
+        sys.exit(1)
+    
+    if args.verify_incremental and not args.state_file:
+        print("Error: --verify-incremental requires --state-file.")
+        sys.exit(1)
+    
+    if args.engine == "numpy" and (args.focus_player != ALL_PLAYERS or args.ingest or args.from_db):
+        print(f"Error: --engine numpy requires --focus-player {ALL_PLAYERS} and cannot be combined with --ingest or --from-db.")
+        sys.exit(1)
+    
+    if args.engine == "numpy" and not numpy_available():
+        print("Warning: NumPy is not installed, falling back to the Python engine.")
+        args.engine = "python"
+    
+    if args.jobs < 1:
+        print(f"Error: --jobs must be at least 1, got {args.jobs}.")
+        sys.exit(1)
+    
     # Check if there are JSON files in the input directory
     json_pattern = str(input_path / args.file_pattern)
-    json_files = glob.glob(json_pattern)
-    if not json_files:
+    json_files = find_demoFiles(args.input_dir, args.file_pattern)
+    if not json_files and not args.watch:
         print(f"Error: No JSON files found matching pattern '{json_pattern}'.")
         sys.exit(1)
     
@@ -102,6 +568,75 @@ def validate_inputs(args):
     return json_files
 
 
+def run_incremental(args, extractedDemo: Dict, player_mapping: Dict[str, str]) -> Dict:
+    """
+    Updates the persisted aggregate state with the current demo set and returns its stats.
+    """
+    state = load_statsState(args.state_file, args.focus_player, player_mapping)
+    state, added, removed = update_statsState(state, extractedDemo, player_mapping)
+    print(f"Incremental stats: {added} new, {removed} removed, {len(state['matches'])} matches in state")
+    
+    if args.verify_incremental:
+        if verify_statsState(state, extractedDemo, player_mapping) is None:
+            print("Incremental stats match a full recompute.")
+        else:
+            print("Warning: Incremental stats differ from a full recompute. Rebuilding state.")
+            state, _, _ = update_statsState(new_statsState(args.focus_player, player_mapping), extractedDemo, player_mapping)
+    
+    save_statsState(args.state_file, state)
+    return state["stats"]
+
+
+def run_database(args, extractedDemo: Dict, player_mapping: Dict[str, str], focus_players: list) -> Dict[str, Dict]:
+    """
+    Ingests extracted demos if requested and computes the stats of each focus player with SQL.
+    """
+    conn = open_matchStore(args.db)
+    try:
+        if args.ingest:
+            count = ingest_matches(conn, extractedDemo, player_mapping)
+            print(f"Ingested {count} matches into {args.db}")
+        else:
+            sync_playerMapping(conn, player_mapping)
+        
+        return {player: query_stats(conn, player, since=args.since, until=args.until, maps=args.map)
+                for player in focus_players}
+    finally:
+        conn.close()
+
+
+def run_mergePartials(args, player_mapping: Dict[str, str]) -> Dict:
+    """
+    Loads the shard files, checks they were built for the same focus player and mapping, and merges them.
+    """
+    partials = []
+    for partial_file in args.merge_partials:
+        try:
+            partial = load_partial(partial_file)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        if partial["focus_player"] != args.focus_player:
+            print(f"Error: Shard '{partial_file}' was built for focus player '{partial['focus_player']}'.")
+            sys.exit(1)
+        if partial["mapping"] != mapping_fingerprint(player_mapping):
+            print(f"Error: Shard '{partial_file}' was built with a different player mapping.")
+            sys.exit(1)
+        partials.append(partial)
+    
+    stats, duplicates, conflicts = merge_partials(partials, args.focus_player)
+    for match_name, first, later in duplicates:
+        print(f"Duplicate match '{match_name}' in {args.merge_partials[later]} already counted from "
+              f"{args.merge_partials[first]}; skipped.")
+    for match_name, first, later in conflicts:
+        print(f"Warning: Match '{match_name}' differs between {args.merge_partials[first]} and "
+              f"{args.merge_partials[later]}; using the one from {args.merge_partials[later]}.")
+    
+    print(f"Merged {len(partials)} shards: {stats['total_stats']['total_matches']} matches, "
+          f"{len(duplicates)} duplicates skipped, {len(conflicts)} conflicting names replaced")
+    return stats
+
+
 def main() -> None:
     # Parse command line arguments
     args = parse_arguments()
@@ -113,7 +648,7 @@ def main() -> None:
     player_mapping = load_playerMapping(args.player_mapping)
     
     # Verify focus player is in mapping
-    focus_player_found = False
+    focus_player_found = args.focus_player == ALL_PLAYERS
     for mapped_names in player_mapping.values():
         if args.focus_player == mapped_names:
             focus_player_found = True
@@ -126,29 +661,219 @@ def main() -> None:
         if response.lower() != 'y':
             sys.exit(1)
     
+    if args.watch:
+        watcher = DemoWatcher(args.input_dir, args.file_pattern, args.focus_player, player_mapping,
+                              since=args.since, until=args.until, maps=args.map,
+                              jobs=args.jobs, streaming=args.parser == "stream")
+        print(f"Watching '{args.input_dir}' for demo files (Ctrl+C to stop)...")
+        watch_directory(watcher, args.output, interval=args.watch_interval, debounce=args.watch_debounce)
+        return
+    
+    metrics = PipelineMetrics(enabled=args.profile or bool(args.metrics_json),
+                              profile_stage=args.cprofile_stage, profile_path=args.cprofile)
+    
+    if args.focus_player == ALL_PLAYERS:
+        focus_players = list(dict.fromkeys(player_mapping.values()))
+    else:
+        focus_players = [args.focus_player]
+    
     try:
         print(f"Analyzing matches for focus player: {args.focus_player}")
-        print(f"Processing {len(json_files)} demo files...")
         
-        extractedDemo = extract_demoData(json_files)
-        filteredData = filter_players(extractedDemo, player_mapping)
-        stats = analyze_stats(filteredData, args.focus_player)
-        output = generate_report(stats)
+        extractedDemo = {}
+        failed_files = []
+        with metrics.stage("stream" if args.low_memory else "extract"):
+            if json_files:
+                cache = None
+                if not args.no_cache:
+                    cache = open_demoCache(args.cache_file, max_bytes=args.cache_max_mb * 1024 * 1024,
+                                           verify_hash=args.cache_hash, rebuild=args.rebuild_cache)
+                
+                # Drop demos outside the date/map filters before they are fully parsed
+                if args.since or args.until or args.map:
+                    index = build_demoIndex(json_files, cache)
+                    selected = select_demoFiles(json_files, index, args.since, args.until, args.map)
+                    print(f"Filters matched {len(selected)} of {len(json_files)} demo files.")
+                    json_files = selected
+                
+                renames = None
+                if args.dedupe:
+                    json_files, duplicates, renames = dedupe_demoFiles(json_files, cache)
+                    for file_path, original in duplicates:
+                        print(f"Skipping {file_path}: same match as {original}")
+                    for file_path, match_name in renames.items():
+                        print(f"Match name collision: {file_path} is kept as '{match_name}'")
+                    print(f"Dedupe: {len(duplicates)} duplicate files skipped, {len(renames)} name collisions")
+                
+                print(f"Processing {len(json_files)} demo files...")
+                if args.low_memory:
+                    counters = {}
+                    stats_by_player = {args.focus_player: stream_stats(
+                        json_files, player_mapping, args.focus_player, jobs=args.jobs,
+                        streaming=args.parser == "stream", cache=cache, failed=failed_files, counters=counters,
+                        renames=renames
+                    )}
+                else:
+                    extractedDemo = extract_demoData(json_files, jobs=args.jobs, streaming=args.parser == "stream",
+                                                     cache=cache, failed=failed_files, renames=renames)
+                if cache is not None:
+                    print(f"Demo cache: {cache.hits} hits, {cache.misses} misses")
+                    cache.close()
+            elif args.archive:
+                try:
+                    archive = DemoArchive(args.archive)
+                except ValueError as e:
+                    print(f"Error: {e}")
+                    sys.exit(1)
+                selected = archive.select(args.since, args.until, args.map)
+                print(f"Reading {len(selected)} of {len(archive)} matches from {args.archive}...")
+                extractedDemo = archive.matches(selected)
         
-        # Output handling
-        if args.output:
-            output_path = Path(args.output)
-            # Create output directory if it doesn't exist
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(output)
-            print(f"Report saved to: {args.output}")
+        if args.archive_write:
+            try:
+                size = write_archive(args.archive_write, extractedDemo)
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            print(f"Archive of {len(extractedDemo)} matches saved to: {args.archive_write} ({size / 1024:.1f} KiB)")
+        
+        if args.low_memory:
+            metrics.count(files=len(json_files), **counters)
         else:
-            print("\n" + "="*50)
-            print("CS2 MATCH REPORT")
-            print("="*50)
-            print(output)
+            metrics.count(files=len(json_files), matches=len(extractedDemo),
+                          rounds=sum(len(match.get("rounds", [])) for match in extractedDemo.values()))
+        metrics.add_failedFiles(failed_files)
+        
+        if args.merge_partials:
+            with metrics.stage("analyze"):
+                stats_by_player = {args.focus_player: run_mergePartials(args, player_mapping)}
+        elif args.ingest or args.from_db:
+            with metrics.stage("analyze"):
+                stats_by_player = run_database(args, extractedDemo, player_mapping, focus_players)
+        elif args.state_file:
+            with metrics.stage("analyze"):
+                stats_by_player = {args.focus_player: run_incremental(args, extractedDemo, player_mapping)}
+        elif not args.low_memory:
+            # With --low-memory the matches were already aggregated while streaming
+            with metrics.stage("filter"):
+                filteredData = filter_players(extractedDemo, player_mapping)
+            with metrics.stage("analyze"):
+                if args.focus_player == ALL_PLAYERS:
+                    stats_by_player = analyze_allPlayers(filteredData, focus_players, engine=args.engine)
+                else:
+                    stats_by_player = {args.focus_player: analyze_stats(filteredData, args.focus_player)}
+            
+            if args.stacks:
+                with metrics.stage("lineups"):
+                    players = lineup_players(player_mapping)
+                    ranked_stacks = rank_stacks(build_lineupTable(filteredData, players), players,
+                                                min_matches=args.stack_min_matches)
+            
+            if args.bootstrap:
+                with metrics.stage("bootstrap"):
+                    intervals = bootstrap_stats(filteredData, args.focus_player, resamples=args.bootstrap,
+                                                confidence=args.confidence, seed=args.bootstrap_seed)
+                if intervals["engine"] != "numpy":
+                    print("NumPy is not installed, bootstrap resampling runs in pure Python.")
+            
+            if args.form_matches is not None or args.form_days is not None:
+                with metrics.stage("form"):
+                    form = track_form(filteredData, args.focus_player, max_matches=args.form_matches,
+                                      max_days=args.form_days)
+                if form["skipped"]:
+                    print(f"Form tracking skipped {form['skipped']} matches without a readable date.")
+                if args.form_export:
+                    write_formSeries(args.form_export, form["series"])
+                    print(f"Form time series saved to: {args.form_export}")
+            
+            if args.emit_partial:
+                with metrics.stage("partial"):
+                    save_partial(args.emit_partial, build_partial(filteredData, stats_by_player[args.focus_player],
+                                                                  args.focus_player, player_mapping))
+                print(f"Partial stats saved to: {args.emit_partial}")
+        
+        if args.head_to_head:
+            with metrics.stage("headtohead"):
+                conn = open_matchStore(args.db)
+                try:
+                    # --ingest already stored the demos; the report then covers the whole store, like --from-db
+                    from_store = args.ingest or args.from_db
+                    if not from_store and extractedDemo:
+                        print(f"Stored {ingest_matches(conn, extractedDemo, player_mapping)} matches with their rosters in {args.db}")
+                    else:
+                        sync_playerMapping(conn, player_mapping)
+                    # Otherwise only the matches loaded in this run count, even if none loaded
+                    opponents = head_to_head(conn, args.focus_player, match_names=None if from_store else list(extractedDemo),
+                                             since=args.since, until=args.until, maps=args.map)
+                finally:
+                    conn.close()
+        
+        if args.impact:
+            with metrics.stage("impact"):
+                impact = archive.player_impact(player_mapping, selected)
+        if args.archive:
+            archive.close()
+        
+        with metrics.stage("report"):
+            # Derived metrics are computed once and shared by every format
+            models = {player_name: build_reportModel(stats) for player_name, stats in stats_by_player.items()}
+            combined = args.focus_player == ALL_PLAYERS
+            
+            # Optional sections: appended as markdown, added as extra keys to JSON
+            extras = {}
+            sections = []
+            if args.bootstrap:
+                extras["confidence_intervals"] = intervals
+                sections.append(generate_confidenceReport(intervals))
+            if args.form_matches is not None or args.form_days is not None:
+                extras["form"] = {key: value for key, value in form.items() if key != "series"}
+                sections.append(generate_formReport(form))
+            if args.stacks:
+                extras["stacks"] = ranked_stacks
+                sections.append(generate_stackReport(ranked_stacks, args.stack_min_matches, top=args.stack_top))
+            if args.head_to_head:
+                ranked_teams = rank_opponents(opponents["teams"], args.h2h_min_matches)
+                ranked_players = rank_opponents(opponents["players"], args.h2h_min_matches)
+                extras["head_to_head"] = {"teams": ranked_teams, "players": ranked_players}
+                sections.append(generate_headToHeadReport(ranked_teams, ranked_players, args.h2h_min_matches, top=args.h2h_top))
+            if args.impact:
+                extras["impact"] = impact
+                sections.append(generate_impactReport(impact))
+            
+            outputs = {}
+            for fmt in args.format:
+                outputs[fmt] = RENDERERS[fmt](models, combined=combined, extras=extras)
+                if fmt == "md":
+                    outputs[fmt] = "\n".join([outputs[fmt]] + sections)
+        
+        # Output handling
+        with metrics.stage("write"):
+            if args.output:
+                for fmt, output_file in format_paths(args.output, args.format).items():
+                    output_path = Path(output_file)
+                    # Create output directory if it doesn't exist
+                    output_path.parent.mkdir(parents=True, exist_ok=True)
+                    
+                    with open(output_path, 'w', encoding='utf-8') as f:
+                        f.write(outputs[fmt])
+                    print(f"Report saved to: {output_file}")
+            elif args.format == ["md"]:
+                print("\n" + "="*50)
+                print("CS2 MATCH REPORT")
+                print("="*50)
+                print(outputs["md"])
+            else:
+                print(outputs[args.format[0]])
+        
+        metrics.stop()
+        if args.profile:
+            print("\nPipeline profile:")
+            print(metrics.summary())
+        if args.metrics_json:
+            metrics.write_json(args.metrics_json)
+            print(f"Metrics saved to: {args.metrics_json}")
+        if args.cprofile:
+            print(f"cProfile data for stage '{args.cprofile_stage}' saved to: {args.cprofile}")
 
     except Exception as e:
         print(f"Error during analysis: {e}")
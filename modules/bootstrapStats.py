@@ -0,0 +1,207 @@
+import bisect
+import math
+import random
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence, Tuple
+from modules.matchContext import build_matchContext
+from modules.roundTable import np, numpy_available
+from modules.statsAnalyzer import count_focusRounds
+from modules.statAccumulators import CLUTCH_NAMES, RoundAccumulator, TotalAccumulator
+
+
+# Upper bound on resample x match cells drawn at once by the NumPy engine
+BLOCK_CELLS = 2_000_000
+
+# Player rates as (numerator column, denominator column, K/D-style zero handling)
+PLAYER_RATIOS = {
+    "kills_per_match": ("kills", "ones", False),
+    "kd": ("kills", "deaths", True),
+    "headshot_rate": ("headshots", "kills", False),
+    "clutch_rate": ("clutches_won", "clutches", False)
+}
+
+
+def _ratio(num: float, den: float, keep_numerator: bool) -> float:
+    if den > 0:
+        return num / den
+    return num if keep_numerator else 0.0
+
+
+def _binomial_cdf(n: int, p: float) -> List[float]:
+    """
+    Cumulative Binomial(n, p) probabilities for k = 0..n, computed in log space so large n does not underflow
+    """
+    log_p, log_q = math.log(p), math.log1p(-p)
+    log_n = math.lgamma(n + 1)
+    return list(accumulate(
+        math.exp(log_n - math.lgamma(k + 1) - math.lgamma(n - k + 1) + k * log_p + (n - k) * log_q)
+        for k in range(n + 1)
+    ))
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Linear-interpolated percentile of an already sorted sequence
+    """
+    position = q * (len(sorted_values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class Bootstrap:
+    """
+    Draws bootstrap replicates with NumPy when available and with the random module otherwise.
+    Replicates of one quantity are returned sorted so intervals are read off by percentile.
+    """
+
+    def __init__(self, resamples: int = 2000, confidence: float = 0.95, seed: int = 0, use_numpy: bool = True):
+        self.resamples = resamples
+        self.confidence = confidence
+        self.use_numpy = use_numpy and numpy_available()
+        self.rng = np.random.default_rng(seed) if self.use_numpy else random.Random(seed)
+
+    def interval(self, point: float, replicates: Sequence[float]) -> Tuple[float, float, float]:
+        alpha = (1 - self.confidence) / 2
+        return point, float(_percentile(replicates, alpha)), float(_percentile(replicates, 1 - alpha))
+
+    def resample_sums(self, columns: List[List[float]]) -> List[Sequence[float]]:
+        """
+        Resamples rows (matches) with replacement and returns the column sums of every replicate
+        """
+        n = len(columns[0])
+        if self.use_numpy:
+            data = np.asarray(columns, dtype=np.float64).T
+            block = max(1, BLOCK_CELLS // max(n, 1))
+            sums = []
+            for start in range(0, self.resamples, block):
+                size = min(block, self.resamples - start)
+                # How often each match is drawn in each replicate, then all column sums in one product
+                rows = self.rng.integers(0, n, size=(size, n)) + np.arange(size)[:, None] * n
+                counts = np.bincount(rows.ravel(), minlength=size * n).reshape(size, n)
+                sums.append(counts @ data)
+            return list(np.concatenate(sums).T)
+
+        rows = range(n)
+        sums = [[] for _ in columns]
+        for _ in range(self.resamples):
+            sample = self.rng.choices(rows, k=n)
+            for column, column_sums in zip(columns, sums):
+                column_sums.append(sum(column[row] for row in sample))
+        return sums
+
+    def ratio_intervals(self, columns: Dict[str, List[float]],
+                        ratios: Dict[str, Tuple[str, str, bool]]) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Intervals of sum(numerator) / sum(denominator) for each (numerator, denominator, keep_numerator)
+        ratio over the same per-match columns; all columns share one set of match-level resamples.
+        A zero denominator gives 0, or the numerator itself with keep_numerator (as K/D does in the report).
+        """
+        names = list(columns)
+        sums = dict(zip(names, self.resample_sums([columns[name] for name in names])))
+
+        intervals = {}
+        for key, (numerator, denominator, keep_numerator) in ratios.items():
+            point = _ratio(sum(columns[numerator]), sum(columns[denominator]), keep_numerator)
+            num_sums, den_sums = sums[numerator], sums[denominator]
+            if self.use_numpy:
+                fallback = num_sums if keep_numerator else 0.0
+                replicates = np.sort(np.where(den_sums > 0, num_sums / np.where(den_sums > 0, den_sums, 1), fallback))
+            else:
+                replicates = sorted(_ratio(num, den, keep_numerator) for num, den in zip(num_sums, den_sums))
+            intervals[key] = self.interval(point, replicates)
+        return intervals
+
+    def proportion_interval(self, won: int, total: int) -> Tuple[float, float, float]:
+        """
+        Interval of won / total when the individual trials (rounds) are resampled
+        """
+        if total == 0:
+            return 0.0, 0.0, 0.0
+        point = won / total
+        # Resampling n Bernoulli trials with replacement is a binomial draw
+        if self.use_numpy:
+            return self.interval(point, np.sort(self.rng.binomial(total, point, size=self.resamples) / total))
+        if won in (0, total):
+            return point, point, point
+        cdf = _binomial_cdf(total, point)
+        replicates = sorted(min(bisect.bisect_left(cdf, self.rng.random()), total) / total
+                            for _ in range(self.resamples))
+        return self.interval(point, replicates)
+
+
+def collect_samples(matches: Dict, focusPlayer: str) -> Dict:
+    """
+    Gathers the per-match columns the intervals are computed from, in match order
+    """
+    map_wins = {}
+    all_wins = []
+    rounds = {}
+    total = TotalAccumulator()
+    players = {}
+
+    for match in matches.values():
+        context = build_matchContext(match, focusPlayer)
+        win = 1.0 if context.outcome(match) == "Win" else 0.0
+        map_wins.setdefault(match["map"], []).append(win)
+        all_wins.append(win)
+        count_focusRounds(match, context, rounds, total)
+
+        for player_name, player in match["players"].items():
+            columns = players.setdefault(player_name, {
+                "ones": [], "kills": [], "deaths": [], "headshots": [], "clutches": [], "clutches_won": []
+            })
+            columns["ones"].append(1.0)
+            columns["kills"].append(player["killCount"])
+            columns["deaths"].append(player["deathCount"])
+            columns["headshots"].append(player["headshotCount"])
+            columns["clutches"].append(sum(player[f"vs{name}Count"] for name in CLUTCH_NAMES))
+            columns["clutches_won"].append(sum(player[f"vs{name}WonCount"] for name in CLUTCH_NAMES))
+
+    return {"map_wins": map_wins, "all_wins": all_wins, "rounds": rounds, "total": total, "players": players}
+
+
+def bootstrap_stats(matches: Dict, focusPlayer: str, resamples: int = 2000, confidence: float = 0.95,
+                    seed: int = 0, use_numpy: bool = True) -> Dict:
+    """
+    Computes (point, lower, upper) bootstrap intervals for the rates in the report.
+    Map and player rates resample matches; CT/T rates resample rounds.
+    """
+    samples = collect_samples(matches, focusPlayer)
+    bootstrap = Bootstrap(resamples, confidence, seed, use_numpy)
+
+    def side_intervals(rounds: Optional[RoundAccumulator]) -> Dict:
+        if rounds is None:
+            rounds = RoundAccumulator()
+        return {
+            "ct": bootstrap.proportion_interval(rounds.ct_won, rounds.ct_total),
+            "t": bootstrap.proportion_interval(rounds.t_won, rounds.t_total)
+        }
+
+    def win_rate(wins: List[float]) -> Dict:
+        if not wins:
+            return {"matches": 0, "win_rate": (0.0, 0.0, 0.0)}
+        columns = {"wins": wins, "ones": [1.0] * len(wins)}
+        return dict(matches=len(wins), **bootstrap.ratio_intervals(columns, {"win_rate": ("wins", "ones", False)}))
+
+    map_stats = {}
+    for map_name, wins in samples["map_wins"].items():
+        map_stats[map_name] = win_rate(wins)
+        map_stats[map_name].update(side_intervals(samples["rounds"].get(map_name)))
+
+    total_stats = win_rate(samples["all_wins"])
+    total_stats.update(side_intervals(samples["total"]))
+
+    player_stats = {}
+    for player_name, columns in samples["players"].items():
+        player_stats[player_name] = dict(matches=len(columns["ones"]), **bootstrap.ratio_intervals(columns, PLAYER_RATIOS))
+
+    return {
+        "resamples": resamples,
+        "confidence": confidence,
+        "engine": "numpy" if bootstrap.use_numpy else "python",
+        "map_stats": map_stats,
+        "total_stats": total_stats,
+        "player_stats": player_stats
+    }
+
@@ -0,0 +1,333 @@
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+from modules.demoIndex import meta_selected
+
+
+ARCHIVE_MAGIC = b"CS2A"
+ARCHIVE_VERSION = 1
+
+# Marks an optional string field (steamId, round end reason, ...) that was absent in the export
+NO_STRING = 0xFFFFFFFF
+
+# All records are little-endian with fixed widths; string fields are indices into the string table.
+# Sections follow the header in this order: matches, rounds, player lines, string offsets, string bytes.
+HEADER = struct.Struct("<4sHHIIII")           # magic, version, reserved, matches, rounds, lines, strings
+MATCH = struct.Struct("<IIIIIHHIHIH")         # name, date, map, teamA name, teamB name, teamA score, teamB score,
+                                              # first round, round count, first line, line count
+ROUND = struct.Struct("<HBBII")               # number, teamASide, teamBSide, winnerTeamName, endReason
+LINE = struct.Struct("<IIIHHHHH10BffHHIB")    # name, steamId, teamName, kills, assists, deaths, mvps, headshots,
+                                              # clutch (count, won) x5, ADR, KAST, first kills, first deaths,
+                                              # utility damage, optional-field bits
+OFFSET = struct.Struct("<I")
+
+CLUTCH_KEYS = [(f"vs{name}Count", f"vs{name}WonCount") for name in ("One", "Two", "Three", "Four", "Five")]
+
+# Optional player line fields: (export key, LINE field index, presence bit)
+OPTIONAL_FIELDS = [
+    ("averageDamagePerRound", 18, 1),
+    ("kast", 19, 2),
+    ("firstKillCount", 20, 4),
+    ("firstDeathCount", 21, 8),
+    ("utilityDamage", 22, 16)
+]
+
+
+class StringTable:
+    """
+    Interns strings while an archive is written; each distinct string is stored once
+    """
+
+    def __init__(self):
+        self.ids = {}
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.ids)
+        return string_id
+
+
+def _pack_match(buffers: Tuple[bytearray, bytearray, bytearray], strings: StringTable, match_name: str,
+                match: Dict, first_round: int, first_line: int) -> Tuple[int, int]:
+    """
+    Appends one match with its rounds and player lines; returns the number of rounds and lines written
+    """
+    match_buffer, round_buffer, line_buffer = buffers
+    rounds = match.get("rounds", [])
+    players = match["players"]
+
+    for round_data in rounds:
+        round_buffer += ROUND.pack(round_data.get("number", 0), round_data.get("teamASide") or 0,
+                                   round_data.get("teamBSide") or 0, strings.add(round_data.get("winnerTeamName")),
+                                   strings.add(round_data.get("endReason")))
+
+    for player in players:
+        clutches = []
+        for count_key, won_key in CLUTCH_KEYS:
+            clutches.append(player[count_key])
+            clutches.append(player[won_key])
+        optional = [0.0, 0.0, 0, 0, 0]
+        present = 0
+        for position, (key, _, bit) in enumerate(OPTIONAL_FIELDS):
+            if player.get(key) is not None:
+                optional[position] = player[key]
+                present |= bit
+        steam_id = player.get("steamId")
+        line_buffer += LINE.pack(strings.add(player["name"]), strings.add(None if steam_id is None else str(steam_id)),
+                                 strings.add(player.get("teamName")), player["killCount"], player["assistCount"],
+                                 player["deathCount"], player["mvpCount"], player["headshotCount"], *clutches,
+                                 *optional, present)
+
+    match_buffer += MATCH.pack(strings.add(match_name), strings.add(match["date"]), strings.add(match["map"]),
+                               strings.add(match["teamA"]["name"]), strings.add(match["teamB"]["name"]),
+                               match["teamA"]["score"], match["teamB"]["score"],
+                               first_round, len(rounds), first_line, len(players))
+    return len(rounds), len(players)
+
+
+def write_archive(archive_file: str, matches: Dict) -> int:
+    """
+    Converts extracted matches (as returned by extract_demoData) into a binary archive and
+    returns its size in bytes. Round events and player fields the pipeline does not use are dropped;
+    ADR and KAST are stored as 32-bit floats. Raises ValueError if a value does not fit its field.
+    """
+    strings = StringTable()
+    buffers = (bytearray(), bytearray(), bytearray())
+    round_count = line_count = 0
+
+    for match_name, match in matches.items():
+        try:
+            rounds, lines = _pack_match(buffers, strings, match_name, match, round_count, line_count)
+        except (struct.error, KeyError, TypeError) as e:
+            raise ValueError(f"cannot archive match '{match_name}': {e}")
+        round_count += rounds
+        line_count += lines
+
+    encoded = [value.encode("utf-8") for value in strings.ids]
+    offsets = bytearray(OFFSET.pack(0))
+    position = 0
+    for value in encoded:
+        position += len(value)
+        offsets += OFFSET.pack(position)
+
+    tmp_file = f"{archive_file}.tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0, len(matches), round_count, line_count, len(encoded)))
+        for buffer in buffers:
+            f.write(buffer)
+        f.write(offsets)
+        for value in encoded:
+            f.write(value)
+        size = f.tell()
+    os.replace(tmp_file, archive_file)
+    return size
+
+
+class DemoArchive:
+    """
+    Read-only view of a binary archive. The file is memory-mapped and records are decoded straight
+    from memoryview slices of the mapping, so nothing but the fields asked for is ever copied.
+    """
+
+    def __init__(self, archive_file: str):
+        self.archive_file = archive_file
+        with open(archive_file, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"'{archive_file}' is not a demo archive")
+            self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mapping)
+
+        magic, version, _, self.match_count, self.round_count, self.line_count, self.string_count = HEADER.unpack_from(self.view)
+        if magic != ARCHIVE_MAGIC:
+            self.close()
+            raise ValueError(f"'{archive_file}' is not a demo archive")
+        if version != ARCHIVE_VERSION:
+            self.close()
+            raise ValueError(f"'{archive_file}' has archive version {version}, expected {ARCHIVE_VERSION}")
+
+        self.match_offset = HEADER.size
+        self.round_offset = self.match_offset + self.match_count * MATCH.size
+        self.line_offset = self.round_offset + self.round_count * ROUND.size
+        self.string_offset = self.line_offset + self.line_count * LINE.size
+        self.blob_offset = self.string_offset + (self.string_count + 1) * OFFSET.size
+        if size < self.blob_offset:
+            self.close()
+            raise ValueError(f"'{archive_file}' is truncated")
+
+        self.strings = [None] * self.string_count
+
+    def close(self) -> None:
+        # The memoryview must be released before the mapping can be closed
+        self.view.release()
+        self.mapping.close()
+
+    def __enter__(self) -> "DemoArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.match_count
+
+    def string(self, string_id: int) -> Optional[str]:
+        """
+        Decodes a string table entry once and serves repeats from memory
+        """
+        if string_id == NO_STRING:
+            return None
+        value = self.strings[string_id]
+        if value is None:
+            start, end = struct.unpack_from("<II", self.view, self.string_offset + string_id * OFFSET.size)
+            value = self.strings[string_id] = str(self.view[self.blob_offset + start:self.blob_offset + end], "utf-8")
+        return value
+
+    def match_record(self, index: int) -> Tuple:
+        return MATCH.unpack_from(self.view, self.match_offset + index * MATCH.size)
+
+    def iter_lines(self, first_line: int, line_count: int) -> Iterable[Tuple]:
+        start = self.line_offset + first_line * LINE.size
+        return LINE.iter_unpack(self.view[start:start + line_count * LINE.size])
+
+    def select(self, since=None, until=None, maps: Optional[List[str]] = None) -> List[int]:
+        """
+        Indices of the matches passing the date and map filters; only the match records are read
+        """
+        if since is None and until is None and not maps:
+            return list(range(self.match_count))
+        selected = []
+        for index in range(self.match_count):
+            record = self.match_record(index)
+            if meta_selected({"date": self.string(record[1]), "map": self.string(record[2])}, since, until, maps):
+                selected.append(index)
+        return selected
+
+    def match(self, index: int) -> Tuple[str, Dict]:
+        """
+        Rebuilds one match in the shape extract_demoData returns
+        """
+        name, date, map_name, teamA_name, teamB_name, teamA_score, teamB_score, \
+            first_round, round_count, first_line, line_count = self.match_record(index)
+
+        rounds = []
+        start = self.round_offset + first_round * ROUND.size
+        for number, teamA_side, teamB_side, winner, end_reason in ROUND.iter_unpack(self.view[start:start + round_count * ROUND.size]):
+            round_data = {"number": number}
+            if teamA_side:
+                round_data["teamASide"] = teamA_side
+            if teamB_side:
+                round_data["teamBSide"] = teamB_side
+            if winner != NO_STRING:
+                round_data["winnerTeamName"] = self.string(winner)
+            if end_reason != NO_STRING:
+                round_data["endReason"] = self.string(end_reason)
+            rounds.append(round_data)
+
+        players = []
+        for line in self.iter_lines(first_line, line_count):
+            player = {
+                "name": self.string(line[0]),
+                "killCount": line[3],
+                "assistCount": line[4],
+                "deathCount": line[5],
+                "mvpCount": line[6],
+                "headshotCount": line[7]
+            }
+            if line[1] != NO_STRING:
+                player["steamId"] = self.string(line[1])
+            if line[2] != NO_STRING:
+                player["teamName"] = self.string(line[2])
+            for position, (count_key, won_key) in enumerate(CLUTCH_KEYS):
+                player[count_key] = line[8 + 2 * position]
+                player[won_key] = line[9 + 2 * position]
+            for key, field, bit in OPTIONAL_FIELDS:
+                if line[23] & bit:
+                    player[key] = line[field]
+            players.append(player)
+
+        return self.string(name), {
+            "date": self.string(date),
+            "map": self.string(map_name),
+            "teamA": {"name": self.string(teamA_name), "score": teamA_score},
+            "teamB": {"name": self.string(teamB_name), "score": teamB_score},
+            "players": players,
+            "rounds": rounds
+        }
+
+    def matches(self, indices: Optional[Iterable[int]] = None) -> Dict:
+        """
+        Rebuilds the selected matches (all by default); a later match with the same name replaces an earlier one
+        """
+        if indices is None:
+            indices = range(self.match_count)
+        return dict(self.match(index) for index in indices)
+
+    def player_impact(self, player_mapping: Dict[str, str], indices: Optional[Iterable[int]] = None) -> Dict[str, Dict]:
+        """
+        ADR, KAST, first kills/deaths and utility damage of every mapped player, read directly from
+        the player line records without rebuilding the matches. ADR and KAST are weighted by rounds.
+        Each rate only counts the matches whose export had that field.
+        """
+        if indices is None:
+            indices = range(self.match_count)
+
+        # String id -> normalised name (or None for unmapped names), so each name is decoded once
+        names = {}
+        totals = {}
+        for index in indices:
+            record = self.match_record(index)
+            round_count = record[8]
+            match_lines = {}
+            for line in self.iter_lines(record[9], record[10]):
+                player_name = names.get(line[0], False)
+                if player_name is False:
+                    player_name = names[line[0]] = player_mapping.get(self.string(line[0]))
+                if player_name is not None:
+                    # Like filter_match, the last line of a player in a match wins
+                    match_lines[player_name] = line
+
+            for player_name, line in match_lines.items():
+                counters = totals.get(player_name)
+                if counters is None:
+                    counters = totals[player_name] = [0] * 13
+                present = line[23]
+                counters[0] += 1
+                # ADR and KAST: (sum weighted by rounds, rounds); the rest: (sum, matches)
+                if present & 1:
+                    counters[1] += line[18] * round_count
+                    counters[2] += round_count
+                if present & 2:
+                    counters[3] += line[19] * round_count
+                    counters[4] += round_count
+                if present & 4:
+                    counters[5] += line[20]
+                    counters[6] += 1
+                if present & 8:
+                    counters[7] += line[21]
+                    counters[8] += 1
+                if present & 16:
+                    counters[9] += line[22]
+                    counters[10] += 1
+                # Opening duels need both first kills and first deaths of the same match
+                if present & 12 == 12:
+                    counters[11] += line[20]
+                    counters[12] += line[21]
+
+        impact = {}
+        for player_name, counters in totals.items():
+            opening_duels = counters[11] + counters[12]
+            impact[player_name] = {
+                "matches": counters[0],
+                "adr": counters[1] / counters[2] if counters[2] > 0 else None,
+                "kast": counters[3] / counters[4] if counters[4] > 0 else None,
+                "first_kills": counters[5] / counters[6] if counters[6] > 0 else None,
+                "first_deaths": counters[7] / counters[8] if counters[8] > 0 else None,
+                "utility_damage": counters[9] / counters[10] if counters[10] > 0 else None,
+                "opening_rate": counters[11] / opening_duels * 100 if opening_duels > 0 else None
+            }
+        return impact
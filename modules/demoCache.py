@@ -0,0 +1,260 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import Dict, Optional, Tuple
+from modules.demoSource import open_demoSource, source_stat
+
+
+SCHEMA_VERSION = 3
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Round fields kept in cached records; per-round event payloads are not used by the pipeline
+CACHED_ROUND_KEYS = ("number", "teamASide", "teamBSide", "winnerTeamName", "endReason")
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Returns a content hash of a demo source (decompressed) without parsing it
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open_demoSource(file_path, binary=True) as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _encode_record(record: Dict) -> bytes:
+    """
+    Stores the rounds column-wise and trimmed to CACHED_ROUND_KEYS; absent fields are stored as null
+    """
+    rounds = record.get("rounds", [])
+    columns = {key: [round_data.get(key) for round_data in rounds] for key in CACHED_ROUND_KEYS}
+    trimmed = {key: value for key, value in record.items() if key != "rounds"}
+    trimmed["rounds"] = [len(rounds), columns]
+    return zlib.compress(json.dumps(trimmed, separators=(",", ":")).encode("utf-8"), 1)
+
+
+def _decode_record(blob: bytes) -> Dict:
+    record = json.loads(zlib.decompress(blob).decode("utf-8"))
+    count, columns = record["rounds"]
+    present = [(key, values) for key, values in columns.items() if any(value is not None for value in values)]
+    rounds = []
+    for index in range(count):
+        round_data = {}
+        for key, values in present:
+            if values[index] is not None:
+                round_data[key] = values[index]
+        rounds.append(round_data)
+    record["rounds"] = rounds
+    return record
+
+
+class DemoCache:
+    """
+    On-disk SQLite cache of trimmed match records, keyed by path and parser ("json" or "stream") and
+    validated by size, mtime and optionally a content hash
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, verify_hash: bool = False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.verify_hash = verify_hash
+        self.hits = 0
+        self.misses = 0
+        self._touched = []
+
+        self.conn = sqlite3.connect(path)
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None or int(row[0]) != SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS demos")
+            self.conn.execute("DROP TABLE IF EXISTS demo_meta")
+            self.conn.execute("DROP TABLE IF EXISTS demo_fingerprints")
+
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS demos (
+                path TEXT NOT NULL,
+                parser TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT,
+                match_name TEXT NOT NULL,
+                record BLOB NOT NULL,
+                record_bytes INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (path, parser)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS demos_last_used ON demos (last_used)")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS demo_meta (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                meta TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS demo_fingerprints (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                match_name TEXT NOT NULL,
+                fingerprint TEXT NOT NULL
+            )
+        """)
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                          (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    @staticmethod
+    def _key(file_path: str) -> str:
+        return os.path.abspath(file_path)
+
+    def get(self, file_path: str, parser: str = "json") -> Optional[Tuple[str, Dict]]:
+        """
+        Returns the (match name, record) cached for a file by the given parser, or None if missing or stale
+        """
+        key = self._key(file_path)
+        try:
+            stat = source_stat(file_path)
+        except OSError:
+            self.misses += 1
+            return None
+
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, content_hash, match_name, record FROM demos WHERE path = ? AND parser = ?",
+            (key, parser)
+        ).fetchone()
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+            self.misses += 1
+            return None
+
+        if self.verify_hash and row[2] != hash_file(file_path):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._touched.append((key, parser))
+        return row[3], _decode_record(row[4])
+
+    def put(self, file_path: str, match_name: str, record: Dict, parser: str = "json") -> None:
+        """
+        Stores the record a parser produced for a file
+        """
+        stat = source_stat(file_path)
+        content_hash = hash_file(file_path) if self.verify_hash else None
+        blob = _encode_record(record)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO demos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self._key(file_path), parser, stat.st_size, stat.st_mtime_ns, content_hash,
+             match_name, blob, len(blob), time.time())
+        )
+
+    def get_meta(self, file_path: str) -> Optional[Dict]:
+        """
+        Returns the cached metadata (name, date, map) of an unchanged file, or None
+        """
+        try:
+            stat = source_stat(file_path)
+        except OSError:
+            return None
+
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, meta FROM demo_meta WHERE path = ?", (self._key(file_path),)
+        ).fetchone()
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+            return None
+        return json.loads(row[2])
+
+    def put_meta(self, file_path: str, meta: Dict) -> None:
+        stat = source_stat(file_path)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO demo_meta VALUES (?, ?, ?, ?)",
+            (self._key(file_path), stat.st_size, stat.st_mtime_ns, json.dumps(meta))
+        )
+
+    def get_fingerprint(self, file_path: str) -> Optional[Tuple[str, str]]:
+        """
+        Returns the cached (match name, fingerprint) of an unchanged file, or None
+        """
+        try:
+            stat = source_stat(file_path)
+        except OSError:
+            return None
+
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, match_name, fingerprint FROM demo_fingerprints WHERE path = ?",
+            (self._key(file_path),)
+        ).fetchone()
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+            return None
+        return row[2], row[3]
+
+    def put_fingerprint(self, file_path: str, match_name: str, fingerprint: str) -> None:
+        stat = source_stat(file_path)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO demo_fingerprints VALUES (?, ?, ?, ?, ?)",
+            (self._key(file_path), stat.st_size, stat.st_mtime_ns, match_name, fingerprint)
+        )
+
+    def clear(self) -> None:
+        self.conn.execute("DELETE FROM demo_fingerprints")
+        self.conn.execute("DELETE FROM demo_meta")
+        self.conn.execute("DELETE FROM demos")
+        self.conn.commit()
+
+    def evict(self) -> int:
+        """
+        Drops least recently used entries until the stored records fit in max_bytes.
+        Returns the number of evicted entries.
+        """
+        total = self.conn.execute("SELECT COALESCE(SUM(record_bytes), 0) FROM demos").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = []
+        for path, parser, record_bytes in self.conn.execute("SELECT path, parser, record_bytes FROM demos ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((path, parser))
+            total -= record_bytes
+
+        self.conn.executemany("DELETE FROM demos WHERE path = ? AND parser = ?", evicted)
+        return len(evicted)
+
+    def commit(self) -> None:
+        """
+        Records hit timestamps, applies the size cap and flushes to disk
+        """
+        now = time.time()
+        self.conn.executemany("UPDATE demos SET last_used = ? WHERE path = ? AND parser = ?",
+                              ((now, key, parser) for key, parser in self._touched))
+        self._touched = []
+        self.evict()
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.commit()
+        self.conn.close()
+
+
+def open_demoCache(path: str, max_bytes: int = DEFAULT_MAX_BYTES, verify_hash: bool = False,
+                   rebuild: bool = False) -> Optional[DemoCache]:
+    """
+    Opens the cache, returning None (and running uncached) if the cache file cannot be used
+    """
+    try:
+        cache = DemoCache(path, max_bytes=max_bytes, verify_hash=verify_hash)
+        if rebuild:
+            cache.clear()
+        return cache
+    except sqlite3.Error as e:
+        print(f"Warning: Could not open demo cache '{path}': {e}. Continuing without cache.")
+        return None
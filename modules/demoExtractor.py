@@ -1,29 +1,150 @@
 import json
-from typing import Dict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional, Tuple
+from modules.demoCache import DemoCache
+from modules.demoSource import open_demoSource
+from modules.demoStream import stream_demoFile
 
 
-def extract_demoData(json_files: Dict) -> Dict:
+def load_demoFile(file_path: str) -> Tuple[str, Dict]:
     """
-    Extracts match data from JSON structure and normalizes player names
+    Loads a single demo file and trims it down to the match record used by the pipeline
+    """
+    with open_demoSource(file_path) as f:
+        match = json.load(f)
+
+    # Fields are read in the same order as before, so a file missing several reports the same one
+    record = {
+        "date": match["date"],
+        "map": match["mapName"],
+        "teamA": match["teamA"],
+        "teamB": match["teamB"],
+        "players": match["players"],
+        "rounds": match["rounds"]
+    }
+    return match["name"], record
+
+
+def _load_demoFileSafe(file_path: str, streaming: bool = False) -> Tuple[Optional[Tuple[str, Dict]], Optional[str]]:
+    """
+    Worker entry point: returns (result, None) on success or (None, error message) on failure
+    """
+    try:
+        if streaming:
+            return stream_demoFile(file_path), None
+        return load_demoFile(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def load_demoFiles(json_files: List[str], jobs: int, streaming: bool) -> List:
+    """
+    Loads files serially or across worker processes, returning (result, error) pairs in input order
+    """
+    if jobs > 1 and len(json_files) > 1:
+        # Parse files across worker processes; map() keeps the input order
+        workers = min(jobs, len(json_files))
+        chunksize = max(1, len(json_files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_load_demoFileSafe, json_files, repeat(streaming), chunksize=chunksize))
+
+    return [_load_demoFileSafe(file_path, streaming) for file_path in json_files]
+
+
+def extract_demoData(json_files: List[str], jobs: int = 1, streaming: bool = False,
+                     cache: Optional[DemoCache] = None, failed: Optional[List[str]] = None,
+                     renames: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Extracts match data from JSON structure and normalizes player names.
+    Paths of files that could not be loaded are appended to `failed` if given.
+    Files listed in `renames` are stored under the given match name instead of their own.
     """
     matches = {}
-    
+
+    # Serve unchanged files from the cache and only parse the rest
+    results = {}
+    if cache is not None:
+        for file_path in json_files:
+            cached = cache.get(file_path, "stream" if streaming else "json")
+            if cached is not None:
+                results[file_path] = (cached, None)
+
+    pending = [file_path for file_path in json_files if file_path not in results]
+    for file_path, (result, error) in zip(pending, load_demoFiles(pending, jobs, streaming)):
+        results[file_path] = (result, error)
+        if cache is not None and error is None:
+            cache.put(file_path, *result, parser="stream" if streaming else "json")
+
+    if cache is not None:
+        cache.commit()
+
     for file_path in json_files:
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                match = json.load(f)
-            
-            # Store match data in the matches dictionary
-            matches[match["name"]] = {
-                "date": match["date"],
-                "map": match["mapName"],
-                "teamA": match["teamA"],
-                "teamB": match["teamB"],
-                "players": match["players"],
-                "rounds": match["rounds"]
-            }
-                      
-        except Exception as e:
-            print(f"Error loading {file_path}: {e}")
-            
-    return matches
\ No newline at end of file
+        result, error = results[file_path]
+        if error is not None:
+            print(f"Error loading {file_path}: {error}")
+            if failed is not None:
+                failed.append(file_path)
+            continue
+
+        # Store match data in the matches dictionary
+        match_name, match_data = result
+        if renames is not None:
+            match_name = renames.get(file_path, match_name)
+        matches[match_name] = match_data
+
+    return matches
+
+
+def iter_demoData(json_files: List[str], jobs: int = 1, streaming: bool = False,
+                  cache: Optional[DemoCache] = None, failed: Optional[List[str]] = None,
+                  renames: Optional[Dict[str, str]] = None) -> Iterator[Tuple[str, str, Dict]]:
+    """
+    Yields (file path, match name, match record) one file at a time in input order.
+    Only a couple of files per worker are in flight, so memory does not grow with the archive.
+    """
+    executor = None
+    if jobs > 1 and len(json_files) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(json_files)))
+    window = jobs * 2 if executor is not None else 0
+    pending = deque()
+
+    def resolve(file_path, outcome, fresh):
+        result, error = outcome.result() if executor is not None and fresh else outcome
+        if error is not None:
+            print(f"Error loading {file_path}: {error}")
+            if failed is not None:
+                failed.append(file_path)
+            return None
+        if fresh and cache is not None:
+            cache.put(file_path, *result, parser="stream" if streaming else "json")
+        match_name, match = result
+        if renames is not None:
+            match_name = renames.get(file_path, match_name)
+        return file_path, match_name, match
+
+    try:
+        for file_path in json_files:
+            cached = cache.get(file_path, "stream" if streaming else "json") if cache is not None else None
+            if cached is not None:
+                pending.append((file_path, (cached, None), False))
+            elif executor is not None:
+                pending.append((file_path, executor.submit(_load_demoFileSafe, file_path, streaming), True))
+            else:
+                pending.append((file_path, _load_demoFileSafe(file_path, streaming), True))
+
+            while len(pending) > window:
+                item = resolve(*pending.popleft())
+                if item is not None:
+                    yield item
+
+        while pending:
+            item = resolve(*pending.popleft())
+            if item is not None:
+                yield item
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if cache is not None:
+            cache.commit()
@@ -0,0 +1,69 @@
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+from modules.demoCache import DemoCache
+from modules.demoSource import open_demoSource
+from modules.demoStream import read_demoFields
+
+
+# Top-level keys that identify a match; the rounds array after them is never decoded
+FINGERPRINT_KEYS = {"name", "date", "mapName", "teamA", "teamB", "players"}
+
+
+def match_fingerprint(date: str, map_name: str, teamA_score: int, teamB_score: int, players: List[Dict]) -> str:
+    """
+    Stable identity of a match: date, map, final score and the set of participants (SteamIDs, or names without one)
+    """
+    participants = sorted(str(player.get("steamId") or player.get("name")) for player in players)
+    encoded = json.dumps([date, map_name, teamA_score, teamB_score, participants], separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def peek_demoFingerprint(file_path: str) -> Tuple[str, str]:
+    """
+    Reads the identifying fields of a demo and returns its (match name, fingerprint)
+    """
+    with open_demoSource(file_path) as f:
+        fields = read_demoFields(f, keys=FINGERPRINT_KEYS)
+    return fields["name"], match_fingerprint(fields["date"], fields["mapName"], fields["teamA"]["score"],
+                                             fields["teamB"]["score"], fields["players"])
+
+
+def dedupe_demoFiles(json_files: List[str], cache: Optional[DemoCache] = None) -> Tuple[List[str], List[Tuple[str, str]], Dict[str, str]]:
+    """
+    Drops files holding a match already provided by an earlier file and disambiguates different matches
+    that share a name. Fingerprints of unchanged files come from the cache; files that cannot be read
+    are kept so the loader reports them.
+    Returns the kept files, the (dropped file, kept file) duplicate pairs and a path -> match name map
+    for the colliding files, to pass to extract_demoData as `renames`.
+    """
+    kept = []
+    duplicates = []
+    renames = {}
+    by_fingerprint = {}   # fingerprint -> first file with it
+    by_name = {}          # match name -> fingerprint of the first file using it
+
+    for file_path in json_files:
+        entry = cache.get_fingerprint(file_path) if cache is not None else None
+        if entry is None:
+            try:
+                entry = peek_demoFingerprint(file_path)
+            except Exception:
+                kept.append(file_path)
+                continue
+            if cache is not None:
+                cache.put_fingerprint(file_path, *entry)
+
+        match_name, fingerprint = entry
+        if fingerprint in by_fingerprint:
+            duplicates.append((file_path, by_fingerprint[fingerprint]))
+            continue
+
+        by_fingerprint[fingerprint] = file_path
+        kept.append(file_path)
+        if by_name.setdefault(match_name, fingerprint) != fingerprint:
+            renames[file_path] = f"{match_name} [{fingerprint[:8]}]"
+
+    if cache is not None:
+        cache.commit()
+    return kept, duplicates, renames
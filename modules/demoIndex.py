@@ -0,0 +1,93 @@
+import argparse
+import datetime
+from typing import Dict, List, Optional
+from modules.demoCache import DemoCache
+from modules.demoSource import open_demoSource
+from modules.demoStream import read_demoFields
+
+
+# Top-level keys needed to decide whether a demo is selected
+META_KEYS = {"name", "date", "mapName"}
+
+
+def parse_dateArg(value: str) -> datetime.date:
+    """
+    argparse type for YYYY-MM-DD dates
+    """
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', expected YYYY-MM-DD")
+
+
+def match_date(date_value) -> Optional[datetime.date]:
+    """
+    Returns the calendar date of a demo's ISO timestamp, or None if it cannot be read
+    """
+    try:
+        return datetime.date.fromisoformat(str(date_value)[:10])
+    except ValueError:
+        return None
+
+
+def peek_demoMeta(file_path: str) -> Dict:
+    """
+    Reads only the name, date and map of a demo, stopping as soon as they have been seen
+    """
+    with open_demoSource(file_path) as f:
+        fields = read_demoFields(f, keys=META_KEYS)
+    return {"name": fields.get("name"), "date": fields.get("date"), "map": fields.get("mapName")}
+
+
+def build_demoIndex(json_files: List[str], cache: Optional[DemoCache] = None) -> Dict[str, Optional[Dict]]:
+    """
+    Builds the per-file metadata index, reusing cached entries for unchanged files.
+    Files whose head cannot be read map to None.
+    """
+    index = {}
+    for file_path in json_files:
+        meta = cache.get_meta(file_path) if cache is not None else None
+        if meta is None:
+            try:
+                meta = peek_demoMeta(file_path)
+            except Exception:
+                index[file_path] = None
+                continue
+            if cache is not None:
+                cache.put_meta(file_path, meta)
+        index[file_path] = meta
+
+    if cache is not None:
+        cache.commit()
+    return index
+
+
+def meta_selected(meta: Dict, since: Optional[datetime.date], until: Optional[datetime.date],
+                  maps: Optional[List[str]]) -> bool:
+    """
+    Checks a demo's metadata against the date range (inclusive) and map filters
+    """
+    if maps and meta["map"] not in maps:
+        return False
+
+    if since is not None or until is not None:
+        date = match_date(meta["date"])
+        if date is None:
+            return False
+        if since is not None and date < since:
+            return False
+        if until is not None and date > until:
+            return False
+
+    return True
+
+
+def select_demoFiles(json_files: List[str], index: Dict[str, Optional[Dict]], since: Optional[datetime.date],
+                     until: Optional[datetime.date], maps: Optional[List[str]]) -> List[str]:
+    """
+    Keeps the files matching the filters. Unreadable files are kept so the loader reports them.
+    """
+    return [
+        file_path for file_path in json_files
+        if index.get(file_path) is None or meta_selected(index[file_path], since, until, maps)
+    ]
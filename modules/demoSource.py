@@ -0,0 +1,100 @@
+import fnmatch
+import glob
+import gzip
+import io
+import lzma
+import os
+import zipfile
+from contextlib import contextmanager
+from typing import IO, Iterator, List, Optional, Tuple
+
+
+# Demo paths inside zip bundles are written as "bundle.zip::member.json"
+MEMBER_SEPARATOR = "::"
+COMPRESSED_SUFFIXES = (".gz", ".xz")
+BUNDLE_PATTERN = "*.zip"
+
+# The most recently opened bundle, reused while consecutive members of the same archive are loaded.
+# Keyed on the process id too: forked workers must not share the parent's file offset.
+_open_bundle = [None, None]
+
+
+def split_source(source: str) -> Tuple[str, Optional[str]]:
+    """
+    Splits a demo source into the file on disk and the zip member (None for plain or compressed files)
+    """
+    archive, separator, member = source.partition(MEMBER_SEPARATOR)
+    return (archive, member) if separator else (source, None)
+
+
+def source_stat(source: str) -> os.stat_result:
+    """
+    os.stat of the file backing a demo source; members of a bundle share the archive's stat
+    """
+    return os.stat(split_source(source)[0])
+
+
+def _bundle(archive: str) -> zipfile.ZipFile:
+    stat = os.stat(archive)
+    key = (os.getpid(), os.path.abspath(archive), stat.st_size, stat.st_mtime_ns)
+    if _open_bundle[0] != key:
+        if _open_bundle[1] is not None and _open_bundle[0][0] == key[0]:
+            _open_bundle[1].close()
+            _open_bundle[:] = [None, None]
+        _open_bundle[:] = [key, zipfile.ZipFile(archive)]
+    return _open_bundle[1]
+
+
+@contextmanager
+def open_demoSource(source: str, binary: bool = False) -> Iterator[IO]:
+    """
+    Opens a demo source for reading, decompressing .gz/.xz files and zip members on the fly
+    """
+    archive, member = split_source(source)
+    if member is not None:
+        raw = _bundle(archive).open(member)
+    elif archive.endswith(".gz"):
+        raw = gzip.open(archive, "rb")
+    elif archive.endswith(".xz"):
+        raw = lzma.open(archive, "rb")
+    elif archive.endswith(".zip"):
+        # Only reached for bundles that could not be listed; surfaces the zip error to the loader
+        with zipfile.ZipFile(archive):
+            raise ValueError("zip bundle has no member selected")
+    else:
+        raw = open(archive, "rb")
+
+    with raw:
+        if binary:
+            yield raw
+        else:
+            with io.TextIOWrapper(raw, encoding="utf-8") as f:
+                yield f
+
+
+def find_demoFiles(input_dir: str, file_pattern: str = "*.json") -> List[str]:
+    """
+    Lists the demo sources of a directory: files matching the pattern, their .gz/.xz variants
+    and the members of zip bundles whose file name matches the pattern.
+    Bundles that cannot be read are listed as-is so the loader reports them.
+    """
+    sources = [
+        file_path for file_path in glob.glob(os.path.join(input_dir, file_pattern))
+        if not file_path.endswith(".zip")
+    ]
+    for suffix in COMPRESSED_SUFFIXES:
+        sources.extend(glob.glob(os.path.join(input_dir, file_pattern + suffix)))
+
+    for archive in sorted(glob.glob(os.path.join(input_dir, BUNDLE_PATTERN))):
+        try:
+            with zipfile.ZipFile(archive) as bundle:
+                members = bundle.namelist()
+        except (OSError, zipfile.BadZipFile):
+            sources.append(archive)
+            continue
+        sources.extend(
+            f"{archive}{MEMBER_SEPARATOR}{member}" for member in members
+            if not member.endswith("/") and fnmatch.fnmatch(os.path.basename(member), file_pattern)
+        )
+
+    return list(dict.fromkeys(sources))
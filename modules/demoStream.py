@@ -0,0 +1,264 @@
+import json
+import re
+from typing import Dict, Iterator, Optional, Set, TextIO, Tuple
+from modules.demoSource import open_demoSource
+
+
+CHUNK_SIZE = 64 * 1024
+
+# Top-level keys of a demo document the pipeline reads
+MATCH_KEYS = {"name", "date", "mapName", "teamA", "teamB", "players", "rounds"}
+
+# Round fields read by analyze_stats
+ROUND_KEYS = {"teamASide", "teamBSide", "winnerTeamName"}
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_SPECIAL = re.compile(r'["\\]')
+_STRUCTURAL = re.compile(r'["\[\]{}]')
+_SCALAR_END = re.compile(r"[,\]}\s]")
+
+
+class JsonStreamReader:
+    """
+    Pull-style reader over a JSON text stream that materialises only the values asked for.
+    Skipped values are scanned for structure but not validated or decoded.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+        # Start of a value being captured; the buffer is never trimmed past it
+        self.mark = None
+
+    def _fill(self) -> bool:
+        """
+        Reads the next chunk, dropping already consumed text. Returns False at end of stream.
+        """
+        if self.eof:
+            return False
+
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        keep_from = self.pos if self.mark is None else self.mark
+        if keep_from:
+            self.buffer = self.buffer[keep_from:]
+            self.offset += keep_from
+            self.pos -= keep_from
+            if self.mark is not None:
+                self.mark -= keep_from
+
+        self.buffer += chunk
+        return True
+
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"{message} (char {self.offset + self.pos})")
+
+    def peek(self) -> str:
+        """
+        Skips whitespace and returns the next significant character without consuming it
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise self._error("Unexpected end of JSON data")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def _skip_string(self) -> None:
+        scan = self.pos + 1
+        while True:
+            m = _STRING_SPECIAL.search(self.buffer, scan)
+            if m is None or (m.group() == "\\" and m.end() == len(self.buffer)):
+                # String (or an escape sequence) continues in the next chunk
+                rel = (len(self.buffer) if m is None else m.start()) - self.pos
+                if not self._fill():
+                    raise self._error("Unterminated string")
+                scan = self.pos + rel
+                continue
+
+            if m.group() == '"':
+                self.pos = m.end()
+                return
+            scan = m.end() + 1
+
+    def _skip_container(self) -> None:
+        depth = 0
+        while True:
+            m = _STRUCTURAL.search(self.buffer, self.pos)
+            if m is None:
+                self.pos = len(self.buffer)
+                if not self._fill():
+                    raise self._error("Unterminated object or array")
+                continue
+
+            char = m.group()
+            if char == '"':
+                self.pos = m.start()
+                self._skip_string()
+                continue
+
+            self.pos = m.end()
+            if char in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _skip_scalar(self) -> None:
+        start = self.offset + self.pos
+        while True:
+            m = _SCALAR_END.search(self.buffer, self.pos)
+            if m is not None:
+                self.pos = m.start()
+                break
+            self.pos = len(self.buffer)
+            if not self._fill():
+                break
+        if self.offset + self.pos == start:
+            raise self._error("Expecting value")
+
+    def skip_value(self) -> None:
+        """
+        Advances past the next value without building it
+        """
+        char = self.peek()
+        if char == '"':
+            self._skip_string()
+        elif char in "{[":
+            self._skip_container()
+        else:
+            self._skip_scalar()
+
+    def read_value(self):
+        """
+        Decodes the next value with the json module
+        """
+        self.peek()
+        self.mark = self.pos
+        try:
+            self.skip_value()
+            text = self.buffer[self.mark:self.pos]
+        finally:
+            self.mark = None
+        return json.loads(text)
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Yields the keys of the object at the current position.
+        The caller must consume (read or skip) each value before resuming the iterator.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.read_value()
+            self.expect(":")
+            yield key
+
+            char = self.peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise self._error("Expecting ',' delimiter")
+
+    def iter_array(self) -> Iterator[None]:
+        """
+        Yields once per element of the array at the current position; the caller consumes each element
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+
+        while True:
+            yield None
+
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise self._error("Expecting ',' delimiter")
+
+
+def _read_rounds(reader: JsonStreamReader, round_keys: Set[str]) -> list:
+    """
+    Reads the rounds array, keeping only the requested fields of every round
+    """
+    if reader.peek() != "[":
+        return reader.read_value()
+
+    rounds = []
+    for _ in reader.iter_array():
+        if reader.peek() != "{":
+            rounds.append(reader.read_value())
+            continue
+
+        round_data = {}
+        for key in reader.iter_object():
+            if key in round_keys:
+                round_data[key] = reader.read_value()
+            else:
+                reader.skip_value()
+        rounds.append(round_data)
+
+    return rounds
+
+
+def read_demoFields(stream: TextIO, keys: Set[str] = MATCH_KEYS,
+                    round_keys: Optional[Set[str]] = ROUND_KEYS) -> Dict:
+    """
+    Streams a demo document and returns only the requested top-level keys.
+    Reading stops as soon as every requested key has been seen.
+    """
+    reader = JsonStreamReader(stream)
+    fields = {}
+
+    for key in reader.iter_object():
+        if key not in keys:
+            reader.skip_value()
+        elif key == "rounds" and round_keys is not None:
+            fields[key] = _read_rounds(reader, round_keys)
+        else:
+            fields[key] = reader.read_value()
+
+        if len(fields) == len(keys):
+            break
+
+    return fields
+
+
+def stream_demoFile(file_path: str) -> Tuple[str, Dict]:
+    """
+    Streaming counterpart of load_demoFile: builds the same trimmed match record
+    without materialising the unused parts of the document
+    """
+    with open_demoSource(file_path) as f:
+        match = read_demoFields(f)
+
+    return match["name"], {
+        "date": match["date"],
+        "map": match["mapName"],
+        "teamA": match["teamA"],
+        "teamB": match["teamB"],
+        "players": match["players"],
+        "rounds": match["rounds"]
+    }
@@ -0,0 +1,137 @@
+import csv
+import datetime
+import json
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from modules.demoIndex import match_date
+from modules.matchContext import build_matchContext
+from modules.statAccumulators import RoundAccumulator
+from modules.statsAnalyzer import count_focusRounds
+
+
+# Counters kept per window; every metric below is a ratio of two of them
+FORM_FIELDS = ("matches", "kills", "deaths", "headshots", "won", "ct_total", "ct_won", "t_total", "t_won")
+SERIES_FIELDS = ("date", "match", "scope", "key", "window_matches", "kills_per_match", "kd", "headshot_rate",
+                 "win_rate", "ct_win_rate", "t_win_rate")
+
+
+class RollingWindow:
+    """
+    Running sums over the last max_matches matches and/or the last max_days days.
+    add() and the evictions it triggers are constant time per match; the window is never re-summed.
+    Without limits it keeps all-time totals.
+    """
+    __slots__ = ("max_matches", "max_days", "entries", "sums")
+
+    def __init__(self, max_matches: Optional[int] = None, max_days: Optional[int] = None):
+        self.max_matches = max_matches
+        self.max_days = max_days
+        self.entries = deque()
+        self.sums = [0] * len(FORM_FIELDS)
+
+    def add(self, day: datetime.date, values: Tuple[int, ...]) -> None:
+        if self.max_matches is not None or self.max_days is not None:
+            self.entries.append((day, values))
+        sums = self.sums
+        for index, value in enumerate(values):
+            sums[index] += value
+        self._evict(day)
+
+    def _evict(self, day: datetime.date) -> None:
+        entries = self.entries
+        while entries and ((self.max_matches is not None and len(entries) > self.max_matches)
+                           or (self.max_days is not None and (day - entries[0][0]).days >= self.max_days)):
+            _, values = entries.popleft()
+            sums = self.sums
+            for index, value in enumerate(values):
+                sums[index] -= value
+
+    def metrics(self) -> Dict:
+        """
+        Rates over the window, computed the way the report computes them
+        """
+        matches, kills, deaths, headshots, won, ct_total, ct_won, t_total, t_won = self.sums
+        return {
+            "window_matches": matches,
+            "kills_per_match": kills / matches if matches > 0 else 0,
+            "kd": kills / deaths if deaths > 0 else kills,
+            "headshot_rate": headshots / kills * 100 if kills > 0 else 0,
+            "win_rate": won / matches * 100 if matches > 0 else 0,
+            "ct_win_rate": ct_won / ct_total * 100 if ct_total > 0 else 0,
+            "t_win_rate": t_won / t_total * 100 if t_total > 0 else 0
+        }
+
+
+def match_formValues(match: Dict, player_name: str) -> Tuple[int, ...]:
+    """
+    One match's FORM_FIELDS counters from a player's point of view
+    """
+    player = match["players"][player_name]
+    context = build_matchContext(match, player_name)
+    rounds = RoundAccumulator()
+    count_focusRounds(match, context, {}, rounds)
+    return (1, player["killCount"], player["deathCount"], player["headshotCount"],
+            1 if context.outcome(match) == "Win" else 0,
+            rounds.ct_total, rounds.ct_won, rounds.t_total, rounds.t_won)
+
+
+def track_form(matches: Dict, focusPlayer: str, max_matches: Optional[int] = None,
+               max_days: Optional[int] = None) -> Dict:
+    """
+    Replays the filtered matches in date order through rolling windows: one per player over
+    that player's matches and one per map over the focus player's matches.
+    Returns the time series (one row per window update) and the final window and all-time rates.
+    Matches without a readable date are skipped.
+    """
+    dated = []
+    for match_name, match in matches.items():
+        day = match_date(match["date"])
+        if day is not None:
+            dated.append((match["date"], day, match_name, match))
+    dated.sort(key=lambda x: x[0])
+
+    windows = {"player": {}, "map": {}}
+    all_time = {"player": {}, "map": {}}
+    series = []
+
+    def update(scope: str, key: str, day: datetime.date, match_name: str, values: Tuple[int, ...]) -> None:
+        window = windows[scope].get(key)
+        if window is None:
+            window = windows[scope][key] = RollingWindow(max_matches, max_days)
+            all_time[scope][key] = RollingWindow()
+        window.add(day, values)
+        all_time[scope][key].add(day, values)
+        series.append(dict({"date": day.isoformat(), "match": match_name, "scope": scope, "key": key}, **window.metrics()))
+
+    for _, day, match_name, match in dated:
+        for player_name in match["players"]:
+            values = match_formValues(match, player_name)
+            update("player", player_name, day, match_name, values)
+            if player_name == focusPlayer:
+                update("map", match["map"], day, match_name, values)
+
+    return {
+        "max_matches": max_matches,
+        "max_days": max_days,
+        "skipped": len(matches) - len(dated),
+        "series": series,
+        "players": {key: {"window": window.metrics(), "all_time": all_time["player"][key].metrics()}
+                    for key, window in windows["player"].items()},
+        "maps": {key: {"window": window.metrics(), "all_time": all_time["map"][key].metrics()}
+                 for key, window in windows["map"].items()}
+    }
+
+
+def write_formSeries(export_file: str, series: List[Dict]) -> None:
+    """
+    Writes the time series as CSV, or as JSON when the file name ends in .json
+    """
+    if export_file.lower().endswith(".json"):
+        with open(export_file, "w", encoding="utf-8") as f:
+            json.dump(series, f, indent=2)
+        return
+
+    with open(export_file, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SERIES_FIELDS)
+        writer.writeheader()
+        writer.writerows(series)
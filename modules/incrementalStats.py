@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+from typing import Dict, Optional, Tuple
+from modules.playerFilter import filter_players
+from modules.statsAnalyzer import analyze_stats, merge_stats, order_stats, stats_equal
+
+
+STATE_VERSION = 1
+
+
+def mapping_fingerprint(player_mapping: Dict) -> str:
+    """
+    Returns a stable hash of the player mapping so a state built with another mapping is not reused
+    """
+    encoded = json.dumps(player_mapping, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def new_statsState(focusPlayer: str, player_mapping: Dict) -> Dict:
+    """
+    Returns an empty aggregate state
+    """
+    return {
+        "version": STATE_VERSION,
+        "focus_player": focusPlayer,
+        "mapping": mapping_fingerprint(player_mapping),
+        "stats": analyze_stats({}, focusPlayer),
+        "matches": {}
+    }
+
+
+def load_statsState(state_file: str, focusPlayer: str, player_mapping: Dict) -> Dict:
+    """
+    Loads the persisted aggregate state, starting fresh if it is missing or was built for other inputs
+    """
+    if not os.path.exists(state_file):
+        return new_statsState(focusPlayer, player_mapping)
+
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: Could not read stats state '{state_file}': {e}. Rebuilding it.")
+        return new_statsState(focusPlayer, player_mapping)
+
+    if (state.get("version") != STATE_VERSION
+            or state.get("focus_player") != focusPlayer
+            or state.get("mapping") != mapping_fingerprint(player_mapping)):
+        print(f"Stats state '{state_file}' was built for different inputs. Rebuilding it.")
+        return new_statsState(focusPlayer, player_mapping)
+
+    return state
+
+
+def save_statsState(state_file: str, state: Dict) -> None:
+    """
+    Writes the aggregate state, replacing the previous file atomically
+    """
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, separators=(",", ":"))
+    os.replace(tmp_file, state_file)
+
+
+def update_statsState(state: Dict, matches: Dict, player_mapping: Dict) -> Tuple[Dict, int, int]:
+    """
+    Folds new matches into the state and removes matches that are no longer present.
+    Each match's contribution is kept so it can be subtracted again later, and to restore the entry
+    order of a full recompute over `matches`.
+    Returns the updated state and the number of added and removed matches.
+    """
+    focusPlayer = state["focus_player"]
+    contributions = state["matches"]
+    stats = state["stats"]
+
+    removed = [name for name in contributions if name not in matches]
+    for match_name in removed:
+        stats = merge_stats(stats, contributions.pop(match_name), sign=-1)
+
+    added = {name: match for name, match in matches.items() if name not in contributions}
+    for match_name, match in filter_players(added, player_mapping).items():
+        contribution = analyze_stats({match_name: match}, focusPlayer)
+        contributions[match_name] = contribution
+        stats = merge_stats(stats, contribution)
+
+    state["stats"] = order_stats(stats, (contributions[name] for name in matches if name in contributions))
+    return state, len(added), len(removed)
+
+
+def verify_statsState(state: Dict, matches: Dict, player_mapping: Dict) -> Optional[Dict]:
+    """
+    Recomputes the stats from scratch and returns them if they differ from the incremental result,
+    including the order of the entries (the row order of the report)
+    """
+    full_stats = analyze_stats(filter_players(matches, player_mapping), state["focus_player"])
+    if stats_equal(full_stats, state["stats"]):
+        return None
+    return full_stats
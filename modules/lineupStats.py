@@ -0,0 +1,106 @@
+from typing import Dict, List, Tuple
+from modules.matchContext import MatchContext, build_matchContext
+from modules.statAccumulators import TotalAccumulator
+from modules.statsAnalyzer import count_focusRounds
+
+
+MIN_STACK = 2
+MAX_STACK = 5
+STACK_NAMES = {2: "Duos", 3: "Trios", 4: "Quads", 5: "Full Stacks"}
+
+
+def lineup_players(player_mapping: Dict[str, str]) -> List[str]:
+    """
+    Normalised player names in mapping order; a player's position is their bit in lineup masks
+    """
+    return list(dict.fromkeys(player_mapping.values()))
+
+
+def match_lineups(match: Dict, player_bits: Dict[str, int]) -> List[Tuple[int, MatchContext]]:
+    """
+    Returns (roster mask, match context) for each team fielding at least MIN_STACK mapped players
+    """
+    teams = {}
+    for player_name in match["players"]:
+        bit = player_bits.get(player_name)
+        if bit is None:
+            continue
+        context = build_matchContext(match, player_name)
+        if context.team_letter is None:
+            continue
+        mask, team_context = teams.get(context.team_letter, (0, context))
+        teams[context.team_letter] = (mask | 1 << bit, team_context)
+
+    return [(mask, context) for mask, context in teams.values() if bin(mask).count("1") >= MIN_STACK]
+
+
+def build_lineupTable(matches: Dict, players: List[str]) -> Dict[Tuple[int, str], TotalAccumulator]:
+    """
+    Builds the (stack mask, map) -> counters table over filtered matches.
+    Matches are first folded per full roster; each distinct roster is then expanded into its
+    sub-stacks once, so the subset enumeration does not grow with the number of matches.
+    """
+    player_bits = {player_name: bit for bit, player_name in enumerate(players)}
+    outcome_slots = {"Win": "won", "Loss": "lost", "Tie": "tied"}
+
+    rosters = {}
+    for match in matches.values():
+        match_rounds = match["teamA"]["score"] + match["teamB"]["score"]
+        for mask, context in match_lineups(match, player_bits):
+            counters = rosters.get((mask, match["map"]))
+            if counters is None:
+                counters = rosters[(mask, match["map"])] = TotalAccumulator()
+            counters.total_matches += 1
+            counters.total_rounds += match_rounds
+            outcome = outcome_slots[context.outcome(match)]
+            setattr(counters, outcome, getattr(counters, outcome) + 1)
+            count_focusRounds(match, context, {}, counters)
+
+    table = {}
+    for (mask, map_name), counters in rosters.items():
+        # Walk every submask of the roster
+        stack = mask
+        while stack:
+            if MIN_STACK <= bin(stack).count("1") <= MAX_STACK:
+                target = table.get((stack, map_name))
+                if target is None:
+                    target = table[(stack, map_name)] = TotalAccumulator()
+                target.merge(counters)
+            stack = (stack - 1) & mask
+
+    return table
+
+
+def stack_members(mask: int, players: List[str]) -> List[str]:
+    return [player_name for bit, player_name in enumerate(players) if mask >> bit & 1]
+
+
+def rank_stacks(table: Dict[Tuple[int, str], TotalAccumulator], players: List[str],
+                min_matches: int = 5) -> Dict[int, List[Dict]]:
+    """
+    Groups the table by stack size, keeping stacks with at least min_matches matches,
+    ordered by win rate and then by number of matches
+    """
+    totals = {}
+    by_map = {}
+    for (mask, map_name), counters in table.items():
+        if mask not in totals:
+            totals[mask] = TotalAccumulator()
+            by_map[mask] = {}
+        totals[mask].merge(counters)
+        by_map[mask][map_name] = counters.to_dict()
+
+    ranked = {size: [] for size in range(MIN_STACK, MAX_STACK + 1)}
+    for mask, counters in totals.items():
+        if counters.total_matches < min_matches:
+            continue
+        ranked[bin(mask).count("1")].append({
+            "players": stack_members(mask, players),
+            "total_stats": counters.to_dict(),
+            "map_stats": by_map[mask]
+        })
+
+    for stacks in ranked.values():
+        stacks.sort(key=lambda x: (-x["total_stats"]["won"] / x["total_stats"]["total_matches"],
+                                   -x["total_stats"]["total_matches"]))
+    return ranked
@@ -0,0 +1,56 @@
+from typing import Dict
+
+
+# Side codes used in CS2 demo exports
+SIDE_NAMES = {2: "CT", 3: "T"}
+
+
+class MatchContext:
+    """
+    Focus-player view of one match, built once so per-round work is constant-time field reads
+    """
+    __slots__ = ("team_letter", "team_name", "side_key", "on_team_a", "teamA_name", "teamB_name")
+
+    def __init__(self, match: Dict, focusPlayer: str):
+        self.teamA_name = match["teamA"]["name"]
+        self.teamB_name = match["teamB"]["name"]
+
+        player_data = match["players"].get(focusPlayer)
+        player_team_name = player_data.get("teamName") if player_data is not None else None
+
+        # Outcome only credits Team A on an exact team name match (see determine_outcome)
+        self.on_team_a = player_data is not None and player_data["teamName"] == self.teamA_name
+
+        # Round sides also accept the generic "Team A"/"Team B" labels (see determine_playerTeamSide)
+        if player_data is not None and (player_team_name == self.teamA_name or player_team_name == "Team A"):
+            self.team_letter = "A"
+            self.team_name = self.teamA_name
+            self.side_key = "teamASide"
+        elif player_data is not None and (player_team_name == self.teamB_name or player_team_name == "Team B"):
+            self.team_letter = "B"
+            self.team_name = self.teamB_name
+            self.side_key = "teamBSide"
+        else:
+            self.team_letter = None
+            self.team_name = None
+            self.side_key = None
+
+    def outcome(self, match: Dict) -> str:
+        """
+        Determines the outcome of the match (Win, Loss, Tie) for the focus player
+        """
+        teamA_score = match["teamA"]["score"]
+        teamB_score = match["teamB"]["score"]
+
+        if teamA_score > teamB_score:
+            return "Win" if self.on_team_a else "Loss"
+        if teamA_score < teamB_score:
+            return "Loss" if self.on_team_a else "Win"
+        return "Tie"
+
+
+def build_matchContext(match: Dict, focusPlayer: str) -> MatchContext:
+    """
+    Builds the focus-player context for a filtered match
+    """
+    return MatchContext(match, focusPlayer)
@@ -0,0 +1,247 @@
+import datetime
+import sqlite3
+from typing import Dict, List, Optional
+from modules.incrementalStats import mapping_fingerprint
+
+
+# (stats key, demo player field) pairs in the order analyze_stats builds player_stats
+PLAYER_FIELDS = [
+    ("kills", "killCount"), ("assists", "assistCount"), ("deaths", "deathCount"),
+    ("mvp", "mvpCount"), ("headshots", "headshotCount"),
+    ("vsOneCount", "vsOneCount"), ("vsOneWon", "vsOneWonCount"),
+    ("vsTwoCount", "vsTwoCount"), ("vsTwoWon", "vsTwoWonCount"),
+    ("vsThreeCount", "vsThreeCount"), ("vsThreeWon", "vsThreeWonCount"),
+    ("vsFourCount", "vsFourCount"), ("vsFourWon", "vsFourWonCount"),
+    ("vsFiveCount", "vsFiveCount"), ("vsFiveWon", "vsFiveWonCount"),
+]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    date TEXT,
+    map TEXT,
+    teamA_name TEXT,
+    teamA_score INTEGER,
+    teamB_name TEXT,
+    teamB_score INTEGER
+);
+CREATE INDEX IF NOT EXISTS matches_date ON matches (date);
+CREATE INDEX IF NOT EXISTS matches_map ON matches (map, date);
+
+CREATE TABLE IF NOT EXISTS player_lines (
+    id INTEGER PRIMARY KEY,
+    match_id INTEGER NOT NULL,
+    raw_name TEXT,
+    player TEXT,
+    steam_id TEXT,
+    team_name TEXT,
+    {", ".join(f"{key} INTEGER" for key, _ in PLAYER_FIELDS)}
+);
+CREATE INDEX IF NOT EXISTS player_lines_match ON player_lines (match_id);
+CREATE INDEX IF NOT EXISTS player_lines_player ON player_lines (player, match_id);
+CREATE INDEX IF NOT EXISTS player_lines_raw_name ON player_lines (raw_name);
+
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    match_id INTEGER NOT NULL,
+    teamASide INTEGER,
+    teamBSide INTEGER,
+    winnerTeamName TEXT
+);
+CREATE INDEX IF NOT EXISTS rounds_match ON rounds (match_id);
+"""
+
+
+def open_matchStore(db_path: str) -> sqlite3.Connection:
+    """
+    Opens (and if needed creates) the match database
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def sync_playerMapping(conn: sqlite3.Connection, player_mapping: Dict[str, str]) -> None:
+    """
+    Re-normalises stored player names if the mapping changed since they were written
+    """
+    fingerprint = mapping_fingerprint(player_mapping)
+    row = conn.execute("SELECT value FROM meta WHERE key = 'mapping'").fetchone()
+    if row is not None and row[0] == fingerprint:
+        return
+
+    conn.execute("UPDATE player_lines SET player = NULL")
+    conn.executemany("UPDATE player_lines SET player = ? WHERE raw_name = ?",
+                     ((name, alias) for alias, name in player_mapping.items()))
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('mapping', ?)", (fingerprint,))
+    conn.commit()
+
+
+def ingest_matches(conn: sqlite3.Connection, matches: Dict, player_mapping: Dict[str, str]) -> int:
+    """
+    Writes extracted (unfiltered) matches into the store, replacing matches with the same name.
+    Returns the number of ingested matches.
+    """
+    sync_playerMapping(conn, player_mapping)
+    player_columns = ", ".join(key for key, _ in PLAYER_FIELDS)
+    placeholders = ", ".join("?" for _ in PLAYER_FIELDS)
+
+    with conn:
+        for match_name, match in matches.items():
+            row = conn.execute("SELECT id FROM matches WHERE name = ?", (match_name,)).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM player_lines WHERE match_id = ?", row)
+                conn.execute("DELETE FROM rounds WHERE match_id = ?", row)
+                conn.execute("DELETE FROM matches WHERE id = ?", row)
+
+            match_id = conn.execute(
+                "INSERT INTO matches (name, date, map, teamA_name, teamA_score, teamB_name, teamB_score) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (match_name, match["date"], match["map"],
+                 match["teamA"]["name"], match["teamA"]["score"],
+                 match["teamB"]["name"], match["teamB"]["score"])
+            ).lastrowid
+
+            conn.executemany(
+                f"INSERT INTO player_lines (match_id, raw_name, player, steam_id, team_name, {player_columns}) "
+                f"VALUES (?, ?, ?, ?, ?, {placeholders})",
+                ((match_id, player["name"], player_mapping.get(player["name"]),
+                  player.get("steamId"), player.get("teamName"),
+                  *(player[field] for _, field in PLAYER_FIELDS))
+                 for player in match["players"])
+            )
+
+            conn.executemany(
+                "INSERT INTO rounds (match_id, teamASide, teamBSide, winnerTeamName) VALUES (?, ?, ?, ?)",
+                ((match_id, round_data.get("teamASide"), round_data.get("teamBSide"),
+                  round_data.get("winnerTeamName", ""))
+                 for round_data in match.get("rounds", []))
+            )
+
+    return len(matches)
+
+
+def match_selection(since: Optional[datetime.date], until: Optional[datetime.date],
+                    maps: Optional[List[str]]) -> tuple:
+    """
+    Builds the WHERE clause selecting matches by date range (inclusive) and map
+    """
+    clauses, params = [], []
+    if since is not None:
+        clauses.append("date >= ?")
+        params.append(since.isoformat())
+    if until is not None:
+        # Dates are ISO timestamps, so everything before the following day is on or before `until`
+        clauses.append("date < ?")
+        params.append((until + datetime.timedelta(days=1)).isoformat())
+    if maps:
+        clauses.append(f"map IN ({', '.join('?' for _ in maps)})")
+        params.extend(maps)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+
+def query_stats(conn: sqlite3.Connection, focusPlayer: str, since: Optional[datetime.date] = None,
+                until: Optional[datetime.date] = None, maps: Optional[List[str]] = None) -> Dict:
+    """
+    Computes the analyze_stats structures with SQL aggregates over the selected matches
+    """
+    where, params = match_selection(since, until, maps)
+
+    # Like filter_players, the last line of a normalised player within a match wins
+    ctes = f"""
+        WITH sel AS (SELECT * FROM matches {where}),
+        lines AS (
+            SELECT pl.* FROM player_lines pl
+            JOIN (SELECT MAX(id) AS id FROM player_lines
+                  WHERE player IS NOT NULL AND match_id IN (SELECT id FROM sel)
+                  GROUP BY match_id, player) kept ON kept.id = pl.id
+        ),
+        focus AS (
+            SELECT m.*,
+                CASE WHEN f.team_name = m.teamA_name THEN 1 ELSE 0 END AS onA,
+                CASE
+                    WHEN f.team_name = m.teamA_name OR f.team_name = 'Team A' THEN 'A'
+                    WHEN f.team_name = m.teamB_name OR f.team_name = 'Team B' THEN 'B'
+                END AS letter
+            FROM sel m LEFT JOIN lines f ON f.match_id = m.id AND f.player = ?
+        ),
+        outcomes AS (
+            SELECT *,
+                CASE
+                    WHEN teamA_score > teamB_score THEN CASE WHEN onA THEN 'won' ELSE 'lost' END
+                    WHEN teamA_score < teamB_score THEN CASE WHEN onA THEN 'lost' ELSE 'won' END
+                    ELSE 'tied'
+                END AS outcome
+            FROM focus
+        ),
+        focus_rounds AS (
+            SELECT r.id, o.map,
+                CASE o.letter WHEN 'A' THEN r.teamASide ELSE r.teamBSide END AS side,
+                r.winnerTeamName = CASE o.letter WHEN 'A' THEN o.teamA_name ELSE o.teamB_name END AS won
+            FROM rounds r JOIN outcomes o ON o.id = r.match_id
+            WHERE o.letter IS NOT NULL
+        )
+    """
+    params = params + [focusPlayer]
+
+    map_stats = {}
+    for map_name, total, won, lost, tied, rounds in conn.execute(ctes + """
+        SELECT map, COUNT(*), SUM(outcome = 'won'), SUM(outcome = 'lost'), SUM(outcome = 'tied'),
+               SUM(teamA_score + teamB_score)
+        FROM outcomes GROUP BY map ORDER BY MIN(id)
+    """, params):
+        map_stats[map_name] = {
+            'total_matches': total,
+            'won': won, 'lost': lost, 'tied': tied,
+            'total_rounds': rounds
+        }
+
+    round_stats = {}
+    for map_name, ct_total, ct_won, t_total, t_won in conn.execute(ctes + """
+        SELECT map, SUM(side = 2), SUM(side = 2 AND won IS 1), SUM(side = 3), SUM(side = 3 AND won IS 1)
+        FROM focus_rounds WHERE side IN (2, 3)
+        GROUP BY map ORDER BY MIN(id)
+    """, params):
+        round_stats[map_name] = {
+            'ctRoundsTotal': ct_total,
+            'ctRoundsWon': ct_won,
+            'tRoundsTotal': t_total,
+            'tRoundsWon': t_won
+        }
+
+    player_columns = ", ".join(f"SUM(l.{key})" for key, _ in PLAYER_FIELDS)
+    player_stats = {}
+    for row in conn.execute(ctes + f"""
+        SELECT l.player, COUNT(*), {player_columns}
+        FROM lines l
+        JOIN (SELECT player, MIN(id) AS first_id FROM player_lines
+              WHERE player IS NOT NULL AND match_id IN (SELECT id FROM sel)
+              GROUP BY player) first_seen ON first_seen.player = l.player
+        GROUP BY l.player ORDER BY MIN(first_seen.first_id)
+    """, params):
+        stats = {'matches': row[1]}
+        stats.update((key, value) for (key, _), value in zip(PLAYER_FIELDS, row[2:]))
+        player_stats[row[0]] = stats
+
+    total_stats = {
+        'total_matches': sum(stats['total_matches'] for stats in map_stats.values()),
+        'won': sum(stats['won'] for stats in map_stats.values()),
+        'lost': sum(stats['lost'] for stats in map_stats.values()),
+        'tied': sum(stats['tied'] for stats in map_stats.values()),
+        'total_rounds': sum(stats['total_rounds'] for stats in map_stats.values()),
+        'ctRoundsTotal': sum(stats['ctRoundsTotal'] for stats in round_stats.values()),
+        'ctRoundsWon': sum(stats['ctRoundsWon'] for stats in round_stats.values()),
+        'tRoundsTotal': sum(stats['tRoundsTotal'] for stats in round_stats.values()),
+        'tRoundsWon': sum(stats['tRoundsWon'] for stats in round_stats.values())
+    }
+
+    return {
+        "map_stats": map_stats,
+        "round_stats": round_stats,
+        "player_stats": player_stats,
+        "total_stats": total_stats
+    }
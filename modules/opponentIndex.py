@@ -0,0 +1,128 @@
+import datetime
+import sqlite3
+from typing import Dict, List, Optional
+from modules.matchStore import match_selection
+from modules.statAccumulators import TotalAccumulator
+
+
+# Placeholder team names of exports without real team names; they say nothing about the opponent
+GENERIC_TEAM_NAMES = {"Team A", "Team B"}
+
+
+def head_to_head(conn: sqlite3.Connection, focusPlayer: str, match_names: Optional[List[str]] = None,
+                 since: Optional[datetime.date] = None, until: Optional[datetime.date] = None,
+                 maps: Optional[List[str]] = None) -> Dict[str, Dict[str, Dict]]:
+    """
+    Records of the focus player against every opposing team and player in the match store.
+    The store keeps the unfiltered rosters, so opponents are found without reading the demos again.
+    Only the named matches are used if match_names is given, otherwise the matches passing the filters.
+    Returns {"teams": {team name: entry}, "players": {player key: entry}}, where each entry holds the
+    display name, total_stats (record and CT/T rounds from the focus side) and a per-map record.
+    """
+    where, params = match_selection(since, until, maps)
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS selected_matches (name TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM selected_matches")
+    if match_names is not None:
+        conn.executemany("INSERT OR IGNORE INTO selected_matches (name) VALUES (?)", ((name,) for name in match_names))
+        where = f"{where} AND" if where else "WHERE"
+        where += " name IN (SELECT name FROM selected_matches)"
+
+    # Team letters accept the generic "Team A"/"Team B" labels like MatchContext does;
+    # like filter_players, the last line of the focus player within a match wins
+    ctes = f"""
+        WITH sel AS (SELECT * FROM matches {where}),
+        lines AS (
+            SELECT pl.id, pl.match_id, pl.player, pl.raw_name, pl.steam_id,
+                pl.team_name = m.teamA_name AS onA,
+                CASE
+                    WHEN pl.team_name = m.teamA_name OR pl.team_name = 'Team A' THEN 'A'
+                    WHEN pl.team_name = m.teamB_name OR pl.team_name = 'Team B' THEN 'B'
+                END AS letter
+            FROM player_lines pl JOIN sel m ON m.id = pl.match_id
+        ),
+        focus AS (
+            SELECT l.match_id, l.letter, l.onA FROM lines l
+            JOIN (SELECT MAX(id) AS id FROM lines WHERE player = ? AND letter IS NOT NULL
+                  GROUP BY match_id) kept ON kept.id = l.id
+        )
+    """
+    params = params + [focusPlayer]
+
+    # Focus side of every match: outcome, map and the focus team's CT/T rounds (side 2 = CT, 3 = T)
+    focus_matches = {}
+    for match_id, map_name, on_team_a, teamA_score, teamB_score, ct_total, ct_won, t_total, t_won, \
+            opponent_team in conn.execute(ctes + """
+        SELECT m.id, m.map, f.onA, m.teamA_score, m.teamB_score,
+               COALESCE(SUM(r.side = 2), 0), COALESCE(SUM(r.side = 2 AND r.won), 0),
+               COALESCE(SUM(r.side = 3), 0), COALESCE(SUM(r.side = 3 AND r.won), 0),
+               CASE f.letter WHEN 'A' THEN m.teamB_name ELSE m.teamA_name END
+        FROM focus f
+        JOIN sel m ON m.id = f.match_id
+        LEFT JOIN (
+            SELECT r.match_id,
+                CASE f.letter WHEN 'A' THEN r.teamASide ELSE r.teamBSide END AS side,
+                r.winnerTeamName = CASE f.letter WHEN 'A' THEN m.teamA_name ELSE m.teamB_name END AS won
+            FROM rounds r JOIN focus f ON f.match_id = r.match_id JOIN sel m ON m.id = r.match_id
+        ) r ON r.match_id = f.match_id
+        GROUP BY m.id
+        ORDER BY m.date, m.id
+    """, params):
+        # Outcome credits team A only on an exact team name match, as in the report
+        if teamA_score == teamB_score:
+            outcome = "tied"
+        elif (teamA_score > teamB_score) == bool(on_team_a):
+            outcome = "won"
+        else:
+            outcome = "lost"
+        counters = TotalAccumulator()
+        counters.total_matches = 1
+        counters.total_rounds = teamA_score + teamB_score
+        setattr(counters, outcome, 1)
+        counters.add(ct_total, ct_won, t_total, t_won)
+        focus_matches[match_id] = (map_name, counters, opponent_team)
+
+    result = {"teams": {}, "players": {}}
+
+    def record(kind: str, key: str, display_name: str, match_id: int) -> None:
+        map_name, counters, _ = focus_matches[match_id]
+        entry = result[kind].get(key)
+        if entry is None:
+            entry = result[kind][key] = {"name": display_name, "total_stats": TotalAccumulator(), "map_stats": {}}
+        # Matches are visited in date order, so the most recent name is shown
+        entry["name"] = display_name
+        entry["total_stats"].merge(counters)
+        map_counters = entry["map_stats"].get(map_name)
+        if map_counters is None:
+            map_counters = entry["map_stats"][map_name] = TotalAccumulator()
+        map_counters.merge(counters)
+
+    for match_id, (_, _, opponent_team) in focus_matches.items():
+        if opponent_team is not None and opponent_team not in GENERIC_TEAM_NAMES:
+            record("teams", opponent_team, opponent_team, match_id)
+
+    # Opposing players are identified by SteamID, or by name for lines without one
+    rows = conn.execute(ctes + """
+        SELECT f.match_id, COALESCE(NULLIF(l.steam_id, ''), l.raw_name), l.raw_name
+        FROM focus f
+        JOIN sel m ON m.id = f.match_id
+        JOIN lines l ON l.match_id = f.match_id AND l.letter <> f.letter
+        ORDER BY m.date, m.id, l.id
+    """, params).fetchall()
+    for match_id, key, raw_name in rows:
+        record("players", str(key), raw_name, match_id)
+
+    for entries in result.values():
+        for entry in entries.values():
+            entry["total_stats"] = entry["total_stats"].to_dict()
+            entry["map_stats"] = {map_name: counters.to_dict() for map_name, counters in entry["map_stats"].items()}
+    return result
+
+
+def rank_opponents(entries: Dict[str, Dict], min_matches: int = 2) -> List[Dict]:
+    """
+    Opponents met at least min_matches times, most frequent first and then by win rate
+    """
+    ranked = [entry for entry in entries.values() if entry["total_stats"]["total_matches"] >= min_matches]
+    ranked.sort(key=lambda x: (-x["total_stats"]["total_matches"],
+                               -x["total_stats"]["won"] / x["total_stats"]["total_matches"]))
+    return ranked
@@ -0,0 +1,102 @@
+import datetime
+import json
+import os
+import platform
+from typing import Dict, List, Tuple
+from modules.incrementalStats import mapping_fingerprint
+from modules.statsAnalyzer import analyze_stats, merge_stats
+
+
+PARTIAL_FORMAT = "cs2-stats-partial"
+PARTIAL_VERSION = 1
+
+
+def match_identity(match: Dict) -> List:
+    """
+    Date, map and final score of a match; two shards listing the same name with the same identity hold the same match
+    """
+    return [match["date"], match["map"], match["teamA"]["score"], match["teamB"]["score"]]
+
+
+def build_partial(matches: Dict, stats: Dict, focusPlayer: str, player_mapping: Dict) -> Dict:
+    """
+    Builds a shard from filtered matches and their aggregated stats.
+    Each match's own contribution is kept so duplicates found at merge time can be taken out again.
+    """
+    return {
+        "format": PARTIAL_FORMAT,
+        "version": PARTIAL_VERSION,
+        "focus_player": focusPlayer,
+        "mapping": mapping_fingerprint(player_mapping),
+        "host": platform.node(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "stats": stats,
+        "matches": {
+            match_name: {
+                "identity": match_identity(match),
+                "stats": analyze_stats({match_name: match}, focusPlayer)
+            }
+            for match_name, match in matches.items()
+        }
+    }
+
+
+def save_partial(partial_file: str, partial: Dict) -> None:
+    """
+    Writes a shard, replacing the previous file atomically
+    """
+    tmp_file = f"{partial_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(partial, f, separators=(",", ":"))
+    os.replace(tmp_file, partial_file)
+
+
+def load_partial(partial_file: str) -> Dict:
+    """
+    Reads a shard, raising ValueError if it is not a shard of the supported version
+    """
+    try:
+        with open(partial_file, "r", encoding="utf-8") as f:
+            partial = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"cannot read '{partial_file}': {e}")
+
+    if not isinstance(partial, dict) or partial.get("format") != PARTIAL_FORMAT:
+        raise ValueError(f"'{partial_file}' is not a partial stats shard")
+    if partial.get("version") != PARTIAL_VERSION:
+        raise ValueError(f"'{partial_file}' has shard version {partial.get('version')}, expected {PARTIAL_VERSION}")
+    return partial
+
+
+def merge_partials(partials: List[Dict], focusPlayer: str) -> Tuple[Dict, List[Tuple[str, int, int]], List[Tuple[str, int, int]]]:
+    """
+    Sums the shards in the given order; the result equals one run over their matches in that order.
+    A match already counted from an earlier shard is subtracted from the later one (duplicate).
+    A name seen again with a different date, map or score (conflict) resolves like a single run over the
+    files would: the later match replaces the earlier one.
+    Returns the stats, the duplicates and the conflicts as (match name, earlier shard, later shard) index tuples.
+    """
+    stats = analyze_stats({}, focusPlayer)
+    seen = {}   # match name -> (shard index, identity, contribution) of the counted version
+    duplicates = []
+    conflicts = []
+
+    for index, partial in enumerate(partials):
+        shard_stats = partial["stats"]
+        for match_name, entry in partial["matches"].items():
+            if match_name not in seen:
+                seen[match_name] = (index, entry["identity"], entry["stats"])
+                continue
+
+            first_index, identity, contribution = seen[match_name]
+            if identity == entry["identity"]:
+                duplicates.append((match_name, first_index, index))
+                shard_stats = merge_stats(shard_stats, entry["stats"], sign=-1)
+            else:
+                conflicts.append((match_name, first_index, index))
+                stats = merge_stats(stats, contribution, sign=-1)
+                seen[match_name] = (index, entry["identity"], entry["stats"])
+
+        stats = merge_stats(stats, shard_stats)
+
+    return stats, duplicates, conflicts
@@ -0,0 +1,118 @@
+import cProfile
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; worker CPU time is then reported as 0
+    resource = None
+
+
+def _children_cpuTime() -> float:
+    """
+    CPU seconds used by finished child processes (the --jobs workers) so far
+    """
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class PipelineMetrics:
+    """
+    Records wall time, CPU time and peak traced memory of each pipeline stage, plus run counters.
+    CPU time is split into the main process and the worker processes the stage waited for;
+    traced memory only covers the main process.
+    When disabled, stage() is a no-op so the pipeline pays nothing for it.
+    """
+
+    def __init__(self, enabled: bool = False, profile_stage: Optional[str] = None,
+                 profile_path: Optional[str] = None):
+        self.enabled = enabled
+        self.profile_stage = profile_stage
+        self.profile_path = profile_path
+        self.stages = []
+        self.counters = {}
+        self.failed_files = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        profiler = None
+        if self.profile_path and name == self.profile_stage:
+            profiler = cProfile.Profile()
+
+        if not self.enabled and profiler is None:
+            yield
+            return
+
+        if self.enabled:
+            # Measure each stage's own peak: restart tracing (reset_peak needs Python 3.9+)
+            if tracemalloc.is_tracing() and hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.stop()
+                tracemalloc.start()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        workers_start = _children_cpuTime()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(self.profile_path)
+            if self.enabled:
+                _, peak = tracemalloc.get_traced_memory()
+                self.stages.append({
+                    "stage": name,
+                    "wall_seconds": time.perf_counter() - wall_start,
+                    "cpu_seconds": time.process_time() - cpu_start,
+                    "worker_cpu_seconds": _children_cpuTime() - workers_start,
+                    "peak_traced_bytes": peak
+                })
+
+    def count(self, **counters: int) -> None:
+        self.counters.update(counters)
+
+    def add_failedFiles(self, failed_files: List[str]) -> None:
+        self.failed_files.extend(failed_files)
+        self.counters["failed_files"] = len(self.failed_files)
+
+    def stop(self) -> None:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def to_dict(self) -> Dict:
+        return {
+            "stages": self.stages,
+            "total_wall_seconds": sum(stage["wall_seconds"] for stage in self.stages),
+            "total_cpu_seconds": sum(stage["cpu_seconds"] for stage in self.stages),
+            "total_worker_cpu_seconds": sum(stage["worker_cpu_seconds"] for stage in self.stages),
+            "counters": self.counters,
+            "failed_files": self.failed_files
+        }
+
+    def summary(self) -> str:
+        """
+        Formats the recorded metrics as a human-readable table
+        """
+        output = []
+        output.append(f"{'Stage':<10} {'Wall (s)':>9} {'CPU (s)':>9} {'Workers (s)':>11} {'Peak MiB':>9}")
+        for stage in self.stages:
+            output.append(f"{stage['stage']:<10} {stage['wall_seconds']:>9.3f} {stage['cpu_seconds']:>9.3f} "
+                          f"{stage['worker_cpu_seconds']:>11.3f} {stage['peak_traced_bytes'] / 1024 / 1024:>9.1f}")
+        output.append("CPU (s) and Peak MiB cover the main process only; Workers (s) is the CPU time of --jobs workers.")
+        output.append(", ".join(f"{key}: {value}" for key, value in self.counters.items()))
+        for file_path in self.failed_files:
+            output.append(f"Failed to load: {file_path}")
+        return '\n'.join(output)
+
+    def write_json(self, metrics_file: str) -> None:
+        with open(metrics_file, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,321 @@
+import csv
+import html
+import io
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+from modules.statAccumulators import CLUTCH_NAMES
+
+
+# Report formats and the file extension each is written with
+REPORT_FORMATS = {"md": ".md", "json": ".json", "csv": ".csv", "html": ".html"}
+
+CSV_FIELDS = ("focus_player", "section", "name", "matches", "won", "lost", "tied", "win_rate",
+              "ct_rounds_won", "ct_rounds_total", "ct_win_rate", "t_rounds_won", "t_rounds_total", "t_win_rate",
+              "side_preference", "kills", "deaths", "assists", "kd", "headshots", "headshot_rate", "mvps",
+              "clutches", "clutches_won", "clutch_rate")
+
+
+def _side_rates(round_stats: Dict) -> Dict:
+    ct_rounds_total = round_stats.get('ctRoundsTotal', 0)
+    ct_rounds_won = round_stats.get('ctRoundsWon', 0)
+    t_rounds_total = round_stats.get('tRoundsTotal', 0)
+    t_rounds_won = round_stats.get('tRoundsWon', 0)
+    return {
+        "ct_rounds_won": ct_rounds_won,
+        "ct_rounds_total": ct_rounds_total,
+        "ct_win_rate": (ct_rounds_won / ct_rounds_total * 100) if ct_rounds_total > 0 else 0,
+        "t_rounds_won": t_rounds_won,
+        "t_rounds_total": t_rounds_total,
+        "t_win_rate": (t_rounds_won / t_rounds_total * 100) if t_rounds_total > 0 else 0
+    }
+
+
+def build_reportModel(stats_dict: Dict) -> Dict:
+    """
+    Computes every derived metric of the report (win rates, K/D, clutch totals, best/worst map, ...)
+    once from the stats dictionary returned by analyze_stats; the renderers only format the result
+    """
+    total_stats = stats_dict.get('total_stats', {})
+    won, lost, tied = total_stats.get('won', 0), total_stats.get('lost', 0), total_stats.get('tied', 0)
+    total_matches = won + lost + tied
+    overall = dict({
+        "matches": total_matches,
+        "won": won,
+        "lost": lost,
+        "tied": tied,
+        "win_rate": (won / total_matches * 100) if total_matches > 0 else 0
+    }, **_side_rates(total_stats))
+
+    map_stats = stats_dict.get('map_stats', {})
+    round_stats = stats_dict.get('round_stats', {})
+    best_map = worst_map = None
+    if map_stats:
+        best = max(map_stats.items(), key=lambda x: x[1]['won'] / x[1]['total_matches'] if x[1]['total_matches'] > 0 else 0)
+        worst = min(map_stats.items(), key=lambda x: x[1]['won'] / x[1]['total_matches'] if x[1]['total_matches'] > 0 else 1)
+        best_map = {"name": best[0], "won": best[1]['won'], "matches": best[1]['total_matches']}
+        worst_map = {"name": worst[0], "won": worst[1]['won'], "matches": worst[1]['total_matches']}
+
+    maps = []
+    # Sort maps by matches played (descending)
+    for map_name, stats in sorted(map_stats.items(), key=lambda x: x[1]['total_matches'], reverse=True):
+        matches = stats['total_matches']
+        row = dict({
+            "name": map_name,
+            "matches": matches,
+            "won": stats['won'],
+            "lost": stats['lost'],
+            "tied": stats['tied'],
+            "win_rate": (stats['won'] / matches * 100) if matches > 0 else 0
+        }, **_side_rates(round_stats.get(map_name, {})))
+
+        # Side preference only for maps with round data
+        row["side_preference"] = None
+        if row["ct_rounds_total"] > 0 or row["t_rounds_total"] > 0:
+            if row["ct_win_rate"] > row["t_win_rate"] + 5:
+                row["side_preference"] = "CT-sided"
+            elif row["t_win_rate"] > row["ct_win_rate"] + 5:
+                row["side_preference"] = "T-sided"
+            else:
+                row["side_preference"] = "Balanced"
+        maps.append(row)
+
+    # Per-player rows in analysis order, so ties between players of the week resolve as before
+    player_rows = []
+    for player_name, stats in stats_dict.get('player_stats', {}).items():
+        kills, deaths, matches = stats['kills'], stats['deaths'], stats['matches']
+        clutches = sum(stats[f'vs{name}Count'] for name in CLUTCH_NAMES)
+        clutches_won = sum(stats[f'vs{name}Won'] for name in CLUTCH_NAMES)
+        player_rows.append({
+            "name": player_name,
+            "matches": matches,
+            "kills": kills,
+            "deaths": deaths,
+            "assists": stats['assists'],
+            "kills_per_match": kills / matches if matches > 0 else 0,
+            "kd": kills / deaths if deaths > 0 else kills,
+            "headshots": stats['headshots'],
+            "headshot_rate": (stats['headshots'] / kills * 100) if kills > 0 else 0,
+            "mvps": stats['mvp'],
+            "clutches": clutches,
+            "clutches_won": clutches_won,
+            "clutch_rate": (clutches_won / clutches * 100) if clutches > 0 else 0
+        })
+
+    highlights = None
+    if player_rows:
+        top_fragger = max(player_rows, key=lambda x: x['kills_per_match'])
+        best_clutcher = max(player_rows, key=lambda x: x['clutches_won'])
+        headshot_machine = max(player_rows, key=lambda x: x['headshot_rate'])
+        highlights = {
+            "top_fragger": {"name": top_fragger['name'], "kills_per_match": top_fragger['kills_per_match']},
+            "best_clutcher": {"name": best_clutcher['name'], "clutches_won": best_clutcher['clutches_won']},
+            "headshot_machine": {"name": headshot_machine['name'], "headshot_rate": headshot_machine['headshot_rate']}
+        }
+
+    return {
+        "overall": overall,
+        "best_map": best_map,
+        "worst_map": worst_map,
+        "highlights": highlights,
+        "maps": maps,
+        # Sort players by matches played (descending)
+        "players": sorted(player_rows, key=lambda x: x['matches'], reverse=True),
+        "has_round_stats": bool(round_stats)
+    }
+
+
+def _map_title(map_name: str) -> str:
+    return map_name.replace('de_', '').title()
+
+
+def markdown_report(model: Dict) -> str:
+    """
+    Formats one report model as markdown for Obsidian
+    """
+    output = []
+    overall = model['overall']
+
+    output.append("## Overall Performance")
+    output.append("")
+    output.append(f"**Total Matches:** {overall['matches']} ({overall['won']}W-{overall['lost']}L-{overall['tied']}T)")
+
+    if model['best_map'] is not None:
+        best_map, worst_map = model['best_map'], model['worst_map']
+        output.append(f"- _Strongest Map:_ {_map_title(best_map['name'])} ({best_map['won']}/{best_map['matches']} wins)")
+        output.append(f"- _Weakest Map:_ {_map_title(worst_map['name'])} ({worst_map['won']}/{worst_map['matches']} wins)")
+        output.append("")
+
+    output.append(f"**Win Rate:** {overall['win_rate']:.1f}%")
+    output.append(f"- _CT Side:_ {overall['ct_win_rate']:.1f}% ({overall['ct_rounds_won']}/{overall['ct_rounds_total']} rounds)")
+    output.append(f"- _T Side:_ {overall['t_win_rate']:.1f}% ({overall['t_rounds_won']}/{overall['t_rounds_total']} rounds)")
+    output.append("")
+
+    highlights = model['highlights']
+    if highlights is not None:
+        output.append("**Players of the week:**")
+        output.append(f"- _Top Fragger:_ {highlights['top_fragger']['name']} ({highlights['top_fragger']['kills_per_match']:.1f} kills/match)")
+        output.append(f"- _Best Clutcher:_ {highlights['best_clutcher']['name']} ({highlights['best_clutcher']['clutches_won']} clutch wins)")
+        output.append(f"- _Headshot Machine:_ {highlights['headshot_machine']['name']} ({highlights['headshot_machine']['headshot_rate']:.1f}% headshot rate)")
+        output.append("")
+
+    output.append("## Map Performance")
+    output.append("")
+    output.append("| Map | Matches | Record | Win% | CT Win% | T Win% |")
+    output.append("| --- | ------- | ------ | ---- | ------- | ------ |")
+    for row in model['maps']:
+        output.append(f"| _{row['name']}_ | {row['matches']} | {row['won']}W-{row['lost']}L-{row['tied']}T | {row['win_rate']:.0f}% | {row['ct_win_rate']:.0f}% | {row['t_win_rate']:.0f}% |")
+    output.append("")
+
+    output.append("## Player Statistics")
+    output.append("")
+    output.append("| Player | Matches | KDA | K/D | Headshot% | MVPs | Clutch% |")
+    output.append("| ------ | ------- | --- | --- | --------- | ---- | ------- |")
+    for row in model['players']:
+        output.append(f"| _{row['name']}_ | {row['matches']} | {row['kills']}/{row['deaths']}/{row['assists']} | {row['kd']:.2f} | {row['headshot_rate']:.1f}% | {row['mvps']} | {row['clutch_rate']:.1f}% |")
+    output.append("")
+
+    if model['has_round_stats']:
+        output.append("## Side Performance Summary")
+        output.append("")
+        output.append("| Map | CT Rounds | CT Win% | T Rounds | T Win% | Side Preference |")
+        output.append("| --- | --------- | ------- | -------- | ------ | --------------- |")
+        for row in model['maps']:
+            if row['side_preference'] is not None:
+                output.append(f"| _{row['name']}_ | {row['ct_rounds_won']}/{row['ct_rounds_total']} | {row['ct_win_rate']:.0f}% | {row['t_rounds_won']}/{row['t_rounds_total']} | {row['t_win_rate']:.0f}% | {row['side_preference']} |")
+        output.append("")
+
+    return '\n'.join(output)
+
+
+def render_markdown(models: Dict[str, Dict], combined: bool = False, extras: Optional[Dict] = None) -> str:
+    """
+    Markdown report; combined reports get one section per focus player
+    """
+    if not combined:
+        return markdown_report(next(iter(models.values())))
+
+    output = []
+    for player_name, model in models.items():
+        output.append(f"# {player_name}")
+        output.append("")
+        output.append(markdown_report(model))
+        output.append("")
+    return '\n'.join(output)
+
+
+def render_json(models: Dict[str, Dict], combined: bool = False, extras: Optional[Dict] = None) -> str:
+    """
+    JSON report: the report model, keyed by focus player when combined, with any extra sections as additional keys
+    """
+    document = dict(models) if combined else dict(next(iter(models.values())))
+    document.update(extras or {})
+    return json.dumps(document, indent=2)
+
+
+def render_csv(models: Dict[str, Dict], combined: bool = False, extras: Optional[Dict] = None) -> str:
+    """
+    CSV report with one row per overall, map and player entry, tagged by focus player and section.
+    Extra sections are not rendered; validate_inputs rejects them for this format.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    for focus_player, model in models.items():
+        writer.writerow(dict(model['overall'], focus_player=focus_player, section="overall", name=focus_player))
+        for row in model['maps']:
+            writer.writerow(dict(row, focus_player=focus_player, section="map"))
+        for row in model['players']:
+            writer.writerow(dict(row, focus_player=focus_player, section="player"))
+    return buffer.getvalue()
+
+
+def _html_table(headers: List[str], rows: List[List]) -> List[str]:
+    output = ["<table>", "<tr>" + "".join(f"<th>{html.escape(header)}</th>" for header in headers) + "</tr>"]
+    for row in rows:
+        output.append("<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in row) + "</tr>")
+    output.append("</table>")
+    return output
+
+
+def html_report(model: Dict) -> List[str]:
+    """
+    Formats one report model as HTML body elements
+    """
+    output = []
+    overall = model['overall']
+
+    output.append("<h2>Overall Performance</h2>")
+    output.append(f"<p><strong>Total Matches:</strong> {overall['matches']} ({overall['won']}W-{overall['lost']}L-{overall['tied']}T)<br>")
+    output.append(f"<strong>Win Rate:</strong> {overall['win_rate']:.1f}% "
+                  f"(CT {overall['ct_win_rate']:.1f}%, T {overall['t_win_rate']:.1f}%)</p>")
+
+    items = []
+    if model['best_map'] is not None:
+        best_map, worst_map = model['best_map'], model['worst_map']
+        items.append(f"Strongest Map: {_map_title(best_map['name'])} ({best_map['won']}/{best_map['matches']} wins)")
+        items.append(f"Weakest Map: {_map_title(worst_map['name'])} ({worst_map['won']}/{worst_map['matches']} wins)")
+    highlights = model['highlights']
+    if highlights is not None:
+        items.append(f"Top Fragger: {highlights['top_fragger']['name']} ({highlights['top_fragger']['kills_per_match']:.1f} kills/match)")
+        items.append(f"Best Clutcher: {highlights['best_clutcher']['name']} ({highlights['best_clutcher']['clutches_won']} clutch wins)")
+        items.append(f"Headshot Machine: {highlights['headshot_machine']['name']} ({highlights['headshot_machine']['headshot_rate']:.1f}% headshot rate)")
+    if items:
+        output.append("<ul>")
+        output.extend(f"<li>{html.escape(item)}</li>" for item in items)
+        output.append("</ul>")
+
+    output.append("<h2>Map Performance</h2>")
+    output.extend(_html_table(
+        ["Map", "Matches", "Record", "Win%", "CT Win%", "T Win%", "Side Preference"],
+        [[row['name'], row['matches'], f"{row['won']}W-{row['lost']}L-{row['tied']}T", f"{row['win_rate']:.0f}%",
+          f"{row['ct_win_rate']:.0f}%", f"{row['t_win_rate']:.0f}%", row['side_preference'] or "-"] for row in model['maps']]
+    ))
+
+    output.append("<h2>Player Statistics</h2>")
+    output.extend(_html_table(
+        ["Player", "Matches", "KDA", "K/D", "Headshot%", "MVPs", "Clutch%"],
+        [[row['name'], row['matches'], f"{row['kills']}/{row['deaths']}/{row['assists']}", f"{row['kd']:.2f}",
+          f"{row['headshot_rate']:.1f}%", row['mvps'], f"{row['clutch_rate']:.1f}%"] for row in model['players']]
+    ))
+
+    return output
+
+
+def render_html(models: Dict[str, Dict], combined: bool = False, extras: Optional[Dict] = None) -> str:
+    """
+    Standalone HTML document; combined reports get one section per focus player.
+    Extra sections are not rendered; validate_inputs rejects them for this format.
+    """
+    output = ["<!DOCTYPE html>", "<html>", "<head>", '<meta charset="utf-8">', "<title>CS2 Match Report</title>",
+              "</head>", "<body>"]
+    for player_name, model in models.items():
+        if combined:
+            output.append(f"<h1>{html.escape(player_name)}</h1>")
+        output.extend(html_report(model))
+    output.extend(["</body>", "</html>", ""])
+    return '\n'.join(output)
+
+
+RENDERERS = {"md": render_markdown, "json": render_json, "csv": render_csv, "html": render_html}
+
+
+def parse_formats(value: str) -> List[str]:
+    """
+    Parses a comma-separated format list, dropping repeats; raises ValueError for unknown formats
+    """
+    formats = list(dict.fromkeys(part.strip().lower() for part in value.split(",") if part.strip()))
+    unknown = [fmt for fmt in formats if fmt not in REPORT_FORMATS]
+    if unknown or not formats:
+        raise ValueError(f"unknown report format(s) {', '.join(unknown) or value!r}; choose from {', '.join(REPORT_FORMATS)}")
+    return formats
+
+
+def format_paths(output_file: str, formats: List[str]) -> Dict[str, str]:
+    """
+    Output path per format: the --output path itself for a single format, otherwise
+    the --output path with each format's extension
+    """
+    if len(formats) == 1:
+        return {formats[0]: output_file}
+    return {fmt: str(Path(output_file).with_suffix(REPORT_FORMATS[fmt])) for fmt in formats}
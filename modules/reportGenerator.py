@@ -1,159 +1,238 @@
-from typing import Dict
+from typing import Dict, List, Tuple
+from modules.lineupStats import STACK_NAMES
+from modules.renderers import build_reportModel, markdown_report
 
 
 def generate_report(stats_dict: Dict) -> str:
     """
     Formats the stats dictionary into a human-readable markdown format for Obsidian
     """
+    return markdown_report(build_reportModel(stats_dict))
+
+
+def generate_stackReport(ranked_stacks: Dict[int, List[Dict]], min_matches: int, top: int = 5) -> str:
+    """
+    Formats the ranked stacks from rank_stacks as a "Best Stacks" markdown section
+    """
     output = []
     
-    # Overall Stats Summary
-    total_stats = stats_dict.get('total_stats', {})
-    total_matches = total_stats.get('won', 0) + total_stats.get('lost', 0) + total_stats.get('tied', 0)
-    win_rate = (total_stats.get('won', 0) / total_matches * 100) if total_matches > 0 else 0
-    
-    output.append("## Overall Performance")
+    output.append("## Best Stacks")
+    output.append("")
+    output.append(f"_Stacks with at least {min_matches} matches together, ranked by win rate._")
     output.append("")
-    output.append(f"**Total Matches:** {total_matches} ({total_stats.get('won', 0)}W-{total_stats.get('lost', 0)}L-{total_stats.get('tied', 0)}T)")
     
-    # Map statistics for strongest/weakest
-    map_stats = stats_dict.get('map_stats', {})
-    if map_stats:
-        best_map = max(map_stats.items(), key=lambda x: x[1]['won'] / x[1]['total_matches'] if x[1]['total_matches'] > 0 else 0)
-        worst_map = min(map_stats.items(), key=lambda x: x[1]['won'] / x[1]['total_matches'] if x[1]['total_matches'] > 0 else 1)
+    for size, stacks in ranked_stacks.items():
+        if not stacks:
+            continue
+        
+        output.append(f"### {STACK_NAMES.get(size, f'{size} Players')}")
+        output.append("")
+        output.append("| Stack | Matches | Record | Win% | CT Win% | T Win% | Best Map |")
+        output.append("| ----- | ------- | ------ | ---- | ------- | ------ | -------- |")
+        
+        for stack in stacks[:top]:
+            stats = stack['total_stats']
+            matches = stats['total_matches']
+            win_rate = stats['won'] / matches * 100 if matches > 0 else 0
+            ct_win_pct = (stats['ctRoundsWon'] / stats['ctRoundsTotal'] * 100) if stats['ctRoundsTotal'] > 0 else 0
+            t_win_pct = (stats['tRoundsWon'] / stats['tRoundsTotal'] * 100) if stats['tRoundsTotal'] > 0 else 0
+            
+            # Best map among the maps this stack has played often enough
+            eligible_maps = [(map_name, map_stats) for map_name, map_stats in stack['map_stats'].items()
+                             if map_stats['total_matches'] >= min_matches]
+            if eligible_maps:
+                best_map = max(eligible_maps, key=lambda x: x[1]['won'] / x[1]['total_matches'])
+                map_display = f"_{best_map[0]}_ ({best_map[1]['won']}/{best_map[1]['total_matches']})"
+            else:
+                map_display = "-"
+            
+            stack_display = ", ".join(stack['players'])
+            output.append(f"| {stack_display} | {matches} | {stats['won']}W-{stats['lost']}L-{stats['tied']}T | {win_rate:.0f}% | {ct_win_pct:.0f}% | {t_win_pct:.0f}% | {map_display} |")
         
-        output.append(f"- _Strongest Map:_ {best_map[0].replace('de_', '').title()} ({best_map[1]['won']}/{best_map[1]['total_matches']} wins)")
-        output.append(f"- _Weakest Map:_ {worst_map[0].replace('de_', '').title()} ({worst_map[1]['won']}/{worst_map[1]['total_matches']} wins)")
         output.append("")
     
-    # Add round statistics
-    ct_rounds_total = total_stats.get('ctRoundsTotal', 0)
-    ct_rounds_won = total_stats.get('ctRoundsWon', 0)
-    t_rounds_total = total_stats.get('tRoundsTotal', 0)
-    t_rounds_won = total_stats.get('tRoundsWon', 0)
+    if len(output) == 4:
+        output.append("No stack reached the minimum number of matches.")
+        output.append("")
     
-    ct_win_rate = (ct_rounds_won / ct_rounds_total * 100) if ct_rounds_total > 0 else 0
-    t_win_rate = (t_rounds_won / t_rounds_total * 100) if t_rounds_total > 0 else 0
+    return '\n'.join(output)
+
+
+def _format_interval(interval: Tuple[float, float, float], percent: bool = True) -> str:
+    point, lower, upper = interval
+    if percent:
+        return f"{point * 100:.0f}% [{lower * 100:.0f}–{upper * 100:.0f}]"
+    return f"{point:.2f} [{lower:.2f}–{upper:.2f}]"
+
+
+def generate_confidenceReport(intervals: Dict) -> str:
+    """
+    Formats the bootstrap intervals from bootstrap_stats as a markdown section.
+    Strongest map and players of the week are picked by lower bound, the weakest map by upper bound.
+    """
+    output = []
     
-    output.append(f"**Win Rate:** {win_rate:.1f}%")
-    output.append(f"- _CT Side:_ {ct_win_rate:.1f}% ({ct_rounds_won}/{ct_rounds_total} rounds)")
-    output.append(f"- _T Side:_ {t_win_rate:.1f}% ({t_rounds_won}/{t_rounds_total} rounds)")
+    output.append("## Confidence Intervals")
+    output.append("")
+    output.append(f"_{intervals['confidence'] * 100:g}% bootstrap intervals from {intervals['resamples']} resamples "
+                  f"(maps and players resample matches, sides resample rounds)._")
     output.append("")
     
-    # Players of the week
-    player_stats = stats_dict.get('player_stats', {})
-    if player_stats:
-        output.append("**Players of the week:**")
-        
-        # Top fragger
-        top_fragger = max(player_stats.items(), key=lambda x: x[1]['kills'] / x[1]['matches'] if x[1]['matches'] > 0 else 0)
-        output.append(f"- _Top Fragger:_ {top_fragger[0]} ({top_fragger[1]['kills']/top_fragger[1]['matches']:.1f} kills/match)")
-        
-        # Best clutcher
-        best_clutcher = max(player_stats.items(), key=lambda x: sum([x[1]['vsOneWon'], x[1]['vsTwoWon'], x[1]['vsThreeWon'], x[1]['vsFourWon'], x[1]['vsFiveWon']]))
-        total_clutch_wins = sum([best_clutcher[1]['vsOneWon'], best_clutcher[1]['vsTwoWon'], best_clutcher[1]['vsThreeWon'], best_clutcher[1]['vsFourWon'], best_clutcher[1]['vsFiveWon']])
-        output.append(f"- _Best Clutcher:_ {best_clutcher[0]} ({total_clutch_wins} clutch wins)")
+    map_stats = intervals['map_stats']
+    player_stats = intervals['player_stats']
+    if map_stats or player_stats:
+        output.append("**Ranked by confidence bound:**")
         
-        # Headshot machine (highest headshot percentage)
-        headshot_machine = max(player_stats.items(), key=lambda x: (x[1]['headshots'] / x[1]['kills'] * 100) if x[1]['kills'] > 0 else 0)
-        hs_percentage = (headshot_machine[1]['headshots'] / headshot_machine[1]['kills'] * 100) if headshot_machine[1]['kills'] > 0 else 0
-        output.append(f"- _Headshot Machine:_ {headshot_machine[0]} ({hs_percentage:.1f}% headshot rate)")
+    if map_stats:
+        best_map = max(map_stats.items(), key=lambda x: x[1]['win_rate'][1])
+        worst_map = min(map_stats.items(), key=lambda x: x[1]['win_rate'][2])
+        output.append(f"- _Strongest Map:_ {best_map[0].replace('de_', '').title()} ({_format_interval(best_map[1]['win_rate'])})")
+        output.append(f"- _Weakest Map:_ {worst_map[0].replace('de_', '').title()} ({_format_interval(worst_map[1]['win_rate'])})")
+    
+    if player_stats:
+        top_fragger = max(player_stats.items(), key=lambda x: x[1]['kills_per_match'][1])
+        best_clutcher = max(player_stats.items(), key=lambda x: x[1]['clutch_rate'][1])
+        headshot_machine = max(player_stats.items(), key=lambda x: x[1]['headshot_rate'][1])
+        output.append(f"- _Top Fragger:_ {top_fragger[0]} ({_format_interval(top_fragger[1]['kills_per_match'], percent=False)} kills/match)")
+        output.append(f"- _Best Clutcher:_ {best_clutcher[0]} ({_format_interval(best_clutcher[1]['clutch_rate'])} clutches won)")
+        output.append(f"- _Headshot Machine:_ {headshot_machine[0]} ({_format_interval(headshot_machine[1]['headshot_rate'])} headshot rate)")
+    
+    if map_stats or player_stats:
         output.append("")
     
-    # Map Performance Table
-    output.append("## Map Performance")
-    output.append("")
-    output.append("| Map | Matches | Record | Win% | CT Win% | T Win% |")
-    output.append("| --- | ------- | ------ | ---- | ------- | ------ |")
+    output.append("| Map | Matches | Win% | CT Win% | T Win% |")
+    output.append("| --- | ------- | ---- | ------- | ------ |")
     
-    # Get round stats
-    round_stats = stats_dict.get('round_stats', {})
+    total_stats = intervals['total_stats']
+    output.append(f"| **All** | {total_stats['matches']} | {_format_interval(total_stats['win_rate'])} | {_format_interval(total_stats['ct'])} | {_format_interval(total_stats['t'])} |")
     
     # Sort maps by matches played (descending)
-    sorted_maps = sorted(map_stats.items(), key=lambda x: x[1]['total_matches'], reverse=True)
-    
-    for map_name, stats in sorted_maps:
-        matches = stats['total_matches']
-        won = stats['won']
-        lost = stats['lost']
-        tied = stats['tied']
-        map_win_rate = (won / matches * 100) if matches > 0 else 0
-        
-        # Get CT/T win rates for this map
-        map_round_stats = round_stats.get(map_name, {})
-        ct_rounds = map_round_stats.get('ctRoundsTotal', 0)
-        ct_wins = map_round_stats.get('ctRoundsWon', 0)
-        t_rounds = map_round_stats.get('tRoundsTotal', 0)
-        t_wins = map_round_stats.get('tRoundsWon', 0)
-        
-        ct_win_pct = (ct_wins / ct_rounds * 100) if ct_rounds > 0 else 0
-        t_win_pct = (t_wins / t_rounds * 100) if t_rounds > 0 else 0
-        
-        # Format map name with italic prefix
-        map_display = f"_{map_name}_"
-        
-        output.append(f"| {map_display} | {matches} | {won}W-{lost}L-{tied}T | {map_win_rate:.0f}% | {ct_win_pct:.0f}% | {t_win_pct:.0f}% |")
+    for map_name, stats in sorted(map_stats.items(), key=lambda x: x[1]['matches'], reverse=True):
+        output.append(f"| _{map_name}_ | {stats['matches']} | {_format_interval(stats['win_rate'])} | {_format_interval(stats['ct'])} | {_format_interval(stats['t'])} |")
+    
+    output.append("")
+    output.append("| Player | Matches | Kills/Match | K/D | Headshot% | Clutch% |")
+    output.append("| ------ | ------- | ----------- | --- | --------- | ------- |")
+    
+    # Sort players by matches played (descending)
+    for player_name, stats in sorted(player_stats.items(), key=lambda x: x[1]['matches'], reverse=True):
+        output.append(f"| _{player_name}_ | {stats['matches']} | {_format_interval(stats['kills_per_match'], percent=False)} | "
+                      f"{_format_interval(stats['kd'], percent=False)} | {_format_interval(stats['headshot_rate'])} | {_format_interval(stats['clutch_rate'])} |")
+    
+    output.append("")
     
+    return '\n'.join(output)
+
+
+def generate_formReport(form: Dict) -> str:
+    """
+    Formats the final rolling-window rates from track_form as a "Recent Form" markdown section,
+    each value followed by its change against the all-time rate
+    """
+    output = []
+    
+    window = []
+    if form['max_matches'] is not None:
+        window.append(f"last {form['max_matches']} matches")
+    if form['max_days'] is not None:
+        window.append(f"last {form['max_days']} days")
+    
+    output.append("## Recent Form")
+    output.append("")
+    output.append(f"_Rates over the {' within the '.join(window)}; changes are against all-time rates._")
     output.append("")
     
-    # Player Statistics Table
-    output.append("## Player Statistics")
+    def trend(rates: Dict, metric: str, fmt: str) -> str:
+        current = rates['window'][metric]
+        # Round first so a change that displays as zero is shown as +0, not -0
+        delta = round(current - rates['all_time'][metric], int(fmt[1])) + 0.0
+        return f"{current:{fmt}} ({delta:+{fmt}})"
+    
+    output.append("| Player | Matches | Kills/Match | K/D | Headshot% | Win% | CT Win% | T Win% |")
+    output.append("| ------ | ------- | ----------- | --- | --------- | ---- | ------- | ------ |")
+    
+    # Sort players by matches in the window (descending)
+    for player_name, rates in sorted(form['players'].items(), key=lambda x: x[1]['window']['window_matches'], reverse=True):
+        output.append(f"| _{player_name}_ | {rates['window']['window_matches']} | {trend(rates, 'kills_per_match', '.1f')} | "
+                      f"{trend(rates, 'kd', '.2f')} | {trend(rates, 'headshot_rate', '.1f')} | {trend(rates, 'win_rate', '.0f')} | "
+                      f"{trend(rates, 'ct_win_rate', '.0f')} | {trend(rates, 't_win_rate', '.0f')} |")
+    
+    output.append("")
+    output.append("| Map | Matches | Win% | CT Win% | T Win% |")
+    output.append("| --- | ------- | ---- | ------- | ------ |")
+    
+    for map_name, rates in sorted(form['maps'].items(), key=lambda x: x[1]['window']['window_matches'], reverse=True):
+        output.append(f"| _{map_name}_ | {rates['window']['window_matches']} | {trend(rates, 'win_rate', '.0f')} | "
+                      f"{trend(rates, 'ct_win_rate', '.0f')} | {trend(rates, 't_win_rate', '.0f')} |")
+    
+    output.append("")
+    
+    return '\n'.join(output)
+
+
+def generate_impactReport(impact: Dict[str, Dict]) -> str:
+    """
+    Formats the per-player impact figures from DemoArchive.player_impact as a "Player Impact" markdown section
+    """
+    output = []
+    
+    output.append("## Player Impact")
     output.append("")
-    output.append("| Player | Matches | KDA | K/D | Headshot% | MVPs | Clutch% |")
-    output.append("| ------ | ------- | --- | --- | --------- | ---- | ------- |")
+    output.append("| Player | Matches | ADR | KAST% | First Kills | First Deaths | Opening Win% | Utility Dmg |")
+    output.append("| ------ | ------- | --- | ----- | ----------- | ------------ | ------------ | ----------- |")
+    
+    def value(stats: Dict, metric: str, fmt: str) -> str:
+        # Fields missing from the export are shown as "-"
+        return "-" if stats[metric] is None else f"{stats[metric]:{fmt}}"
     
     # Sort players by matches played (descending)
-    sorted_players = sorted(player_stats.items(), key=lambda x: x[1]['matches'], reverse=True)
-    
-    for player_name, stats in sorted_players:
-        matches = stats['matches']
-        kills = stats['kills']
-        deaths = stats['deaths']
-        assists = stats['assists']
-        kd_ratio = kills / deaths if deaths > 0 else kills
-        hs_percentage = (stats['headshots'] / kills * 100) if kills > 0 else 0
-        
-        # Clutch statistics
-        total_clutches = sum([stats['vsOneCount'], stats['vsTwoCount'], stats['vsThreeCount'], 
-                             stats['vsFourCount'], stats['vsFiveCount']])
-        total_clutch_wins = sum([stats['vsOneWon'], stats['vsTwoWon'], stats['vsThreeWon'], 
-                                stats['vsFourWon'], stats['vsFiveWon']])
-        clutch_success_rate = (total_clutch_wins / total_clutches * 100) if total_clutches > 0 else 0
-        player_display = f"_{player_name}_"
-        
-        output.append(f"| {player_display} | {matches} | {kills}/{deaths}/{assists} | {kd_ratio:.2f} | {hs_percentage:.1f}% | {stats['mvp']} | {clutch_success_rate:.1f}% |")
-        
+    for player_name, stats in sorted(impact.items(), key=lambda x: x[1]['matches'], reverse=True):
+        output.append(f"| _{player_name}_ | {stats['matches']} | {value(stats, 'adr', '.1f')} | {value(stats, 'kast', '.1f')} | "
+                      f"{value(stats, 'first_kills', '.2f')} | {value(stats, 'first_deaths', '.2f')} | "
+                      f"{value(stats, 'opening_rate', '.0f')} | {value(stats, 'utility_damage', '.1f')} |")
+    
     output.append("")
     
-    # Add Side Performance Summary if round stats exist
-    if round_stats:
-        output.append("## Side Performance Summary")
+    return '\n'.join(output)
+
+
+def generate_headToHeadReport(teams: List[Dict], players: List[Dict], min_matches: int, top: int = 10) -> str:
+    """
+    Formats the ranked opponents from rank_opponents as a "Head-to-Head" markdown section
+    """
+    output = []
+    
+    output.append("## Head-to-Head")
+    output.append("")
+    output.append(f"_Opponents faced in at least {min_matches} matches, most frequent first; CT/T rates are our rounds against them._")
+    output.append("")
+    
+    for title, opponents in (("Teams", teams), ("Players", players)):
+        output.append(f"### {title}")
         output.append("")
-        output.append("| Map | CT Rounds | CT Win% | T Rounds | T Win% | Side Preference |")
-        output.append("| --- | --------- | ------- | -------- | ------ | --------------- |")
         
-        for map_name, stats in sorted_maps:
-            map_round_stats = round_stats.get(map_name, {})
-            ct_rounds = map_round_stats.get('ctRoundsTotal', 0)
-            ct_wins = map_round_stats.get('ctRoundsWon', 0)
-            t_rounds = map_round_stats.get('tRoundsTotal', 0)
-            t_wins = map_round_stats.get('tRoundsWon', 0)
+        if not opponents:
+            output.append("No opponent reached the minimum number of matches.")
+            output.append("")
+            continue
+        
+        output.append(f"| {title[:-1]} | Matches | Record | Win% | CT Win% | T Win% | Maps |")
+        output.append(f"| {'-' * (len(title) - 1)} | ------- | ------ | ---- | ------- | ------ | ---- |")
+        
+        for opponent in opponents[:top]:
+            stats = opponent['total_stats']
+            matches = stats['total_matches']
+            win_rate = stats['won'] / matches * 100 if matches > 0 else 0
+            ct_win_pct = (stats['ctRoundsWon'] / stats['ctRoundsTotal'] * 100) if stats['ctRoundsTotal'] > 0 else 0
+            t_win_pct = (stats['tRoundsWon'] / stats['tRoundsTotal'] * 100) if stats['tRoundsTotal'] > 0 else 0
             
-            if ct_rounds > 0 or t_rounds > 0:
-                ct_win_pct = (ct_wins / ct_rounds * 100) if ct_rounds > 0 else 0
-                t_win_pct = (t_wins / t_rounds * 100) if t_rounds > 0 else 0
-                
-                # Determine side preference
-                if ct_win_pct > t_win_pct + 5:
-                    preference = "CT-sided"
-                elif t_win_pct > ct_win_pct + 5:
-                    preference = "T-sided"
-                else:
-                    preference = "Balanced"
-                
-                map_display = f"_{map_name}_"
-                output.append(f"| {map_display} | {ct_wins}/{ct_rounds} | {ct_win_pct:.0f}% | {t_wins}/{t_rounds} | {t_win_pct:.0f}% | {preference} |")
+            # Map split, most played first
+            map_split = ", ".join(
+                f"{map_name.replace('de_', '').title()} {map_stats['won']}-{map_stats['lost']}-{map_stats['tied']}"
+                for map_name, map_stats in sorted(opponent['map_stats'].items(), key=lambda x: x[1]['total_matches'], reverse=True)
+            )
+            output.append(f"| _{opponent['name']}_ | {matches} | {stats['won']}W-{stats['lost']}L-{stats['tied']}T | {win_rate:.0f}% | {ct_win_pct:.0f}% | {t_win_pct:.0f}% | {map_split} |")
         
         output.append("")
     
-    return '\n'.join(output)
\ No newline at end of file
+    return '\n'.join(output)
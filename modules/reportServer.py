@@ -0,0 +1,301 @@
+import asyncio
+import datetime
+import json
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from modules.demoExtractor import load_demoFiles
+from modules.demoIndex import meta_selected
+from modules.demoSource import find_demoFiles, source_stat
+from modules.playerFilter import filter_match
+from modules.reportGenerator import generate_report
+from modules.statsAnalyzer import analyze_stats
+
+
+class QueryError(Exception):
+    """
+    Raised for malformed query parameters; answered with 400 Bad Request
+    """
+
+
+def parse_query(query_string: str) -> Tuple[str, Optional[Tuple[str, ...]], Optional[datetime.date], Optional[datetime.date]]:
+    """
+    Parses ?player=...&map=...&since=YYYY-MM-DD&until=YYYY-MM-DD into a hashable cache key.
+    map may be repeated or comma-separated.
+    """
+    params = parse_qs(query_string)
+    player = params.get("player", [""])[-1]
+    if not player:
+        raise QueryError("missing 'player' parameter")
+
+    maps = sorted({name for value in params.get("map", []) for name in value.split(",") if name})
+
+    dates = []
+    for key in ("since", "until"):
+        value = params.get(key, [""])[-1]
+        try:
+            dates.append(datetime.date.fromisoformat(value) if value else None)
+        except ValueError:
+            raise QueryError(f"invalid {key} '{value}', expected YYYY-MM-DD")
+    since, until = dates
+    if since and until and since > until:
+        raise QueryError(f"since {since} is after until {until}")
+
+    return player, tuple(maps) or None, since, until
+
+
+class DemoLibrary:
+    """
+    The filtered matches of an input directory, kept in memory and refreshed file by file when it changes
+    """
+
+    def __init__(self, input_dir: str, file_pattern: str, player_mapping: Dict[str, str],
+                 jobs: int = 1, streaming: bool = False):
+        self.input_dir = input_dir
+        self.file_pattern = file_pattern
+        self.player_mapping = player_mapping
+        self.jobs = jobs
+        self.streaming = streaming
+
+        self.signatures = {}   # path -> (size, mtime) of the loaded version
+        self.failed = {}       # path -> (size, mtime) of a version that could not be parsed yet
+        self.results = {}      # path -> (match name, filtered match)
+        self.matches = {}      # match name -> filtered match, in file order like extract_demoData
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Returns the (size, mtime) signature of every matching file
+        """
+        snapshot = {}
+        for file_path in find_demoFiles(self.input_dir, self.file_pattern):
+            try:
+                stat = source_stat(file_path)
+            except OSError:
+                continue
+            snapshot[file_path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def changed(self, snapshot: Dict[str, Tuple[int, int]]) -> bool:
+        """
+        Checks whether the directory differs from the loaded state, ignoring unchanged broken files
+        """
+        if any(file_path not in snapshot for file_path in self.signatures):
+            return True
+        return any(
+            self.signatures.get(file_path) != signature and self.failed.get(file_path) != signature
+            for file_path, signature in snapshot.items()
+        )
+
+    def refresh(self, snapshot: Dict[str, Tuple[int, int]]) -> Dict[str, Dict]:
+        """
+        Parses new or changed files, forgets removed ones and rebuilds the match dictionary.
+        The previous dictionary is left untouched so queries already running keep a consistent view.
+        """
+        for file_path in [file_path for file_path in self.signatures if file_path not in snapshot]:
+            del self.signatures[file_path]
+            self.results.pop(file_path, None)
+        for file_path in [file_path for file_path in self.failed if file_path not in snapshot]:
+            del self.failed[file_path]
+
+        pending = [
+            file_path for file_path, signature in snapshot.items()
+            if self.signatures.get(file_path) != signature and self.failed.get(file_path) != signature
+        ]
+        for file_path, (result, error) in zip(pending, load_demoFiles(pending, self.jobs, self.streaming)):
+            if error is not None:
+                print(f"Skipping {file_path} until it changes: {error}")
+                self.failed[file_path] = snapshot[file_path]
+                self.signatures.pop(file_path, None)
+                self.results.pop(file_path, None)
+                continue
+
+            match_name, match = result
+            self.failed.pop(file_path, None)
+            self.signatures[file_path] = snapshot[file_path]
+            self.results[file_path] = (match_name, filter_match(match, self.player_mapping))
+
+        matches = {}
+        for file_path in snapshot:
+            if file_path in self.results:
+                match_name, match = self.results[file_path]
+                matches[match_name] = match
+        self.matches = matches
+        return matches
+
+
+def compute_stats(matches: Dict[str, Dict], player: str, maps: Optional[Tuple[str, ...]],
+                  since: Optional[datetime.date], until: Optional[datetime.date]) -> Dict:
+    """
+    Analyzes the matches passing the map and date filters for one focus player
+    """
+    if maps or since or until:
+        matches = {
+            match_name: match for match_name, match in matches.items()
+            if meta_selected({"date": match["date"], "map": match["map"]}, since, until, maps)
+        }
+    return analyze_stats(matches, player)
+
+
+class ReportServer:
+    """
+    Serves reports over HTTP from an in-memory demo library.
+    GET /report returns the markdown report, GET /stats the stats dictionary as JSON.
+    Results are cached per query (LRU) and dropped whenever the input directory changes;
+    concurrent requests for the same uncached query share one computation.
+    """
+
+    def __init__(self, library: DemoLibrary, cache_entries: int = 64, poll_interval: float = 2.0):
+        self.library = library
+        self.cache_entries = cache_entries
+        self.poll_interval = poll_interval
+        self.generation = 0
+        self.cache = OrderedDict()   # (generation, path, query) -> response body
+        self.inflight = {}           # (generation, path, query) -> asyncio.Future
+        self.hits = 0
+        self.misses = 0
+
+    async def load(self) -> None:
+        loop = asyncio.get_running_loop()
+        snapshot = await loop.run_in_executor(None, self.library.scan)
+        await loop.run_in_executor(None, self.library.refresh, snapshot)
+
+    async def poll(self) -> None:
+        """
+        Rescans the input directory and invalidates cached results when it changed
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            snapshot = await loop.run_in_executor(None, self.library.scan)
+            if not self.library.changed(snapshot):
+                continue
+
+            matches = await loop.run_in_executor(None, self.library.refresh, snapshot)
+            self.generation += 1
+            self.cache.clear()
+            print(f"[{datetime.datetime.now():%H:%M:%S}] Input changed, {len(matches)} matches loaded; cache cleared")
+
+    def _render(self, matches: Dict[str, Dict], path: str, query: Tuple) -> bytes:
+        stats = compute_stats(matches, *query)
+        if path == "/stats":
+            return json.dumps(stats, indent=2).encode("utf-8")
+        return generate_report(stats).encode("utf-8")
+
+    async def get(self, path: str, query: Tuple) -> bytes:
+        """
+        Returns the response body for a query, from the cache, a computation already running, or a new one
+        """
+        key = (self.generation, path, query)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return self.cache[key]
+
+        future = self.inflight.get(key)
+        if future is not None:
+            self.hits += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.inflight[key] = future
+        try:
+            body = await loop.run_in_executor(None, self._render, self.library.matches, path, query)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting for it
+            future.exception()
+            raise
+        finally:
+            del self.inflight[key]
+
+        future.set_result(body)
+        # Results computed against a library that changed in the meantime are not cached
+        if key[0] == self.generation:
+            self.cache[key] = body
+            while len(self.cache) > self.cache_entries:
+                self.cache.popitem(last=False)
+        return body
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            while True:
+                header = await reader.readline()
+                if header in (b"\r\n", b"\n", b""):
+                    break
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) != 3:
+                await self.respond(writer, HTTPStatus.BAD_REQUEST, b"Malformed request line\n")
+                return
+            method, target, _ = parts
+            if method not in ("GET", "HEAD"):
+                await self.respond(writer, HTTPStatus.METHOD_NOT_ALLOWED, b"Only GET is supported\n")
+                return
+
+            url = urlsplit(target)
+            if url.path not in ("/report", "/stats"):
+                await self.respond(writer, HTTPStatus.NOT_FOUND, b"Try /report or /stats\n")
+                return
+
+            try:
+                query = parse_query(url.query)
+            except QueryError as e:
+                await self.respond(writer, HTTPStatus.BAD_REQUEST, f"{e}\n".encode("utf-8"))
+                return
+
+            try:
+                body = await self.get(url.path, query)
+            except Exception as e:
+                print(f"Error serving {target}: {e}")
+                await self.respond(writer, HTTPStatus.INTERNAL_SERVER_ERROR, b"Error during analysis\n")
+                return
+
+            content_type = "application/json" if url.path == "/stats" else "text/markdown; charset=utf-8"
+            await self.respond(writer, HTTPStatus.OK, body, content_type, head=method == "HEAD")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer: asyncio.StreamWriter, status: HTTPStatus, body: bytes,
+                      content_type: str = "text/plain; charset=utf-8", head: bool = False) -> None:
+        headers = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(headers.encode("latin-1"))
+        if not head:
+            writer.write(body)
+        await writer.drain()
+
+    async def serve(self, host: str, port: int) -> None:
+        await self.load()
+        print(f"Loaded {len(self.library.matches)} matches from '{self.library.input_dir}'")
+
+        server = await asyncio.start_server(self.handle, host, port)
+        poller = asyncio.ensure_future(self.poll())
+        print(f"Serving reports on http://{host}:{port}/report?player=NAME (Ctrl+C to stop)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            poller.cancel()
+
+
+def run_server(library: DemoLibrary, host: str = "127.0.0.1", port: int = 8080,
+               cache_entries: int = 64, poll_interval: float = 2.0) -> None:
+    """
+    Runs the report server until interrupted
+    """
+    server = ReportServer(library, cache_entries=cache_entries, poll_interval=poll_interval)
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        print("Report server stopped.")
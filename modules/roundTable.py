@@ -0,0 +1,136 @@
+from collections import defaultdict
+from itertools import chain, repeat
+from operator import itemgetter
+from typing import Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; analyze_allPlayers falls back to the Python round loop
+    np = None
+
+
+# 2 = CT, 3 = T; anything else is an unknown side and is ignored like in the Python loop
+SIDE_CODES = {2: 2, 3: 3}
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def _side_column(rounds: list, key: str) -> "np.ndarray":
+    try:
+        sides = list(map(itemgetter(key), rounds))
+    except KeyError:
+        sides = [round_data.get(key) for round_data in rounds]
+    return np.fromiter(map(SIDE_CODES.get, sides, repeat(0)), np.int8, len(sides))
+
+
+def build_roundTable(matches: Dict) -> Tuple[Dict, list]:
+    """
+    Packs the rounds of every match into columnar arrays:
+    map id, teamASide/teamBSide codes and winner flags per round, plus the round count, map id and
+    known-side flags of every match.
+    Each column is filled straight from the round dicts with C-level iterators, without a Python loop per round.
+    The table does not depend on the focus player, so it can be built once and reused.
+    Returns the columns and the map names indexed by map id.
+    """
+    map_ids = {}
+    match_map = [map_ids.setdefault(match["map"], len(map_ids)) for match in matches.values()]
+    rounds_lists = [match.get("rounds", []) for match in matches.values()]
+    rounds = list(chain.from_iterable(rounds_lists))
+
+    match_rounds = np.fromiter(map(len, rounds_lists), np.int64, len(rounds_lists))
+    match_map = np.array(match_map, dtype=np.int32)
+
+    # Winner names are numbered on first sight; a team wins the rounds carrying its number
+    name_ids = defaultdict()
+    name_ids.default_factory = name_ids.__len__
+    try:
+        winners = list(map(itemgetter("winnerTeamName"), rounds))
+    except KeyError:
+        winners = [round_data.get("winnerTeamName", "") for round_data in rounds]
+    winner_id = np.fromiter(map(name_ids.__getitem__, winners), np.int64, len(winners))
+    teamA_id = np.array([name_ids[match["teamA"]["name"]] for match in matches.values()], dtype=np.int64)
+    teamB_id = np.array([name_ids[match["teamB"]["name"]] for match in matches.values()], dtype=np.int64)
+
+    columns = {
+        "match_rounds": match_rounds,
+        "match_map": match_map,
+        "map_id": np.repeat(match_map, match_rounds),
+        "teamASide": _side_column(rounds, "teamASide"),
+        "teamBSide": _side_column(rounds, "teamBSide"),
+        "wonA": winner_id == np.repeat(teamA_id, match_rounds),
+        "wonB": winner_id == np.repeat(teamB_id, match_rounds),
+    }
+
+    # Per match: whether team A / team B has any round on a known side
+    for key, side_column in (("sidesA", "teamASide"), ("sidesB", "teamBSide")):
+        has_sides = np.zeros(len(match_rounds), dtype=bool)
+        played = match_rounds > 0
+        if played.any():
+            starts = (np.cumsum(match_rounds) - match_rounds)[played]
+            has_sides[played] = np.logical_or.reduceat(columns[side_column] != 0, starts)
+        columns[key] = has_sides
+
+    return columns, list(map_ids)
+
+
+def focus_letter(match: Dict, focusPlayer: str) -> int:
+    """
+    Focus team code of a match (1 = A, 2 = B, 0 = unknown), following the round side rules of MatchContext
+    """
+    player_data = match["players"].get(focusPlayer)
+    if player_data is None:
+        return 0
+    player_team_name = player_data.get("teamName")
+    if player_team_name == match["teamA"]["name"] or player_team_name == "Team A":
+        return 1
+    if player_team_name == match["teamB"]["name"] or player_team_name == "Team B":
+        return 2
+    return 0
+
+
+def aggregate_roundStats(matches: Dict, focusPlayer: str, table: Optional[Tuple[Dict, list]] = None) -> Tuple[Dict, Dict]:
+    """
+    Computes round_stats and the CT/T counters of total_stats with vectorised group-bys.
+    Pass a table from build_roundTable(matches) to reuse it across focus players.
+    """
+    columns, map_names = table if table is not None else build_roundTable(matches)
+    map_count = len(map_names)
+
+    # Focus team per match, expanded to its rounds; rounds of an unknown team or side are not counted
+    letters = np.array([focus_letter(match, focusPlayer) for match in matches.values()], dtype=np.int8)
+    on_a = np.repeat(letters == 1, columns["match_rounds"])
+    side = np.where(on_a, columns["teamASide"], columns["teamBSide"])
+    won = np.where(on_a, columns["wonA"], columns["wonB"])
+    counted = (side != 0) & np.repeat(letters != 0, columns["match_rounds"])
+
+    # One group-by over (map, side, won): columns are CT lost, CT won, T lost, T won
+    groups = columns["map_id"][counted] * 4 + (side[counted] == 3) * 2 + won[counted]
+    counts = np.bincount(groups, minlength=map_count * 4).reshape(map_count, 4)
+    ct_won = counts[:, 1]
+    ct_total = counts[:, 0] + ct_won
+    t_won = counts[:, 3]
+    t_total = counts[:, 2] + t_won
+
+    # Keep maps in the order of the first match with a counted round, like the Python loop
+    match_counted = ((letters == 1) & columns["sidesA"]) | ((letters == 2) & columns["sidesB"])
+    counted_maps, first_matches = np.unique(columns["match_map"][match_counted], return_index=True)
+    ordered_maps = counted_maps[np.argsort(first_matches, kind="stable")]
+
+    round_stats = {}
+    for map_index in ordered_maps:
+        round_stats[map_names[map_index]] = {
+            "ctRoundsTotal": int(ct_total[map_index]),
+            "ctRoundsWon": int(ct_won[map_index]),
+            "tRoundsTotal": int(t_total[map_index]),
+            "tRoundsWon": int(t_won[map_index])
+        }
+
+    totals = {
+        "ctRoundsTotal": int(ct_total.sum()),
+        "ctRoundsWon": int(ct_won.sum()),
+        "tRoundsTotal": int(t_total.sum()),
+        "tRoundsWon": int(t_won.sum())
+    }
+    return round_stats, totals
@@ -0,0 +1,223 @@
+from typing import Dict
+
+
+CLUTCH_NAMES = ("One", "Two", "Three", "Four", "Five")
+# Clutch situations tracked per player: 1 to 5 enemies left
+CLUTCH_SIZES = len(CLUTCH_NAMES)
+
+
+class _Counters:
+    """
+    Base for fixed-layout counter records. FIELDS pairs each slot with its key in the stats dictionaries.
+    """
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init__(self):
+        for slot, _ in self.FIELDS:
+            setattr(self, slot, 0)
+
+    def merge(self, other: "_Counters", sign: int = 1) -> "_Counters":
+        for slot, _ in self.FIELDS:
+            setattr(self, slot, getattr(self, slot) + sign * getattr(other, slot))
+        return self
+
+    def is_empty(self) -> bool:
+        return not any(getattr(self, slot) for slot, _ in self.FIELDS)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {key: getattr(self, slot) for slot, key in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, int]) -> "_Counters":
+        counters = cls()
+        for slot, key in cls.FIELDS:
+            setattr(counters, slot, values.get(key, 0))
+        return counters
+
+
+class MapAccumulator(_Counters):
+    __slots__ = ("total_matches", "won", "lost", "tied", "total_rounds")
+    FIELDS = (("total_matches", "total_matches"), ("won", "won"), ("lost", "lost"), ("tied", "tied"),
+              ("total_rounds", "total_rounds"))
+
+
+class RoundAccumulator(_Counters):
+    __slots__ = ("ct_total", "ct_won", "t_total", "t_won")
+    FIELDS = (("ct_total", "ctRoundsTotal"), ("ct_won", "ctRoundsWon"),
+              ("t_total", "tRoundsTotal"), ("t_won", "tRoundsWon"))
+
+    def add(self, ct_total: int, ct_won: int, t_total: int, t_won: int) -> None:
+        self.ct_total += ct_total
+        self.ct_won += ct_won
+        self.t_total += t_total
+        self.t_won += t_won
+
+
+class TotalAccumulator(_Counters):
+    __slots__ = MapAccumulator.__slots__ + RoundAccumulator.__slots__
+    FIELDS = MapAccumulator.FIELDS + RoundAccumulator.FIELDS
+
+    add = RoundAccumulator.add
+
+
+class PlayerAccumulator:
+    """
+    Per-player totals; clutch attempts and wins are CLUTCH_SIZES-long lists indexed by enemy count - 1
+    """
+    __slots__ = ("matches", "kills", "assists", "deaths", "mvp", "headshots", "clutch_count", "clutch_won")
+
+    def __init__(self):
+        self.matches = 0
+        self.kills = 0
+        self.assists = 0
+        self.deaths = 0
+        self.mvp = 0
+        self.headshots = 0
+        self.clutch_count = [0] * CLUTCH_SIZES
+        self.clutch_won = [0] * CLUTCH_SIZES
+
+    def add_line(self, player: Dict) -> None:
+        """
+        Adds one match's player line from the demo export
+        """
+        # Basics
+        self.matches += 1
+        self.kills += player["killCount"]
+        self.assists += player["assistCount"]
+        self.deaths += player["deathCount"]
+        self.mvp += player["mvpCount"]
+        self.headshots += player["headshotCount"]
+
+        # Per Round / Match stats (commented out as not in current data)
+        #self.utility_damage += player["utilityDamage"]
+        #self.kast += player["kast"]
+        #self.adr += player["averageDamagePerRound"]
+        #self.first_kills += player["firstKillCount"]
+
+        # Clutches
+        clutch_count = self.clutch_count
+        clutch_won = self.clutch_won
+        clutch_count[0] += player["vsOneCount"]
+        clutch_won[0] += player["vsOneWonCount"]
+        clutch_count[1] += player["vsTwoCount"]
+        clutch_won[1] += player["vsTwoWonCount"]
+        clutch_count[2] += player["vsThreeCount"]
+        clutch_won[2] += player["vsThreeWonCount"]
+        clutch_count[3] += player["vsFourCount"]
+        clutch_won[3] += player["vsFourWonCount"]
+        clutch_count[4] += player["vsFiveCount"]
+        clutch_won[4] += player["vsFiveWonCount"]
+
+    def merge(self, other: "PlayerAccumulator", sign: int = 1) -> "PlayerAccumulator":
+        self.matches += sign * other.matches
+        self.kills += sign * other.kills
+        self.assists += sign * other.assists
+        self.deaths += sign * other.deaths
+        self.mvp += sign * other.mvp
+        self.headshots += sign * other.headshots
+        for index in range(CLUTCH_SIZES):
+            self.clutch_count[index] += sign * other.clutch_count[index]
+            self.clutch_won[index] += sign * other.clutch_won[index]
+        return self
+
+    def is_empty(self) -> bool:
+        return not (self.matches or self.kills or self.assists or self.deaths or self.mvp or self.headshots
+                    or any(self.clutch_count) or any(self.clutch_won))
+
+    def to_dict(self) -> Dict[str, int]:
+        stats = {
+            'matches': self.matches,
+            'kills': self.kills, 'assists': self.assists, 'deaths': self.deaths,
+            'mvp': self.mvp, 'headshots': self.headshots
+        }
+        for index, name in enumerate(CLUTCH_NAMES):
+            stats[f"vs{name}Count"] = self.clutch_count[index]
+            stats[f"vs{name}Won"] = self.clutch_won[index]
+        return stats
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, int]) -> "PlayerAccumulator":
+        player = cls()
+        player.matches = values.get('matches', 0)
+        player.kills = values.get('kills', 0)
+        player.assists = values.get('assists', 0)
+        player.deaths = values.get('deaths', 0)
+        player.mvp = values.get('mvp', 0)
+        player.headshots = values.get('headshots', 0)
+        for index, name in enumerate(CLUTCH_NAMES):
+            player.clutch_count[index] = values.get(f"vs{name}Count", 0)
+            player.clutch_won[index] = values.get(f"vs{name}Won", 0)
+        return player
+
+
+class StatsAccumulator:
+    """
+    All counters behind the stats dictionary: per-map, per-map rounds, per-player and overall totals
+    """
+    __slots__ = ("maps", "rounds", "players", "total")
+
+    def __init__(self):
+        self.maps = {}
+        self.rounds = {}
+        self.players = {}
+        self.total = TotalAccumulator()
+
+    def map(self, map_name: str) -> MapAccumulator:
+        accumulator = self.maps.get(map_name)
+        if accumulator is None:
+            accumulator = self.maps[map_name] = MapAccumulator()
+        return accumulator
+
+    def round(self, map_name: str) -> RoundAccumulator:
+        accumulator = self.rounds.get(map_name)
+        if accumulator is None:
+            accumulator = self.rounds[map_name] = RoundAccumulator()
+        return accumulator
+
+    def player(self, player_name: str) -> PlayerAccumulator:
+        accumulator = self.players.get(player_name)
+        if accumulator is None:
+            accumulator = self.players[player_name] = PlayerAccumulator()
+        return accumulator
+
+    def merge(self, other: "StatsAccumulator", sign: int = 1) -> "StatsAccumulator":
+        """
+        Adds (sign=1) or subtracts (sign=-1) another accumulator.
+        Entries whose counters all drop to zero are removed, matching a full recompute.
+        """
+        for mine, theirs, factory in ((self.maps, other.maps, MapAccumulator),
+                                      (self.rounds, other.rounds, RoundAccumulator),
+                                      (self.players, other.players, PlayerAccumulator)):
+            for name, accumulator in theirs.items():
+                target = mine.get(name)
+                if target is None:
+                    target = mine[name] = factory()
+                target.merge(accumulator, sign)
+                if target.is_empty():
+                    del mine[name]
+        self.total.merge(other.total, sign)
+        return self
+
+    def to_dict(self) -> Dict:
+        """
+        Converts to the stats dictionary consumed by generate_report
+        """
+        return {
+            "map_stats": {name: accumulator.to_dict() for name, accumulator in self.maps.items()},
+            "round_stats": {name: accumulator.to_dict() for name, accumulator in self.rounds.items()},
+            "player_stats": {name: accumulator.to_dict() for name, accumulator in self.players.items()},
+            "total_stats": self.total.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, stats_dict: Dict) -> "StatsAccumulator":
+        stats = cls()
+        stats.maps = {name: MapAccumulator.from_dict(values)
+                      for name, values in stats_dict.get("map_stats", {}).items()}
+        stats.rounds = {name: RoundAccumulator.from_dict(values)
+                        for name, values in stats_dict.get("round_stats", {}).items()}
+        stats.players = {name: PlayerAccumulator.from_dict(values)
+                         for name, values in stats_dict.get("player_stats", {}).items()}
+        stats.total = TotalAccumulator.from_dict(stats_dict.get("total_stats", {}))
+        return stats
@@ -1,143 +1,199 @@
-from typing import Dict
-from collections import defaultdict
-from modules.determineOutcome import determine_outcome
-from modules.determinePlayside import determine_playerTeamSide
+from typing import Dict, Iterable, List, Tuple
+from modules.matchContext import build_matchContext
+from modules.roundTable import aggregate_roundStats, build_roundTable, numpy_available
+from modules.statAccumulators import MapAccumulator, RoundAccumulator, StatsAccumulator
 
 
-def analyze_stats(matches: Dict, focusPlayer: str) -> Dict:
+def count_focusRounds(match: Dict, context, rounds: Dict[str, RoundAccumulator], total) -> None:
     """
-    Analyzes match statistics
+    Adds the focus player's CT/T rounds of one match to the per-map round accumulators and the totals
     """
-    map_stats = defaultdict(lambda: {
-        'total_matches': 0,
-        'won': 0, 'lost': 0, 'tied': 0,
-        'total_rounds': 0
-    })
-    
-    # Initialize round stats
-    round_stats = defaultdict(lambda: {
-        'ctRoundsTotal': 0,
-        'ctRoundsWon': 0,
-        'tRoundsTotal': 0,
-        'tRoundsWon': 0
-    })
-    
-    player_stats = defaultdict(lambda: {
-        'matches': 0,
-        'kills': 0, 'assists': 0, 'deaths': 0,
-        'mvp': 0, 'headshots': 0,
-        'vsOneCount': 0, 'vsOneWon': 0,
-        'vsTwoCount': 0, 'vsTwoWon': 0,
-        'vsThreeCount': 0, 'vsThreeWon': 0,
-        'vsFourCount': 0, 'vsFourWon': 0,
-        'vsFiveCount': 0, 'vsFiveWon': 0
-    })
-    
-    total_stats = {
-        'total_matches': 0,
-        'won': 0, 'lost': 0, 'tied': 0,
-        'total_rounds': 0,
-        'ctRoundsTotal': 0,
-        'ctRoundsWon': 0,
-        'tRoundsTotal': 0,
-        'tRoundsWon': 0
-    }
-    
+    if "rounds" not in match or context.side_key is None:
+        return
+
+    side_key = context.side_key
+    team_name = context.team_name
+    ct_total = ct_won = t_total = t_won = 0
+
+    # Process each round (side 2 = CT, 3 = T in CS2)
+    for round_data in match["rounds"]:
+        side = round_data.get(side_key)
+
+        if side == 2:
+            ct_total += 1
+            if round_data.get("winnerTeamName", "") == team_name:
+                ct_won += 1
+        elif side == 3:
+            t_total += 1
+            if round_data.get("winnerTeamName", "") == team_name:
+                t_won += 1
+
+    if ct_total or t_total:
+        map_rounds = rounds.get(match["map"])
+        if map_rounds is None:
+            map_rounds = rounds[match["map"]] = RoundAccumulator()
+        map_rounds.add(ct_total, ct_won, t_total, t_won)
+        total.add(ct_total, ct_won, t_total, t_won)
+
+
+def accumulate_matches(match_items: Iterable[Tuple[str, Dict]], focusPlayer: str,
+                       count_rounds: bool = True) -> StatsAccumulator:
+    """
+    Folds (match name, match) pairs into a StatsAccumulator, consuming them one at a time
+    """
+    stats = StatsAccumulator()
+    total = stats.total
+
     # Process matches
-    for match_name, match in matches.items():
-        map_name = match["map"]
-    
+    for match_name, match in match_items:
+        map_stats = stats.map(match["map"])
+        match_rounds = match["teamA"]["score"] + match["teamB"]["score"]
+
         # Process general map statistics
-        map_stats[map_name]["total_matches"] += 1
-        map_stats[map_name]["total_rounds"] += (match["teamA"]["score"] + match["teamB"]["score"])
-        total_stats["total_matches"] += 1
-        total_stats["total_rounds"] += (match["teamA"]["score"] + match["teamB"]["score"])
-        
-        outcome = determine_outcome(match, focusPlayer)
+        map_stats.total_matches += 1
+        map_stats.total_rounds += match_rounds
+        total.total_matches += 1
+        total.total_rounds += match_rounds
+
+        context = build_matchContext(match, focusPlayer)
+        outcome = context.outcome(match)
         if outcome == "Win":
-            map_stats[map_name]["won"] += 1
-            total_stats["won"] += 1
+            map_stats.won += 1
+            total.won += 1
         elif outcome == "Loss":
-            map_stats[map_name]["lost"] += 1
-            total_stats["lost"] += 1
+            map_stats.lost += 1
+            total.lost += 1
         elif outcome == "Tie":
-            map_stats[map_name]["tied"] += 1
-            total_stats["tied"] += 1
-            
+            map_stats.tied += 1
+            total.tied += 1
+
         # Process round statistics
-        if "rounds" in match:
-            # Process each round
-            for round_data in match["rounds"]:
-                player_team_letter, side = determine_playerTeamSide(match, round_data, focusPlayer)
-                
-                if not player_team_letter or not side:
-                    continue
-                
-                # Determine if focus player's team won
-                winner_team_name = round_data.get("winnerTeamName", "")
-                player_won = False
-                
-                if player_team_letter == "A" and winner_team_name == match["teamA"]["name"]:
-                    player_won = True
-                elif player_team_letter == "B" and winner_team_name == match["teamB"]["name"]:
-                    player_won = True
-                
-                # Update statistics based on side
-                if side == "CT":
-                    round_stats[map_name]["ctRoundsTotal"] += 1
-                    total_stats["ctRoundsTotal"] += 1
-                    
-                    if player_won:
-                        round_stats[map_name]["ctRoundsWon"] += 1
-                        total_stats["ctRoundsWon"] += 1
-                        
-                elif side == "T":
-                    round_stats[map_name]["tRoundsTotal"] += 1
-                    total_stats["tRoundsTotal"] += 1
-                    
-                    if player_won:
-                        round_stats[map_name]["tRoundsWon"] += 1
-                        total_stats["tRoundsWon"] += 1
-            
+        if count_rounds:
+            count_focusRounds(match, context, stats.rounds, total)
+
         # Process players statistics
         for player_name, player in match["players"].items():
-            stats = player_stats[player_name]
-            
-            # Basics
-            stats["matches"] += 1
-            stats["kills"] += player["killCount"]
-            stats["assists"] += player["assistCount"]
-            stats["deaths"] += player["deathCount"]
-            stats["mvp"] += player["mvpCount"]
-            stats["headshots"] += player["headshotCount"]
-            
-            # Per Round / Match stats (commented out as not in current data)
-            #stats["utilityDamage"] += player["utilityDamage"]
-            #stats["kast"] += player["kast"]
-            #stats["hltv1"] += player["hltvRating"]
-            #stats["hltv2"] += player["hltvRating2"]
-            #stats["adr"] += player["averageDamagePerRound"]
-            #stats["firstKills"] += player["firstKillCount"]
-            #stats["firstDeaths"] += player["firstDeathCount"]
-            
-            # Clutches
-            stats["vsOneCount"] += player["vsOneCount"]
-            stats["vsOneWon"] += player["vsOneWonCount"]
-            stats["vsTwoCount"] += player["vsTwoCount"]
-            stats["vsTwoWon"] += player["vsTwoWonCount"]
-            stats["vsThreeCount"] += player["vsThreeCount"]
-            stats["vsThreeWon"] += player["vsThreeWonCount"]
-            stats["vsFourCount"] += player["vsFourCount"]
-            stats["vsFourWon"] += player["vsFourWonCount"]
-            stats["vsFiveCount"] += player["vsFiveCount"]
-            stats["vsFiveWon"] += player["vsFiveWonCount"]
-            
-    
-    output = {
-        "map_stats": dict(map_stats),
-        "round_stats": dict(round_stats),
-        "player_stats": dict(player_stats),
-        "total_stats": dict(total_stats)
-    }
-    
-    return output
\ No newline at end of file
+            stats.player(player_name).add_line(player)
+
+    return stats
+
+
+def analyze_matchStream(match_items: Iterable[Tuple[str, Dict]], focusPlayer: str, count_rounds: bool = True) -> Dict:
+    """
+    Analyzes match statistics from (match name, match) pairs, consuming them one at a time
+    """
+    return accumulate_matches(match_items, focusPlayer, count_rounds).to_dict()
+
+
+def analyze_stats(matches: Dict, focusPlayer: str) -> Dict:
+    """
+    Analyzes match statistics
+    """
+    return analyze_matchStream(matches.items(), focusPlayer)
+
+
+def analyze_allPlayers(matches: Dict, focusPlayers: List[str], engine: str = "python") -> Dict[str, Dict]:
+    """
+    Analyzes match statistics for every focus player at once; each entry equals analyze_stats(matches, player).
+    A match where a player is absent counts the same for every absent player, so that view is computed
+    once and each match only does extra work for the focus players that appear in it.
+    With engine="numpy" one round table is built and shared by the round statistics of every focus player
+    (falls back to Python without NumPy). It only pays off for several focus players: filling the table
+    reads every round once, which costs about as much as the Python round loop of a single player.
+    """
+    vectorised = engine == "numpy" and numpy_available()
+
+    # Stats from the point of view of a player absent from every match; player_stats is focus-independent
+    shared = accumulate_matches(matches.items(), None)
+    player_stats = {name: player.to_dict() for name, player in shared.players.items()}
+
+    focus_set = set(focusPlayers)
+    outcome_slots = {"Win": "won", "Loss": "lost", "Tie": "tied"}
+    outcome_deltas = {player: {} for player in focusPlayers}
+    player_rounds = {player: {} for player in focusPlayers}
+    player_totals = {player: RoundAccumulator() for player in focusPlayers}
+
+    for match in matches.values():
+        present = [player for player in match["players"] if player in focus_set]
+        if not present:
+            continue
+
+        absent_outcome = outcome_slots[build_matchContext(match, None).outcome(match)]
+        for player in present:
+            context = build_matchContext(match, player)
+            outcome = outcome_slots[context.outcome(match)]
+            if outcome != absent_outcome:
+                delta = outcome_deltas[player].get(match["map"])
+                if delta is None:
+                    delta = outcome_deltas[player][match["map"]] = MapAccumulator()
+                setattr(delta, outcome, getattr(delta, outcome) + 1)
+                setattr(delta, absent_outcome, getattr(delta, absent_outcome) - 1)
+
+            if not vectorised:
+                count_focusRounds(match, context, player_rounds[player], player_totals[player])
+
+    round_table = build_roundTable(matches) if vectorised else None
+    results = {}
+    for player in focusPlayers:
+        map_stats = {}
+        for map_name, accumulator in shared.maps.items():
+            values = MapAccumulator().merge(accumulator)
+            if map_name in outcome_deltas[player]:
+                values.merge(outcome_deltas[player][map_name])
+            map_stats[map_name] = values.to_dict()
+
+        total_stats = shared.total.to_dict()
+        for delta in outcome_deltas[player].values():
+            total_stats["won"] += delta.won
+            total_stats["lost"] += delta.lost
+            total_stats["tied"] += delta.tied
+        if vectorised:
+            round_stats, round_totals = aggregate_roundStats(matches, player, round_table)
+        else:
+            round_stats = {map_name: rounds.to_dict() for map_name, rounds in player_rounds[player].items()}
+            round_totals = player_totals[player].to_dict()
+        total_stats.update(round_totals)
+
+        results[player] = {
+            "map_stats": map_stats,
+            "round_stats": round_stats,
+            "player_stats": player_stats,
+            "total_stats": total_stats
+        }
+
+    return results
+
+
+def merge_stats(stats: Dict, other: Dict, sign: int = 1) -> Dict:
+    """
+    Combines two stats dictionaries counter by counter (sign=-1 subtracts other).
+    Entries whose counters all drop to zero are removed, matching a full recompute.
+    """
+    return StatsAccumulator.from_dict(stats).merge(StatsAccumulator.from_dict(other), sign).to_dict()
+
+
+def order_stats(stats: Dict, contributions: Iterable[Dict]) -> Dict:
+    """
+    Reorders the entries of merged stats by their first appearance in per-match stats given in match order.
+    merge_stats appends new entries at the end, while a full recompute lists them in match order,
+    which decides the row order and tie-breaks of the report.
+    """
+    ordered = {"map_stats": {}, "round_stats": {}, "player_stats": {}}
+    for contribution in contributions:
+        for section, entries in ordered.items():
+            for name in contribution[section]:
+                if name not in entries and name in stats[section]:
+                    entries[name] = stats[section][name]
+
+    for section, entries in ordered.items():
+        for name, values in stats[section].items():
+            entries.setdefault(name, values)
+    ordered["total_stats"] = stats["total_stats"]
+    return ordered
+
+
+def stats_equal(stats: Dict, other: Dict) -> bool:
+    """
+    Compares two stats dictionaries including the order of their entries
+    """
+    return stats == other and all(list(stats[section]) == list(other[section]) for section in stats)
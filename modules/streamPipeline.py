@@ -0,0 +1,48 @@
+from typing import Dict, List, Optional
+from modules.demoCache import DemoCache
+from modules.demoExtractor import iter_demoData, load_demoFiles
+from modules.playerFilter import filter_players, iter_filteredPlayers
+from modules.statsAnalyzer import analyze_matchStream, analyze_stats, merge_stats
+
+
+def stream_stats(json_files: List[str], player_mapping: Dict, focusPlayer: str, jobs: int = 1,
+                 streaming: bool = False, cache: Optional[DemoCache] = None,
+                 failed: Optional[List[str]] = None, counters: Optional[Dict] = None,
+                 renames: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Runs extraction, name normalisation and aggregation as one generator pipeline, so resident
+    memory is bounded by the largest demo rather than the archive.
+    As in extract_demoData, the last file with a given match name wins: earlier files with that
+    name are re-read afterwards and their contribution subtracted again.
+    """
+    seen = {}
+    superseded = []
+    if counters is not None:
+        counters.update(matches=0, rounds=0)
+
+    def unique_matches():
+        for file_path, match_name, match in iter_demoData(json_files, jobs, streaming, cache, failed, renames):
+            if match_name in seen:
+                superseded.append((match_name, seen[match_name]))
+            seen[match_name] = file_path
+
+            if counters is not None:
+                counters["matches"] += 1
+                counters["rounds"] += len(match.get("rounds", []))
+            yield match_name, match
+
+    stats = analyze_matchStream(iter_filteredPlayers(unique_matches(), player_mapping), focusPlayer)
+
+    for match_name, file_path in superseded:
+        cached = cache.get(file_path, "stream" if streaming else "json") if cache is not None else None
+        result, error = (cached, None) if cached is not None else load_demoFiles([file_path], 1, streaming)[0]
+        if error is not None:
+            print(f"Error reloading {file_path}: {error}")
+            continue
+        earlier = filter_players({match_name: result[1]}, player_mapping)
+        stats = merge_stats(stats, analyze_stats(earlier, focusPlayer), sign=-1)
+        if counters is not None:
+            counters["matches"] -= 1
+            counters["rounds"] -= len(result[1].get("rounds", []))
+
+    return stats
@@ -0,0 +1,178 @@
+import datetime
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+from modules.demoExtractor import load_demoFiles
+from modules.demoIndex import meta_selected
+from modules.demoSource import find_demoFiles, source_stat
+from modules.playerFilter import filter_players
+from modules.reportGenerator import generate_report
+from modules.statsAnalyzer import analyze_stats, merge_stats, order_stats
+
+
+def write_atomic(output_file: str, text: str) -> None:
+    """
+    Writes text to a temporary file next to the target and renames it over the target
+    """
+    directory = os.path.dirname(os.path.abspath(output_file))
+    os.makedirs(directory, exist_ok=True)
+    tmp_file = os.path.join(directory, f".{os.path.basename(output_file)}.tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_file, output_file)
+
+
+class DemoWatcher:
+    """
+    Keeps the aggregated stats of a demo directory up to date as files are added, changed or removed
+    """
+
+    def __init__(self, input_dir: str, file_pattern: str, focusPlayer: str, player_mapping: Dict[str, str],
+                 since: Optional[datetime.date] = None, until: Optional[datetime.date] = None,
+                 maps: Optional[List[str]] = None, jobs: int = 1, streaming: bool = False):
+        self.input_dir = input_dir
+        self.file_pattern = file_pattern
+        self.focusPlayer = focusPlayer
+        self.player_mapping = player_mapping
+        self.since = since
+        self.until = until
+        self.maps = maps
+        self.jobs = jobs
+        self.streaming = streaming
+
+        self.signatures = {}      # path -> (size, mtime) of the version folded into the stats
+        self.failed = {}          # path -> (size, mtime) of a version that could not be parsed yet
+        self.file_matches = {}    # path -> match name
+        self.file_stats = {}      # path -> stats of the match in that file
+        self.match_files = {}     # match name -> paths providing it, in the order they were applied
+        self.contributions = {}   # match name -> stats of that match folded into the stats
+        self.stats = analyze_stats({}, focusPlayer)
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Returns the (size, mtime) signature of every matching file
+        """
+        snapshot = {}
+        for file_path in find_demoFiles(self.input_dir, self.file_pattern):
+            try:
+                stat = source_stat(file_path)
+            except OSError:
+                continue
+            snapshot[file_path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def diff(self, snapshot: Dict[str, Tuple[int, int]]) -> Tuple[List[str], List[str]]:
+        """
+        Returns the files that are new or changed and the files that disappeared
+        """
+        changed = [
+            file_path for file_path, signature in snapshot.items()
+            if self.signatures.get(file_path) != signature and self.failed.get(file_path) != signature
+        ]
+        removed = [file_path for file_path in self.signatures if file_path not in snapshot]
+        for file_path in list(self.failed):
+            if file_path not in snapshot:
+                del self.failed[file_path]
+        return changed, removed
+
+    def _activate(self, match_name: str, contribution: Optional[Dict]) -> None:
+        # Replaces the contribution of a match name in the stats (None removes it)
+        previous = self.contributions.pop(match_name, None)
+        if previous is not None:
+            self.stats = merge_stats(self.stats, previous, sign=-1)
+        if contribution is not None:
+            self.contributions[match_name] = contribution
+            self.stats = merge_stats(self.stats, contribution)
+
+    def _add_file(self, file_path: str, match_name: str, contribution: Dict) -> None:
+        # The most recently written file wins if two demos share a match name
+        self.file_matches[file_path] = match_name
+        self.file_stats[file_path] = contribution
+        self.match_files.setdefault(match_name, []).append(file_path)
+        self._activate(match_name, contribution)
+
+    def _drop_file(self, file_path: str) -> None:
+        match_name = self.file_matches.pop(file_path, None)
+        if match_name is None:
+            return
+        del self.file_stats[file_path]
+        providers = self.match_files[match_name]
+        was_active = providers[-1] == file_path
+        providers.remove(file_path)
+        if not providers:
+            del self.match_files[match_name]
+
+        # An older file with the same match name takes over again
+        if was_active:
+            self._activate(match_name, self.file_stats[providers[-1]] if providers else None)
+
+    def apply(self, snapshot: Dict[str, Tuple[int, int]], changed: List[str], removed: List[str]) -> int:
+        """
+        Folds changed files into the stats and removes deleted ones.
+        Files that are not valid JSON yet (still being written) are skipped until they change again.
+        Returns the number of files that were applied.
+        """
+        for file_path in removed:
+            self._drop_file(file_path)
+            del self.signatures[file_path]
+
+        applied = len(removed)
+        for file_path, (result, error) in zip(changed, load_demoFiles(changed, self.jobs, self.streaming)):
+            if error is not None:
+                self.failed[file_path] = snapshot[file_path]
+                print(f"Skipping {file_path} until it is complete: {error}")
+                continue
+
+            self.failed.pop(file_path, None)
+            self.signatures[file_path] = snapshot[file_path]
+            self._drop_file(file_path)
+            applied += 1
+
+            match_name, match = result
+            meta = {"name": match_name, "date": match["date"], "map": match["map"]}
+            if not meta_selected(meta, self.since, self.until, self.maps):
+                continue
+
+            filtered = filter_players({match_name: match}, self.player_mapping)
+            self._add_file(file_path, match_name, analyze_stats(filtered, self.focusPlayer))
+
+        # Entries follow the current file order, as in a full run over the directory
+        match_order = {}
+        for file_path in snapshot:
+            match_name = self.file_matches.get(file_path)
+            if match_name is not None:
+                match_order.setdefault(match_name, self.contributions[match_name])
+        self.stats = order_stats(self.stats, match_order.values())
+
+        return applied
+
+
+def watch_directory(watcher: DemoWatcher, output_file: str, interval: float = 2.0, debounce: float = 1.0) -> None:
+    """
+    Polls the input directory and rewrites the report whenever the demo set changes. Runs until interrupted.
+    """
+    first_run = True
+    try:
+        while True:
+            snapshot = watcher.scan()
+            changed, removed = watcher.diff(snapshot)
+
+            if changed or removed:
+                # Wait for a burst of writes to settle before parsing anything
+                while True:
+                    time.sleep(debounce)
+                    latest = watcher.scan()
+                    if latest == snapshot:
+                        break
+                    snapshot = latest
+                changed, removed = watcher.diff(snapshot)
+
+            if watcher.apply(snapshot, changed, removed) or first_run:
+                write_atomic(output_file, generate_report(watcher.stats))
+                print(f"[{datetime.datetime.now():%H:%M:%S}] Report updated: "
+                      f"{len(watcher.contributions)} matches -> {output_file}")
+                first_run = False
+
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("Watch mode stopped.")
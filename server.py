@@ -0,0 +1,104 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+from main import load_playerMapping
+from modules.reportServer import DemoLibrary, run_server
+
+
+def parse_arguments():
+    """
+    Parse command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="CS2 Stats Server - Serve match reports over HTTP from a demo directory",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    
+    parser.add_argument(
+        "--input-dir", "-i",
+        type=str,
+        default="input",
+        help="Directory containing JSON demo files"
+    )
+    
+    parser.add_argument(
+        "--player-mapping", "-m",
+        type=str,
+        default="player_mapping.json",
+        help="Path to player mapping JSON file"
+    )
+    
+    parser.add_argument(
+        "--file-pattern",
+        type=str,
+        default="*.json",
+        help="File pattern to match JSON files"
+    )
+    
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Address to listen on"
+    )
+    
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8080,
+        help="Port to listen on"
+    )
+    
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes used to load demo files (1 loads them serially)"
+    )
+    
+    parser.add_argument(
+        "--parser",
+        choices=["json", "stream"],
+        default="json",
+        help="Demo parser: 'json' loads whole documents, 'stream' keeps only the fields the report uses (lower memory)"
+    )
+    
+    parser.add_argument(
+        "--cache-entries",
+        type=int,
+        default=64,
+        help="Number of query results kept in memory; least recently used ones are evicted beyond it"
+    )
+    
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=2.0,
+        help="Seconds between scans of the input directory for added, changed or removed demos"
+    )
+    
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_arguments()
+    
+    input_path = Path(args.input_dir)
+    if not input_path.is_dir():
+        print(f"Error: Input directory '{args.input_dir}' does not exist.")
+        sys.exit(1)
+    
+    if args.jobs < 1 or args.cache_entries < 1:
+        print("Error: --jobs and --cache-entries must be at least 1.")
+        sys.exit(1)
+    
+    player_mapping = load_playerMapping(args.player_mapping)
+    library = DemoLibrary(args.input_dir, args.file_pattern, player_mapping,
+                          jobs=args.jobs, streaming=args.parser == "stream")
+    run_server(library, host=args.host, port=args.port,
+               cache_entries=args.cache_entries, poll_interval=args.poll_interval)
+
+
+if __name__ == "__main__":
+    main()
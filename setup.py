@@ -7,13 +7,14 @@ setup(
     author="SnakeFist",
     author_email="github@snakefist.de",
     packages=find_packages(),
-    py_modules=["main"],
+    py_modules=["main", "server"],
     install_requires=[
         # No external dependencies - uses only Python standard library
     ],
     entry_points={
         'console_scripts': [
             'cs2-stats=main:main',
+            'cs2-stats-server=server:main',
         ],
     },
     python_requires=">=3.8",